@@ -2,14 +2,18 @@
 Agents package for LangGraph
 """
 
+from .base import BaseAgent
 from .content_classifier import ContentClassifier
+from .local_classifier import LocalClassifier
 from .text_translator import TextTranslator
 from .math_translator import MathTranslator
 from .table_translator import TableTranslator
 from .image_handler import ImageHandler
 
 __all__ = [
+    'BaseAgent',
     'ContentClassifier',
+    'LocalClassifier',
     'TextTranslator',
     'MathTranslator',
     'TableTranslator',
@@ -0,0 +1,166 @@
+"""
+Base Agent
+모든 에이전트가 공유하는 채팅 모델 호출부. 시스템/사용자 메시지를 나눠 보내고
+입력 길이에 비례하는 출력 토큰 상한을 걸며, 에이전트별 입력/출력 토큰 수를 기록합니다.
+모든 호출은 공유 LLMScheduler(RPM/TPM 한도, 우선순위, 재시도)를 거칩니다.
+"""
+
+import os
+import re
+from typing import Awaitable, Callable
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from langchain.schema import BaseMessage, HumanMessage, SystemMessage
+from llm import PRIORITY_INTERACTIVE, LLMScheduler, get_chat_model, get_scheduler
+from metrics import Counters
+
+# 이 길이(문자 수) 이하의 입력은 예시 없는 lean 프롬프트를 사용 (0이면 항상 전체 프롬프트)
+LEAN_PROMPT_MAX_CHARS = int(os.getenv("LEAN_PROMPT_MAX_CHARS", 200))
+
+# 출력 토큰 상한 = 바닥값 + 에이전트별 배율 × 추정 입력 토큰 (0이면 상한 없음)
+# 추론 모델(gpt-5 계열)은 내부 추론 토큰도 상한에 포함되므로 바닥값을 넉넉히 둡니다
+MAX_OUTPUT_TOKENS_FLOOR = int(os.getenv("MAX_OUTPUT_TOKENS_FLOOR", 2048))
+
+# 에이전트별 호출 수와 토큰 수 ("text.input_tokens" 등, GET /metrics)
+token_metrics = Counters()
+
+# 최종 답 구분자. 상한에 걸려 닫는 태그가 없으면 끝까지를 답으로 봅니다
+_ANSWER = re.compile(r'<translation>\s*(.*?)\s*(?:</translation>|$)', re.DOTALL)
+
+
+class BaseAgent:
+    # 토큰 카운터 접두어, 기본 chat model temperature, 입력 토큰 대비 출력 토큰 배율, 스케줄러 레인
+    name = "agent"
+    temperature = 0.3
+    output_ratio = 2.5
+    priority = PRIORITY_INTERACTIVE
+
+    def __init__(
+        self,
+        model_name: str = "gpt-5-mini",
+        llm: BaseChatModel | None = None,
+        scheduler: LLMScheduler | None = None,
+    ):
+        self.model_name = model_name
+        self.llm = llm or get_chat_model(model_name, self.temperature)
+        self.scheduler = scheduler or get_scheduler()
+
+    def _use_lean(self, text: str) -> bool:
+        """짧은 세그먼트는 lean 프롬프트로 충분합니다"""
+        return len(text) <= LEAN_PROMPT_MAX_CHARS
+
+    def _invoke(self, system: str, user: str) -> str:
+        """
+        시스템 메시지(고정 접두부) + 사용자 메시지로 모델을 호출하고 응답 본문을 돌려줍니다.
+        출력 상한에 걸려 잘린 응답은 상한 없이 한 번 다시 요청합니다.
+        """
+        messages = self._messages(system, user)
+        budget = self._output_budget(user)
+        response = self._call(self._capped(budget), messages, self._estimate_tokens(system, user, budget))
+        if self._truncated(response):
+            response = self._call(self.llm, messages, self._estimate_tokens(system, user, None))
+        return response.content
+
+    async def _ainvoke(self, system: str, user: str) -> str:
+        """_invoke의 비동기 버전"""
+        messages = self._messages(system, user)
+        budget = self._output_budget(user)
+        response = await self._acall(self._capped(budget), messages, self._estimate_tokens(system, user, budget))
+        if self._truncated(response):
+            response = await self._acall(self.llm, messages, self._estimate_tokens(system, user, None))
+        return response.content
+
+    def _call(self, model: Runnable, messages: list[BaseMessage], tokens: int) -> BaseMessage:
+        response = self.scheduler.run(lambda: model.invoke(messages), tokens, self.priority)
+        self._record_usage(response)
+        return response
+
+    async def _acall(self, model: Runnable, messages: list[BaseMessage], tokens: int) -> BaseMessage:
+        response = await self.scheduler.arun(lambda: model.ainvoke(messages), tokens, self.priority)
+        self._record_usage(response)
+        return response
+
+    async def _astream(self, system: str, user: str, on_chunk: Callable[[str], Awaitable[None]]) -> str:
+        """
+        _ainvoke의 스트리밍 버전. 응답 조각을 받는 대로 on_chunk로 넘기고 전체 응답 본문을 돌려줍니다.
+        잘린 응답의 재요청은 스트리밍하지 않습니다.
+        """
+        messages = self._messages(system, user)
+        budget = self._output_budget(user)
+        model = self._capped(budget)
+        emitted = False
+
+        async def stream_once() -> BaseMessage | None:
+            nonlocal emitted
+            response = None
+            try:
+                # stream_usage: 마지막 조각에 토큰 사용량을 받습니다 (OpenAI)
+                async for chunk in model.astream(messages, stream_usage=True):
+                    response = chunk if response is None else response + chunk
+                    if isinstance(chunk.content, str) and chunk.content:
+                        emitted = True
+                        await on_chunk(chunk.content)
+            except Exception as error:
+                if emitted:
+                    # 이미 내보낸 조각이 있으면 스케줄러가 재시도하지 않게 합니다 (조각이 중복됨)
+                    raise RuntimeError(f"Stream interrupted: {error}") from error
+                raise
+            return response
+
+        response = await self.scheduler.arun(stream_once, self._estimate_tokens(system, user, budget), self.priority)
+        if response is None:
+            return ""
+        self._record_usage(response)
+        if self._truncated(response):
+            response = await self._acall(self.llm, messages, self._estimate_tokens(system, user, None))
+        return response.content
+
+    def _extract_answer(self, content: str) -> str:
+        """
+        <translation> 태그 안의 최종 답만 꺼냅니다.
+        태그가 없으면 응답 전체를 돌려주고 호출자의 기존 정제 로직에 맡깁니다.
+        """
+        match = _ANSWER.search(content)
+        if match is None:
+            token_metrics.incr(f"{self.name}.untagged")
+            return content.strip()
+        return match.group(1)
+
+    def _output_budget(self, user: str) -> int | None:
+        """사용자 메시지 길이(4자 ≈ 1토큰)에 비례하는 출력 토큰 상한"""
+        if MAX_OUTPUT_TOKENS_FLOOR <= 0:
+            return None
+        return MAX_OUTPUT_TOKENS_FLOOR + int(self.output_ratio * (len(user) // 4 + 1))
+
+    def _capped(self, budget: int | None) -> Runnable:
+        return self.llm if budget is None else self.llm.bind(max_completion_tokens=budget)
+
+    def _estimate_tokens(self, system: str, user: str, budget: int | None) -> int:
+        """스케줄러 TPM 버킷에 예약할 토큰 수 (입력 + 출력 상한, 상한이 없으면 배율로 추정)"""
+        input_tokens = (len(system) + len(user)) // 4 + 1
+        if budget is None:
+            budget = int(self.output_ratio * (len(user) // 4 + 1))
+        return input_tokens + budget
+
+    def _truncated(self, response: BaseMessage) -> bool:
+        metadata = getattr(response, "response_metadata", None) or {}
+        if metadata.get("finish_reason") != "length" or MAX_OUTPUT_TOKENS_FLOOR <= 0:
+            return False
+        token_metrics.incr(f"{self.name}.truncated")
+        return True
+
+    def _messages(self, system: str, user: str) -> list[BaseMessage]:
+        return [SystemMessage(content=system), HumanMessage(content=user)]
+
+    def _record_usage(self, response: BaseMessage) -> None:
+        """usage_metadata가 있는 모델(OpenAI 등)만 토큰 수를 남깁니다"""
+        token_metrics.incr(f"{self.name}.calls")
+        usage = getattr(response, "usage_metadata", None)
+        if not usage:
+            return
+        token_metrics.incr(f"{self.name}.input_tokens", usage.get("input_tokens", 0))
+        token_metrics.incr(f"{self.name}.output_tokens", usage.get("output_tokens", 0))
+        # provider 프롬프트 캐시에서 읽은 입력 토큰 (접두부 캐시 효과)
+        cached = (usage.get("input_token_details") or {}).get("cache_read", 0)
+        token_metrics.incr(f"{self.name}.cached_input_tokens", cached)
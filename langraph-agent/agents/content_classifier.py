@@ -3,15 +3,62 @@ Content Classifier Agent
 텍스트를 분석하여 콘텐츠 타입을 분류합니다.
 """
 
-from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage
-from prompts.classifier_prompt import get_classifier_prompt
+from typing import Any, Callable, List, Tuple
+from langchain_core.language_models import BaseChatModel
+from agents.base import BaseAgent
+from agents.latex_scanner import has_markdown_table, looks_like_math
+from agents.masking import is_inline_math_prose
+from agents.local_classifier import (
+    LOCAL_CLASSIFIER_THRESHOLD,
+    DecisionLog,
+    LocalClassifier,
+    get_default_decision_log,
+    get_default_local_classifier,
+)
+from cache import DiskStore, make_classification_key
+from llm import LLMScheduler
+from metrics import Counters
+from prompts.classifier_prompt import get_batch_classifier_prompt, get_classifier_prompt
+from prompts.version import CLASSIFIER_PROMPT_VERSION
+import asyncio
+import json
 import re
 
+# 디스크 캐시 네임스페이스
+STORE_NAMESPACE = "classify"
 
-class ContentClassifier:
-    def __init__(self, model_name: str = "gpt-5-mini"):
-        self.llm = ChatOpenAI(model=model_name, temperature=0)
+CONTENT_TYPES = ('TEXT', 'MATH', 'TABLE', 'IMAGE')
+
+# 분류 경로별 횟수 (heuristic / stored / local / local_deferred / llm, GET /metrics)
+classify_metrics = Counters()
+
+# 휴리스틱 패턴 (import 시 한 번만 컴파일, 수식/표 검사는 latex_scanner의 단일 패스 스캔)
+_IMAGE_PATTERN = re.compile(r'\b(Figure|Fig\.|Table|Image|Caption)\b', re.IGNORECASE)
+_CLASSIFICATION_PATTERN = re.compile(r'Classification:\s*(TEXT|MATH|TABLE|IMAGE)', re.IGNORECASE)
+
+
+class ContentClassifier(BaseAgent):
+    name = "classifier"
+    temperature = 0
+    # 한 줄 라벨 (묶음이면 청크당 JSON 항목 하나)만 돌려받습니다
+    output_ratio = 0.25
+    
+    def __init__(
+        self,
+        model_name: str = "gpt-5-mini",
+        llm: BaseChatModel | None = None,
+        store: DiskStore | None = None,
+        local: LocalClassifier | None = None,
+        decision_log: DecisionLog | None = None,
+        scheduler: LLMScheduler | None = None,
+    ):
+        super().__init__(model_name, llm, scheduler)
+        # LLM 분류 결과를 워커 간에 공유하는 선택적 디스크 캐시
+        self.store = store
+        # 휴리스틱과 LLM 사이의 로컬 모델 (LOCAL_CLASSIFIER_PATH), LLM 결과 기록 (CLASSIFIER_LOG_PATH)
+        self.local = local if local is not None else get_default_local_classifier()
+        self.decision_log = decision_log if decision_log is not None else get_default_decision_log()
+        self.local_threshold = LOCAL_CLASSIFIER_THRESHOLD
     
     def classify(self, text: str) -> str:
         """
@@ -20,47 +67,181 @@ class ContentClassifier:
         Returns:
             'TEXT' | 'MATH' | 'TABLE' | 'IMAGE'
         """
-        # 먼저 휴리스틱으로 빠르게 확인
-        content_type = self._quick_classify(text)
+        # 먼저 휴리스틱, 디스크 캐시, 로컬 모델로 확인
+        content_type = self._classify_offline(text)
         if content_type:
             return content_type
         
         # LLM을 사용한 분류
-        prompt = get_classifier_prompt(text)
-        response = self.llm.invoke([HumanMessage(content=prompt)])
+        content = self._invoke(*get_classifier_prompt(text))
         
         # 응답에서 분류 결과 추출
-        classification = self._extract_classification(response.content)
+        classification = self._extract_classification(content)
+        self._record_llm_decision(text, classification)
+        return classification
+    
+    async def aclassify(self, text: str) -> str:
+        """
+        classify의 비동기 버전 (이벤트 루프를 막지 않음)
+        """
+        content_type = await self._offload(self._classify_offline, text)
+        if content_type:
+            return content_type
+        
+        content = await self._ainvoke(*get_classifier_prompt(text))
+        classification = self._extract_classification(content)
+        await self._offload(self._record_llm_decision, text, classification)
         return classification
     
+    def classify_many(self, texts: List[str]) -> List[str]:
+        """
+        여러 텍스트를 한 번에 분류합니다. 휴리스틱/디스크 캐시로 정해지지 않은
+        텍스트만 모아 한 번의 LLM 호출로 분류합니다.
+        
+        Returns:
+            입력 순서대로의 'TEXT' | 'MATH' | 'TABLE' | 'IMAGE' 목록
+        """
+        results, pending = self._classify_locally(texts)
+        if pending:
+            content = self._invoke(*get_batch_classifier_prompt([texts[index] for index in pending]))
+            self._apply_labels(texts, results, pending, content)
+        return results
+    
+    async def aclassify_many(self, texts: List[str]) -> List[str]:
+        """
+        classify_many의 비동기 버전
+        """
+        results, pending = await self._offload(self._classify_locally, texts)
+        if pending:
+            content = await self._ainvoke(*get_batch_classifier_prompt([texts[index] for index in pending]))
+            await self._offload(self._apply_labels, texts, results, pending, content)
+        return results
+    
+    async def _offload(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        디스크 캐시(SQLite 잠금 대기), 로컬 모델, decision log를 거치는 작업은
+        이벤트 루프를 막지 않도록 스레드에서 실행합니다 (셋 다 없으면 바로 실행).
+        """
+        if self.store is None and self.local is None and self.decision_log is None:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+    
+    def _classify_locally(self, texts: List[str]) -> Tuple[List[str | None], List[int]]:
+        """
+        LLM 없이 분류 가능한 텍스트를 채우고, 남은 항목의 인덱스를 돌려줍니다.
+        같은 텍스트가 여러 번 나오면 LLM에는 한 번만 보냅니다.
+        """
+        results: List[str | None] = [self._classify_offline(text) for text in texts]
+        pending: List[int] = []
+        seen = set()
+        for index, text in enumerate(texts):
+            if results[index] is None and text not in seen:
+                seen.add(text)
+                pending.append(index)
+        return results, pending
+    
+    def _classify_offline(self, text: str) -> str | None:
+        """휴리스틱 → 디스크 캐시 → 로컬 모델 순으로 분류 (모두 확신이 없으면 None)"""
+        content_type = self._quick_classify(text)
+        if content_type:
+            classify_metrics.incr("heuristic")
+            return content_type
+        
+        stored = self._load_stored(text)
+        if stored:
+            classify_metrics.incr("stored")
+            return stored
+        
+        if self.local is not None:
+            label, probability = self.local.predict(text)
+            if probability >= self.local_threshold:
+                classify_metrics.incr("local")
+                return label
+            classify_metrics.incr("local_deferred")
+        return None
+    
+    def _apply_labels(self, texts: List[str], results: List[str | None], pending: List[int], response: str) -> None:
+        """
+        {"labels": [{"id", "type"}]} 응답을 results에 채웁니다.
+        응답에 없는 항목은 저장하지 않고 기본값 'TEXT'로 둡니다.
+        """
+        labels = {}
+        for item in self._load_labels(response):
+            if isinstance(item, dict) and isinstance(item.get("id"), int):
+                label = str(item.get("type", "")).upper()
+                if label in CONTENT_TYPES:
+                    labels[item["id"]] = label
+        
+        by_text = {}
+        for position, index in enumerate(pending, start=1):
+            label = labels.get(position)
+            if label:
+                self._record_llm_decision(texts[index], label)
+            by_text[texts[index]] = label or 'TEXT'
+        
+        for index, text in enumerate(texts):
+            if results[index] is None:
+                results[index] = by_text[text]
+    
+    def _load_labels(self, response: str) -> list:
+        start, end = response.find('{'), response.rfind('}')
+        if start == -1 or end <= start:
+            return []
+        try:
+            parsed = json.loads(response[start:end + 1])
+        except json.JSONDecodeError:
+            return []
+        labels = parsed.get("labels") if isinstance(parsed, dict) else None
+        return labels if isinstance(labels, list) else []
+    
+    def _store_key(self, text: str) -> str:
+        return make_classification_key(text, self.model_name, CLASSIFIER_PROMPT_VERSION)
+    
+    def _load_stored(self, text: str) -> str | None:
+        """디스크 캐시에 저장된 LLM 분류 결과 조회"""
+        if self.store is None:
+            return None
+        return self.store.get(STORE_NAMESPACE, self._store_key(text))
+    
+    def _record_llm_decision(self, text: str, classification: str) -> None:
+        """LLM 분류 결과를 디스크 캐시와 학습용 decision log에 남깁니다"""
+        classify_metrics.incr("llm")
+        if self.store is not None:
+            self.store.set(STORE_NAMESPACE, self._store_key(text), classification)
+        if self.decision_log is not None:
+            self.decision_log.record(text, classification)
+    
     def _quick_classify(self, text: str) -> str | None:
         """
         휴리스틱 기반 빠른 분류
         """
-        # LaTeX 수식 패턴
-        if re.search(r'\$\$?.*\$\$?|\\\[|\\\]|\\begin\{equation\}|\\begin\{align\}', text):
-            return 'MATH'
+        # LaTeX 수식 패턴 (인라인 수식만 섞인 문장은 마스킹해서 텍스트로 번역)
+        inline_math = False
+        if looks_like_math(text):
+            if not is_inline_math_prose(text):
+                return 'MATH'
+            inline_math = True
         
         # 표 패턴 (마크다운 또는 파이프 구분)
-        if re.search(r'\|.*\|.*\n\|[-:| ]+\|', text) or text.count('|') > 4:
+        if text.count('|') > 4 or has_markdown_table(text):
             return 'TABLE'
         
         # 이미지 관련 키워드
-        if re.search(r'\b(Figure|Fig\.|Table|Image|Caption)\b', text, re.IGNORECASE):
+        if _IMAGE_PATTERN.search(text):
             # 실제 표인지 확인
             if 'Table' in text and '|' in text:
                 return 'TABLE'
             return 'IMAGE'
         
         # 일반 텍스트는 None 반환 (LLM이 판단)
-        return None
+        return 'TEXT' if inline_math else None
     
     def _extract_classification(self, response: str) -> str:
         """
         LLM 응답에서 분류 결과 추출
         """
         # "Classification: TEXT" 형식 찾기
-        match = re.search(r'Classification:\s*(TEXT|MATH|TABLE|IMAGE)', response, re.IGNORECASE)
+        match = _CLASSIFICATION_PATTERN.search(response)
         if match:
             return match.group(1).upper()
         
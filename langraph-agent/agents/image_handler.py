@@ -3,14 +3,13 @@ Image Handler Agent
 이미지 설명을 번역합니다.
 """
 
-from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage
+from agents.base import BaseAgent
 from prompts.image_prompt import get_image_translation_prompt
 
 
-class ImageHandler:
-    def __init__(self, model_name: str = "gpt-5-mini"):
-        self.llm = ChatOpenAI(model=model_name, temperature=0.3)
+class ImageHandler(BaseAgent):
+    name = "image"
+    temperature = 0.3
     
     def translate(self, text: str) -> str:
         """
@@ -23,16 +22,22 @@ class ImageHandler:
             번역된 텍스트
         """
         # 이미지 특화 프롬프트 사용
-        prompt = get_image_translation_prompt(text)
-        response = self.llm.invoke([HumanMessage(content=prompt)])
+        content = self._invoke(*get_image_translation_prompt(text, self._use_lean(text)))
         
-        translated = response.content.strip()
+        translated = self._extract_answer(content)
         
         # "Figure", "Fig." 등의 키워드는 유지
         translated = self._preserve_keywords(translated)
         
         return translated
     
+    async def atranslate(self, text: str) -> str:
+        """
+        translate의 비동기 버전 (이벤트 루프를 막지 않음)
+        """
+        content = await self._ainvoke(*get_image_translation_prompt(text, self._use_lean(text)))
+        return self._preserve_keywords(self._extract_answer(content))
+    
     def _preserve_keywords(self, text: str) -> str:
         """
         특정 키워드를 영문으로 유지합니다.
@@ -0,0 +1,175 @@
+"""
+LaTeX Repair
+MathTranslator 출력의 흔한 LaTeX 결함을 LLM 없이 고칩니다.
+고칠 수 없으면 문제가 있는 구간만 찾아 재요청할 수 있게 위치를 알려줍니다.
+"""
+
+import re
+from typing import List, Tuple
+
+from agents.latex_scanner import LatexScan, scan_latex
+
+# 수식 구간: $$..$$, $..$, \[..\], \(..\), \begin{env}..\end{env}
+_MATH_SPAN = re.compile(
+    r'\$\$.+?\$\$'
+    r'|(?<!\\)\$(?:\\.|[^$\\])+?\$'
+    r'|\\\[.+?\\\]'
+    r'|\\\(.+?\\\)'
+    r'|\\begin\{([^{}]+)\}.*?\\end\{\1\}',
+    re.DOTALL,
+)
+
+# 번역된 한국어 문장 (수식 구간 안에 있으면 구분자가 잘못 짝지어진 것)
+_HANGUL = re.compile(r'[\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3]')
+_ENVIRONMENT = re.compile(r'\\begin\{([^{}]+)\}')
+
+_CORRECTED = re.compile(r'Corrected:\s*(.*)', re.DOTALL | re.IGNORECASE)
+_VALID_STATUS = re.compile(r'Status:\s*VALID\b', re.IGNORECASE)
+
+
+def math_spans(text: str) -> List[Tuple[int, int]]:
+    """수식 구간의 (시작, 끝) 목록"""
+    return [match.span() for match in _MATH_SPAN.finditer(text)]
+
+
+def repair_latex(translated: str, source: str) -> str | None:
+    """
+    번역 결과의 LaTeX를 원문 기준으로 복구합니다.
+
+    1. 수식 구간 수가 원문과 같으면, 바뀐 구간을 원문 수식으로 되돌립니다.
+    2. 짝이 없는 }, \\end는 지우고, 닫히지 않은 {, \\begin, $는 닫습니다.
+
+    Returns:
+        검증을 통과한 복구 결과, 고칠 수 없으면 None
+        (구간 대응이 어긋나 번역문을 덮어쓸 위험이 있으면 None → 구간 재요청)
+    """
+    restored = restore_source_math(translated, source)
+    if restored is None:
+        return None
+    if scan_latex(restored).balanced:
+        return restored
+
+    balanced = close_delimiters(restored)
+    return balanced if scan_latex(balanced).balanced else None
+
+
+def restore_source_math(translated: str, source: str) -> str | None:
+    """
+    원문과 번역의 수식 구간이 1:1로 대응하면 번역 쪽 구간을 원문 수식으로 바꿉니다.
+
+    구간 수가 다르면 번역을 그대로 돌려줍니다. 수가 같아도 구분자 종류가 다르거나
+    번역 쪽 구간에 한국어 문장이 들어 있으면(구분자가 빠져 문장까지 수식으로 잡힘) None.
+    """
+    source_spans = [source[start:end] for start, end in math_spans(source)]
+    translated_spans = math_spans(translated)
+    if not source_spans or len(source_spans) != len(translated_spans):
+        return translated
+
+    pieces = []
+    previous = 0
+    for (start, end), original in zip(translated_spans, source_spans):
+        span = translated[start:end]
+        if _span_kind(span) != _span_kind(original) or _HANGUL.search(span):
+            return None
+        pieces.append(translated[previous:start])
+        pieces.append(original)
+        previous = end
+    pieces.append(translated[previous:])
+    return ''.join(pieces)
+
+
+def _span_kind(span: str) -> str:
+    """수식 구간의 구분자 종류 ($, $$, \\[, \\(, 환경 이름)"""
+    if span.startswith('\\begin'):
+        match = _ENVIRONMENT.match(span)
+        return f'env:{match.group(1)}' if match else 'env'
+    if span.startswith('$$'):
+        return '$$'
+    return span[:2] if span.startswith('\\') else '$'
+
+
+def close_delimiters(text: str) -> str:
+    """
+    스캔 결과로 구분자를 맞춥니다.
+
+    짝 없는 닫는 토큰은 지우고, 열린 {는 그 수식 구간의 닫는 구분자 앞(구간 밖이면 줄 끝),
+    열린 $는 줄 끝, \\begin은 텍스트 끝에서 안쪽부터 닫습니다.
+    """
+    scan = scan_latex(text)
+    # (위치, 지울 길이, 넣을 문자열) - 뒤에서부터 적용해 앞쪽 위치가 바뀌지 않게 합니다
+    edits: List[Tuple[int, int, str]] = []
+
+    for position in scan.unmatched_braces:
+        if text[position] == '}':
+            edits.append((position, 1, ''))
+        else:
+            edits.append((_closing_point(text, position), 0, '}'))
+
+    if len(scan.dollars) % 2:
+        edits.append((_line_end(text, scan.dollars[-1]), 0, '$'))
+    if len(scan.double_dollars) % 2:
+        edits.append((len(text), 0, '$$'))
+
+    for kind, name, position in scan.unmatched_environments:
+        if kind == 'end':
+            edits.append((position, len(f'\\end{{{name}}}'), ''))
+    for kind, name, position in reversed(scan.unmatched_environments):
+        if kind == 'begin':
+            edits.append((len(text), 0, f'\n\\end{{{name}}}'))
+
+    # 뒤에서부터 적용합니다. 같은 위치라면 나중 항목을 먼저 넣어야 목록 순서대로 놓입니다
+    ordered = sorted(enumerate(edits), key=lambda item: (item[1][0], item[0]), reverse=True)
+    for _, (position, length, insert) in ordered:
+        text = text[:position] + insert + text[position + length:]
+    return text
+
+
+def _line_end(text: str, position: int) -> int:
+    end = text.find('\n', position)
+    return len(text) if end == -1 else end
+
+
+def _closing_point(text: str, position: int) -> int:
+    """position을 감싸는 수식 구간의 닫는 구분자 위치 (구간 밖이면 줄 끝)"""
+    for start, end in math_spans(text):
+        if start <= position < end:
+            span = text[start:end]
+            if span.startswith('\\begin'):
+                return start + span.rfind('\\end{')
+            if span.endswith('$$') or span.endswith(('\\]', '\\)')):
+                return end - 2
+            return end - 1
+    return _line_end(text, position)
+
+
+def broken_span(text: str, scan: LatexScan | None = None) -> Tuple[int, int]:
+    """첫 번째 결함이 있는 문단(빈 줄로 구분)의 (시작, 끝)"""
+    scan = scan or scan_latex(text)
+    positions = list(scan.unmatched_braces)
+    positions.extend(position for _, _, position in scan.unmatched_environments)
+    if len(scan.dollars) % 2:
+        positions.append(scan.dollars[-1])
+    if len(scan.double_dollars) % 2:
+        positions.append(scan.double_dollars[-1])
+    if len(scan.display_opens) != len(scan.display_closes):
+        positions.extend(scan.display_opens[-1:] or scan.display_closes[-1:])
+    if len(scan.inline_opens) != len(scan.inline_closes):
+        positions.extend(scan.inline_opens[-1:] or scan.inline_closes[-1:])
+    if not positions:
+        return 0, len(text)
+
+    first = min(positions)
+    start = text.rfind('\n\n', 0, first)
+    end = text.find('\n\n', first)
+    return (0 if start == -1 else start + 2), (len(text) if end == -1 else end)
+
+
+def parse_validation_response(response: str) -> str | None:
+    """get_math_validation_prompt 응답에서 수정된 LaTeX를 꺼냅니다 (VALID이거나 형식이 다르면 None)"""
+    if _VALID_STATUS.search(response):
+        return None
+    match = _CORRECTED.search(response)
+    if not match:
+        return None
+    corrected = match.group(1).strip()
+    return corrected or None
@@ -0,0 +1,162 @@
+"""
+LaTeX Scanner
+구분자 균형, 환경 짝 맞춤, 수식 표시를 한 번의 토큰 스캔으로 검사합니다.
+MathTranslator의 LaTeX 검증과 ContentClassifier의 수식 휴리스틱이 함께 사용합니다.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+# 관심 있는 토큰만 찾는 패턴 (나머지 문자는 C 레벨에서 건너뜀)
+# 순서가 중요합니다: 환경 → 명령 구분자 → 기타 이스케이프 → $$ → $ → 중괄호 → 줄바꿈
+# 캡처 그룹은 환경 이름 두 개뿐입니다 (그룹이 많을수록 매칭이 느려짐)
+_TOKEN = re.compile(
+    r'\\begin\{([^{}]*)\}'
+    r'|\\end\{([^{}]*)\}'
+    r'|\\[\[\]()]'
+    r'|\\.'
+    r'|\$\$'
+    r'|\$'
+    r'|[{}\n]',
+    re.DOTALL,
+)
+
+# 수식 분류용 표시: \[, \], \begin{equation...}, \begin{align...}
+_MATH_MARKER = re.compile(r'\\[\[\]]|\\begin\{(?:equation|align)')
+
+# 마크다운 표 구분선 (|---|:--:|)
+_TABLE_RULE = re.compile(r'\|[-:| ]+\|')
+
+# _quick_classify가 수식으로 보는 환경 (equation*, align* 등 포함)
+MATH_ENVIRONMENTS = ('equation', 'align')
+
+
+@dataclass(slots=True)
+class LatexScan:
+    """scan_latex 결과. 위치는 모두 원문 문자 인덱스입니다."""
+
+    # 짝이 없는 { 또는 } 위치
+    unmatched_braces: List[int] = field(default_factory=list)
+    # 이스케이프되지 않은 단일 $ / $$ 위치
+    dollars: List[int] = field(default_factory=list)
+    double_dollars: List[int] = field(default_factory=list)
+    # \[ \] / \( \) 위치
+    display_opens: List[int] = field(default_factory=list)
+    display_closes: List[int] = field(default_factory=list)
+    inline_opens: List[int] = field(default_factory=list)
+    inline_closes: List[int] = field(default_factory=list)
+    # 짝이 맞지 않는 \begin / \end: (begin|end, 환경 이름, 위치)
+    unmatched_environments: List[Tuple[str, str, int]] = field(default_factory=list)
+    # 한 줄에 나온 $ 문자 수의 최댓값 (\$ 포함)
+    max_line_dollars: int = 0
+    # \[, \], \begin{equation}, \begin{align} 존재 여부
+    math_markers: bool = False
+
+    @property
+    def balanced(self) -> bool:
+        """구분자와 환경이 모두 짝이 맞는지"""
+        return (
+            not self.unmatched_braces
+            and len(self.dollars) % 2 == 0
+            and len(self.double_dollars) % 2 == 0
+            and len(self.display_opens) == len(self.display_closes)
+            and len(self.inline_opens) == len(self.inline_closes)
+            and not self.unmatched_environments
+        )
+
+    @property
+    def looks_like_math(self) -> bool:
+        """한 줄에 $가 두 개 이상이거나 디스플레이 수식 표시가 있는지"""
+        return self.max_line_dollars >= 2 or self.math_markers
+
+
+def scan_latex(text: str) -> LatexScan:
+    """
+    텍스트를 한 번 훑어 LaTeX 구조 정보를 모읍니다.
+
+    \\{, \\}, \\$ 같은 이스케이프는 균형 계산에서 제외하고, \\begin/\\end는 스택으로
+    중첩 순서까지 확인합니다.
+    """
+    scan = LatexScan()
+    braces: List[int] = []
+    environments: List[Tuple[str, int]] = []
+    line_dollars = 0
+
+    # 수식 텍스트에서 가장 흔한 중괄호부터 확인합니다
+    for match in _TOKEN.finditer(text):
+        token = match.group()
+        if token == '{':
+            braces.append(match.start())
+        elif token == '}':
+            if braces:
+                braces.pop()
+            else:
+                scan.unmatched_braces.append(match.start())
+        elif token == '$':
+            scan.dollars.append(match.start())
+            line_dollars += 1
+        elif token == '\n' or token == '\\\n':
+            # 줄 끝의 역슬래시도 줄바꿈으로 처리
+            scan.max_line_dollars = max(scan.max_line_dollars, line_dollars)
+            line_dollars = 0
+        elif token == '$$':
+            scan.double_dollars.append(match.start())
+            line_dollars += 2
+        elif token == '\\$':
+            line_dollars += 1
+        elif token == '\\[':
+            scan.display_opens.append(match.start())
+            scan.math_markers = True
+        elif token == '\\]':
+            scan.display_closes.append(match.start())
+            scan.math_markers = True
+        elif token == '\\(':
+            scan.inline_opens.append(match.start())
+        elif token == '\\)':
+            scan.inline_closes.append(match.start())
+        elif match.group(1) is not None:
+            name = match.group(1)
+            environments.append((name, match.start()))
+            if name.startswith(MATH_ENVIRONMENTS):
+                scan.math_markers = True
+        elif match.group(2) is not None:
+            name = match.group(2)
+            if environments and environments[-1][0] == name:
+                environments.pop()
+            else:
+                scan.unmatched_environments.append(('end', name, match.start()))
+
+    scan.max_line_dollars = max(scan.max_line_dollars, line_dollars)
+    scan.unmatched_braces.extend(braces)
+    scan.unmatched_braces.sort()
+    scan.unmatched_environments.extend(('begin', name, position) for name, position in environments)
+    scan.unmatched_environments.sort(key=lambda item: item[2])
+    return scan
+
+
+def looks_like_math(text: str) -> bool:
+    """
+    ContentClassifier의 수식 휴리스틱 (구 정규식 r'\\$\\$?.*\\$\\$?|\\\\\\[|...' 대체)
+
+    구 정규식과 같은 판정을 역추적 없는 C 레벨 검색으로 합니다. 분류는 요청마다
+    실행되므로 scan_latex처럼 구조 정보를 모으지 않습니다.
+    """
+    if text.count('$') >= 2 and any(line.count('$') >= 2 for line in text.split('\n')):
+        return True
+    return '\\' in text and _MATH_MARKER.search(text) is not None
+
+
+def has_markdown_table(text: str) -> bool:
+    """
+    파이프가 두 개 이상인 줄 바로 다음 줄이 |---| 형태의 구분선인지
+    (구 정규식 r'\\|.*\\|.*\\n\\|[-:| ]+\\|'와 같은 의미, 역추적 없이 줄 단위로 검사)
+    """
+    if '\n|' not in text:
+        return False
+    previous = ''
+    for line in text.split('\n'):
+        if previous.count('|') >= 2 and _TABLE_RULE.match(line):
+            return True
+        previous = line
+    return False
@@ -0,0 +1,199 @@
+"""
+Local Classifier
+LLM 분류 결과로 학습한 문자 n-gram 선형 모델. 순수 Python이라 비용은 입력 길이에 비례하며
+(특징 추출이 대부분, 500자 세그먼트에 약 1ms - benchmarks.bench_classifier로 측정)
+LLM 호출보다 수백 배 빠릅니다. 확신이 낮을 때만 LLM에 넘깁니다.
+"""
+
+import json
+import math
+import os
+import random
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# 학습된 모델 경로 (미설정 시 비활성화)
+LOCAL_CLASSIFIER_PATH = os.getenv("LOCAL_CLASSIFIER_PATH", "")
+# 이 확률 이상일 때만 로컬 결과를 사용
+LOCAL_CLASSIFIER_THRESHOLD = float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", 0.9))
+# LLM 분류 결과를 학습 데이터로 남길 JSONL 경로 (미설정 시 기록하지 않음)
+CLASSIFIER_LOG_PATH = os.getenv("CLASSIFIER_LOG_PATH", "")
+
+LABELS = ('TEXT', 'MATH', 'TABLE', 'IMAGE')
+
+# 특징 해시 공간 크기와 n-gram 범위
+FEATURE_DIM = 1 << 18
+NGRAM_RANGE = (2, 4)
+
+# 긴 문단은 앞부분만 봅니다 (분류에 충분하고 지연 시간이 일정해짐)
+MAX_CHARS = 1000
+
+
+def extract_features(text: str, dim: int = FEATURE_DIM, ngram_range: Tuple[int, int] = NGRAM_RANGE) -> Dict[int, float]:
+    """
+    문자 n-gram을 해시해 L2 정규화한 희소 특징 벡터
+
+    프로세스마다 달라지는 hash() 대신 crc32를 써서 저장된 모델과 항상 같은 인덱스가 나옵니다.
+    """
+    padded = f" {text[:MAX_CHARS].lower()} "
+    counts: Counter = Counter()
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        for start in range(len(padded) - n + 1):
+            counts[zlib.crc32(padded[start:start + n].encode('utf-8')) % dim] += 1
+
+    norm = math.sqrt(sum(value * value for value in counts.values())) or 1.0
+    return {index: value / norm for index, value in counts.items()}
+
+
+class LocalClassifier:
+    """다항 로지스틱 회귀 (라벨별 희소 가중치)"""
+
+    def __init__(
+        self,
+        weights: Dict[str, Dict[int, float]] | None = None,
+        bias: Dict[str, float] | None = None,
+        dim: int = FEATURE_DIM,
+        ngram_range: Tuple[int, int] = NGRAM_RANGE,
+    ):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.weights = weights or {label: {} for label in LABELS}
+        self.bias = bias or {label: 0.0 for label in LABELS}
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """
+        Returns:
+            (가장 확률이 높은 라벨, 그 확률)
+        """
+        probabilities = self._probabilities(extract_features(text, self.dim, self.ngram_range))
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label]
+
+    def _probabilities(self, features: Dict[int, float]) -> Dict[str, float]:
+        scores = {}
+        for label in LABELS:
+            weights = self.weights[label]
+            scores[label] = self.bias[label] + sum(weights.get(index, 0.0) * value for index, value in features.items())
+        top = max(scores.values())
+        exp = {label: math.exp(score - top) for label, score in scores.items()}
+        total = sum(exp.values())
+        return {label: value / total for label, value in exp.items()}
+
+    @classmethod
+    def train(
+        cls,
+        samples: Sequence[Tuple[str, str]],
+        epochs: int = 10,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+        seed: int = 0,
+    ) -> "LocalClassifier":
+        """
+        (텍스트, 라벨) 목록으로 SGD 학습
+
+        L2 감쇠는 업데이트되는 특징에만 적용합니다 (희소 벡터용 근사).
+        """
+        model = cls()
+        data = [
+            (extract_features(text, model.dim, model.ngram_range), label)
+            for text, label in samples
+            if label in LABELS
+        ]
+        rng = random.Random(seed)
+
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            rate = learning_rate / (1 + epoch)
+            for features, target in data:
+                probabilities = model._probabilities(features)
+                for label in LABELS:
+                    gradient = probabilities[label] - (1.0 if label == target else 0.0)
+                    weights = model.weights[label]
+                    for index, value in features.items():
+                        weight = weights.get(index, 0.0)
+                        weights[index] = weight - rate * (gradient * value + l2 * weight)
+                    model.bias[label] -= rate * gradient
+
+        # 0에 가까운 가중치는 버려 모델 파일을 줄입니다
+        for label in LABELS:
+            model.weights[label] = {
+                index: weight for index, weight in model.weights[label].items() if abs(weight) > 1e-4
+            }
+        return model
+
+    def save(self, path: str) -> None:
+        payload = {
+            "labels": list(LABELS),
+            "dim": self.dim,
+            "ngram_range": list(self.ngram_range),
+            "bias": self.bias,
+            # JSON 키는 문자열이므로 인덱스를 문자열로 저장
+            "weights": {
+                label: {str(index): round(weight, 6) for index, weight in weights.items()}
+                for label, weights in self.weights.items()
+            },
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+
+    @classmethod
+    def load(cls, path: str) -> "LocalClassifier":
+        with open(path, encoding="utf-8") as handle:
+            payload = json.load(handle)
+        return cls(
+            weights={
+                label: {int(index): weight for index, weight in weights.items()}
+                for label, weights in payload["weights"].items()
+            },
+            bias=payload["bias"],
+            dim=payload["dim"],
+            ngram_range=tuple(payload["ngram_range"]),
+        )
+
+
+def load_samples(paths: Iterable[str]) -> List[Tuple[str, str]]:
+    """decision log(JSONL: {"text", "label"}) 파일들을 읽습니다. 마지막 라벨이 우선합니다."""
+    samples: Dict[str, str] = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if record.get("label") in LABELS:
+                    samples[record["text"]] = record["label"]
+    return list(samples.items())
+
+
+class DecisionLog:
+    """LLM 분류 결과를 JSONL로 추가 기록 (로컬 모델 학습 데이터)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def record(self, text: str, label: str) -> None:
+        line = json.dumps({"text": text, "label": label}, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+def get_default_local_classifier() -> LocalClassifier | None:
+    """LOCAL_CLASSIFIER_PATH에 모델이 있으면 로드 (없으면 None)"""
+    if not LOCAL_CLASSIFIER_PATH or not os.path.exists(LOCAL_CLASSIFIER_PATH):
+        return None
+    return LocalClassifier.load(LOCAL_CLASSIFIER_PATH)
+
+
+def get_default_decision_log() -> DecisionLog | None:
+    return DecisionLog(CLASSIFIER_LOG_PATH) if CLASSIFIER_LOG_PATH else None
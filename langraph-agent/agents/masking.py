@@ -0,0 +1,97 @@
+"""
+Placeholder Masking
+인라인 수식, 인용 번호, URL, 소수/백분율 숫자를 번역 전에 ⟦n⟧ 자리표시자로 바꾸고
+번역 후 되돌립니다. LLM이 그대로 옮겨야 할 구간을 아예 보지 않으므로
+출력 토큰이 줄고, 복원 시 자리표시자 확인만으로 보존 여부를 검증할 수 있습니다.
+"""
+
+import os
+import re
+from typing import List, Tuple
+
+from metrics import Counters
+
+# 0으로 설정하면 마스킹을 끄고 인라인 수식 문단도 MATH 경로로 보냅니다
+TEXT_MASKING = os.getenv("TEXT_MASKING", "1") != "0"
+
+# 마스킹 횟수와 복원 실패 수 (GET /metrics)
+mask_metrics = Counters()
+
+_PLACEHOLDER = re.compile(r'⟦(\d+)⟧')
+
+# 보호 구간 (앞쪽 대안이 우선): URL → 인라인 수식 → 인용 번호 → 소수/백분율
+_PROTECTED = re.compile(
+    r'https?://[^\s<>()\[\]]*[^\s<>()\[\].,;:]'
+    r'|(?<![\\$])\$(?!\$)(?:\\.|[^$\\\n])+?\$'
+    r'|\\\(.+?\\\)'
+    r'|\[\d+(?:\s*[,–-]\s*\d+)*\]'
+    r'|(?<![\w.])\d+(?:\.\d+)?%|(?<![\w.])\d+\.\d+(?![\w.])'
+)
+
+_INLINE_MATH = re.compile(r'(?<![\\$])\$(?!\$)(?:\\.|[^$\\\n])+?\$|\\\(.+?\\\)')
+_DISPLAY_MATH = re.compile(r'\$\$|\\\[|\\begin\{')
+_WORD = re.compile(r'[A-Za-z]{2,}')
+
+# 수식을 뺀 나머지가 이 비율 이상이고 단어가 충분하면 "인라인 수식이 있는 문장"으로 봅니다
+PROSE_MIN_RATIO = 0.6
+PROSE_MIN_WORDS = 5
+
+
+def mask_protected(text: str) -> Tuple[str, List[str]]:
+    """
+    보호 구간을 ⟦0⟧, ⟦1⟧ ... 로 바꿉니다.
+
+    Returns:
+        (마스킹된 텍스트, 자리표시자 순서대로의 원래 구간)
+    """
+    # 원문에 이미 자리표시자 모양이 있으면 복원이 모호해지므로 그대로 둡니다
+    if not TEXT_MASKING or _PLACEHOLDER.search(text):
+        return text, []
+
+    spans: List[str] = []
+
+    def replace(match: re.Match) -> str:
+        spans.append(match.group())
+        return f'⟦{len(spans) - 1}⟧'
+
+    masked = _PROTECTED.sub(replace, text)
+    if spans:
+        mask_metrics.incr("masked_segments")
+        mask_metrics.incr("masked_spans", len(spans))
+    return masked, spans
+
+
+def unmask(translated: str, spans: List[str]) -> str | None:
+    """
+    자리표시자를 원래 구간으로 되돌립니다.
+
+    Returns:
+        모든 자리표시자가 정확히 한 번씩 남아 있으면 복원 결과, 아니면 None
+    """
+    if not spans:
+        return translated
+
+    found = [int(index) for index in _PLACEHOLDER.findall(translated)]
+    if sorted(found) != list(range(len(spans))):
+        mask_metrics.incr("roundtrip_failures")
+        return None
+    return _PLACEHOLDER.sub(lambda match: spans[int(match.group(1))], translated)
+
+
+def is_inline_math_prose(text: str) -> bool:
+    """
+    디스플레이 수식 없이 인라인 수식만 섞인 일반 문장인지
+
+    이런 문단은 수식을 마스킹해 TEXT 경로로 번역할 수 있습니다.
+    """
+    if not TEXT_MASKING or _DISPLAY_MATH.search(text):
+        return False
+    prose = _INLINE_MATH.sub(' ', text)
+    if '$' in prose:
+        # 짝이 맞지 않는 $가 남으면 수식 경로에서 검증받도록 둡니다
+        return False
+    stripped = prose.strip()
+    return (
+        len(stripped) >= PROSE_MIN_RATIO * len(text.strip())
+        and len(_WORD.findall(stripped)) >= PROSE_MIN_WORDS
+    )
@@ -3,90 +3,116 @@ Math Translator Agent
 수식을 번역하고 검증합니다.
 """
 
-from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage
+from agents.base import BaseAgent
+from agents.latex_repair import broken_span, parse_validation_response, repair_latex
+from agents.latex_scanner import scan_latex
+from metrics import Counters
 from prompts.math_prompt import get_math_translation_prompt, get_math_validation_prompt
-import re
 
+# LaTeX 검증/복구 경로별 횟수 (valid / local_repairs / span_reprompts / span_repairs / full_retries / failed)
+latex_metrics = Counters()
 
-class MathTranslator:
-    def __init__(self, model_name: str = "gpt-5-mini"):
-        self.llm = ChatOpenAI(model=model_name, temperature=0.1)
+
+class MathTranslator(BaseAgent):
+    name = "math"
+    temperature = 0.1
+    # 수식은 그대로 두고 한국어 설명을 덧붙이므로 출력이 입력보다 깁니다
+    output_ratio = 3.0
     
     def translate(self, text: str, max_retries: int = 2) -> str:
         """
         수식을 한국어로 번역하고 LaTeX를 검증합니다.
         
+        검증에 실패하면 로컬 복구 → 깨진 구간만 재요청 → 전체 재번역 순으로 시도합니다.
+        
         Args:
             text: 번역할 수식 텍스트
-            max_retries: 검증 실패 시 최대 재시도 횟수
+            max_retries: 전체 재번역 최대 횟수
         
         Returns:
             번역된 텍스트 (LaTeX 포함)
+        
+        Raises:
+            ValueError: 모든 시도가 검증에 실패한 경우. 그래프 노드가 원문을 error와 함께 돌려주므로
+                원문이 번역 결과로 캐시되지 않습니다
         """
+        prompt = get_math_translation_prompt(text, self._use_lean(text))
         for attempt in range(max_retries + 1):
             # 번역 수행
-            prompt = get_math_translation_prompt(text)
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            translated = response.content.strip()
+            translated = self._extract_answer(self._invoke(*prompt))
             
             # LaTeX 검증
             if self._validate_latex(translated):
+                latex_metrics.incr("valid")
                 return translated
             
-            # 실패 시 재시도
+            repaired = self._repair_locally(translated, text)
+            if repaired is None:
+                start, end = broken_span(translated)
+                content = self._invoke(*get_math_validation_prompt(translated[start:end]))
+                repaired = self._splice_span(translated, start, end, content)
+            if repaired is not None:
+                return repaired
+            
+            # 마지막 수단: 전체 재번역
             if attempt < max_retries:
+                latex_metrics.incr("full_retries")
                 print(f"LaTeX validation failed, retrying... (attempt {attempt + 1}/{max_retries})")
-                continue
-            
-            # 최종 실패 시 원본 반환
-            print("Warning: LaTeX validation failed after retries, returning original")
-            return text
         
-        return translated
+        # 최종 실패 (노드가 원문을 실패로 돌려줌)
+        latex_metrics.incr("failed")
+        raise ValueError("LaTeX validation failed after retries")
     
-    def _validate_latex(self, text: str) -> bool:
+    async def atranslate(self, text: str, max_retries: int = 2) -> str:
         """
-        LaTeX 구문이 유효한지 기본적인 검증을 수행합니다.
+        translate의 비동기 버전 (이벤트 루프를 막지 않음)
         """
-        # 기본 균형 체크
-        if not self._check_balanced_delimiters(text):
-            return False
-        
-        # 필수 닫기 태그 체크
-        begin_matches = re.findall(r'\\begin\{(\w+)\}', text)
-        end_matches = re.findall(r'\\end\{(\w+)\}', text)
-        
-        if begin_matches != end_matches:
-            return False
+        prompt = get_math_translation_prompt(text, self._use_lean(text))
+        for attempt in range(max_retries + 1):
+            translated = self._extract_answer(await self._ainvoke(*prompt))
+            
+            if self._validate_latex(translated):
+                latex_metrics.incr("valid")
+                return translated
+            
+            repaired = self._repair_locally(translated, text)
+            if repaired is None:
+                start, end = broken_span(translated)
+                content = await self._ainvoke(*get_math_validation_prompt(translated[start:end]))
+                repaired = self._splice_span(translated, start, end, content)
+            if repaired is not None:
+                return repaired
+            
+            if attempt < max_retries:
+                latex_metrics.incr("full_retries")
+                print(f"LaTeX validation failed, retrying... (attempt {attempt + 1}/{max_retries})")
         
-        return True
+        latex_metrics.incr("failed")
+        raise ValueError("LaTeX validation failed after retries")
     
-    def _check_balanced_delimiters(self, text: str) -> bool:
-        """
-        괄호와 수식 구분자의 균형을 확인합니다.
+    def _repair_locally(self, translated: str, source: str) -> str | None:
+        """원문 수식 복원과 구분자 보정으로 LLM 없이 고칩니다"""
+        repaired = repair_latex(translated, source)
+        if repaired is not None:
+            latex_metrics.incr("local_repairs")
+        return repaired
+    
+    def _splice_span(self, translated: str, start: int, end: int, response: str) -> str | None:
+        """검증 프롬프트가 고친 구간을 제자리에 넣고 다시 검증합니다"""
+        latex_metrics.incr("span_reprompts")
+        corrected = parse_validation_response(response)
+        if corrected is None:
+            return None
+        repaired = translated[:start] + corrected + translated[end:]
+        if not self._validate_latex(repaired):
+            return None
+        latex_metrics.incr("span_repairs")
+        return repaired
+    
+    def _validate_latex(self, text: str) -> bool:
+        r"""
+        LaTeX 구문이 유효한지 기본적인 검증을 수행합니다.
+        중괄호, $ / $$, \[ \], \( \) 균형과 \begin/\end 짝을 한 번의 스캔으로 확인합니다.
         """
-        # 중괄호 균형
-        if text.count('{') != text.count('}'):
-            return False
-        
-        # $ 구분자 균형 (홀수개면 불균형)
-        single_dollar = len(re.findall(r'(?<!\$)\$(?!\$)', text))
-        if single_dollar % 2 != 0:
-            return False
-        
-        # $$ 구분자 균형
-        double_dollar = len(re.findall(r'\$\$', text))
-        if double_dollar % 2 != 0:
-            return False
-        
-        # \[ \] 균형
-        if text.count('\\[') != text.count('\\]'):
-            return False
-        
-        # \( \) 균형
-        if text.count('\\(') != text.count('\\)'):
-            return False
-        
-        return True
+        return scan_latex(text).balanced
 
@@ -0,0 +1,163 @@
+"""
+Streaming Cleaner
+스트리밍 응답 조각을 도착하는 대로 정제합니다. <translation> 태그 밖의 내용은 버리고
+자리표시자 ⟦n⟧는 완성되는 즉시 원래 구간으로 되돌립니다.
+태그나 자리표시자의 일부일 수 있는 끝부분은 다음 조각이 올 때까지 붙잡아 둡니다.
+"""
+
+import re
+from typing import List
+
+_OPEN = '<translation>'
+_CLOSE = '</translation>'
+
+_PLACEHOLDER = re.compile(r'⟦(\d+)⟧')
+_PARTIAL_PLACEHOLDER = re.compile(r'⟦\d*$')
+
+# 태그 없는 응답의 줄 규칙 (TextTranslator._clean_translation과 같음): 라벨 뒤 내용만 남기는 줄 / 버리는 줄
+_LABELS = ('Thought:', 'Output:', 'Translation:', 'Korean:')
+_META = ('Reasoning:', 'Analysis:')
+
+
+class StreamCleaner:
+    """
+    조각 단위 정제기
+
+    search: 여는 태그를 찾는 중 (사고 과정 줄과 빈 줄은 태그가 나오면 버림)
+    answer: 태그 안의 답을 내보내는 중 (닫는 태그에서 done)
+    plain: 태그 없이 답이 시작된 응답 - 완성된 줄 단위로 기존 줄 규칙을 적용
+    """
+
+    def __init__(self, spans: List[str] | None = None):
+        self.spans = spans or []
+        self.mode = "search"
+        self.buffer = ""
+        # 자리표시자 복원 전 대기 중인 정제 결과
+        self.pending = ""
+        # 답이 시작되었는지 (앞쪽 공백/빈 줄 제거용)
+        self.started = False
+        # search: 태그 없는 응답이면 다시 읽을 수 있게 버퍼에 남겨 둔 줄들의 길이
+        self.scanned = 0
+        # plain: 다음 내용 줄이 올 때까지 붙잡아 둔 빈 줄들 (끝의 빈 줄은 버림)
+        self.blank = ""
+
+    def feed(self, chunk: str) -> str:
+        """조각을 받아 지금 내보낼 수 있는 정제된 텍스트를 돌려줍니다"""
+        self.buffer += chunk
+        return self._restore(self._drain(final=False), final=False)
+
+    def finish(self) -> str:
+        """스트림이 끝났을 때 붙잡아 둔 나머지를 돌려줍니다"""
+        return self._restore(self._drain(final=True), final=True)
+
+    def _drain(self, final: bool) -> str:
+        pieces = []
+        while self.buffer:
+            if self.mode == "search":
+                if not self._search(final):
+                    break
+            elif self.mode == "answer":
+                pieces.append(self._answer(final))
+                break
+            elif self.mode == "plain":
+                piece = self._plain(final)
+                if piece is None:
+                    break
+                pieces.append(piece)
+            else:
+                # 닫는 태그 뒤의 내용은 버립니다
+                self.buffer = ""
+        return ''.join(pieces)
+
+    def _search(self, final: bool) -> bool:
+        """
+        여는 태그나 답의 첫 줄을 찾으면 모드를 바꾸고 True
+
+        사고 과정 줄과 빈 줄은 뒤에 태그가 올 수 있어 버퍼에 남겨 둡니다.
+        태그 없이 답이 시작되면 plain 모드가 남겨 둔 줄부터 같은 줄 규칙으로 다시 읽습니다.
+        """
+        index = self.buffer.find(_OPEN)
+        if index != -1:
+            self.buffer = self.buffer[index + len(_OPEN):]
+            self.mode = "answer"
+            return True
+
+        while True:
+            newline = self.buffer.find('\n', self.scanned)
+            if newline == -1 and not final:
+                return False
+            line = self.buffer[self.scanned:] if newline == -1 else self.buffer[self.scanned:newline]
+            stripped = line.strip()
+            if newline == -1 or (stripped and not stripped.startswith(('Thought:',) + _META)):
+                self.mode = "plain"
+                return True
+            self.scanned = newline + 1
+
+    def _answer(self, final: bool) -> str:
+        close = self.buffer.find(_CLOSE)
+        if close != -1:
+            text, self.buffer = self.buffer[:close], ""
+            self.mode = "done"
+        elif final:
+            text, self.buffer = self.buffer, ""
+        else:
+            held = self._held(self.buffer)
+            text, self.buffer = self.buffer[:len(self.buffer) - held], self.buffer[len(self.buffer) - held:]
+
+        if not self.started:
+            text = text.lstrip()
+            self.started = bool(text)
+        if self.mode == "done" or final:
+            text = text.rstrip()
+        return text
+
+    def _held(self, text: str) -> int:
+        """닫는 태그의 앞부분일 수 있는 끝 조각과 그 앞의 공백 길이"""
+        held = 0
+        for size in range(min(len(text), len(_CLOSE) - 1), 0, -1):
+            if _CLOSE.startswith(text[-size:]):
+                held = size
+                break
+        body = text[:len(text) - held]
+        return held + len(body) - len(body.rstrip())
+
+    def _plain(self, final: bool) -> str | None:
+        """완성된 줄 하나를 정제해 돌려줍니다 (줄이 아직 끝나지 않았으면 None)"""
+        newline = self.buffer.find('\n')
+        if newline == -1 and not final:
+            return None
+        line = self.buffer if newline == -1 else self.buffer[:newline]
+        self.buffer = "" if newline == -1 else self.buffer[newline + 1:]
+
+        if line.startswith(_META):
+            return ""
+        if line.startswith(_LABELS):
+            line = line.split(':', 1)[1].strip()
+        if not line.strip():
+            # 앞뒤 빈 줄은 최종 정제(strip)에서 사라지므로 사이에 낀 것만 내보냅니다
+            if self.started:
+                self.blank += '\n' + line
+            return ""
+        if not self.started:
+            self.started = True
+            return line
+        text, self.blank = self.blank + '\n' + line, ""
+        return text
+
+    def _restore(self, text: str, final: bool) -> str:
+        """완성된 자리표시자를 원래 구간으로 바꿉니다 (끝의 미완성 자리표시자는 붙잡아 둠)"""
+        self.pending += text
+        if not self.spans:
+            text, self.pending = self.pending, ""
+            return text
+
+        cut = len(self.pending)
+        partial = None if final else _PARTIAL_PLACEHOLDER.search(self.pending)
+        if partial:
+            cut = partial.start()
+        text, self.pending = self.pending[:cut], self.pending[cut:]
+        return _PLACEHOLDER.sub(self._span, text)
+
+    def _span(self, match: re.Match) -> str:
+        index = int(match.group(1))
+        return self.spans[index] if index < len(self.spans) else match.group()
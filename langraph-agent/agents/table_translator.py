@@ -3,14 +3,13 @@ Table Translator Agent
 표 구조를 유지하면서 번역합니다.
 """
 
-from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage
+from agents.base import BaseAgent
 from prompts.table_prompt import get_table_translation_prompt
 
 
-class TableTranslator:
-    def __init__(self, model_name: str = "gpt-5-mini"):
-        self.llm = ChatOpenAI(model=model_name, temperature=0.1)
+class TableTranslator(BaseAgent):
+    name = "table"
+    temperature = 0.1
     
     def translate(self, text: str) -> str:
         """
@@ -21,18 +20,32 @@ class TableTranslator:
         
         Returns:
             번역된 표 (구조 유지)
+        
+        Raises:
+            ValueError: 표 구조가 깨진 경우 (그래프 노드가 원문을 error와 함께 돌려줌)
         """
-        prompt = get_table_translation_prompt(text)
-        response = self.llm.invoke([HumanMessage(content=prompt)])
+        content = self._invoke(*get_table_translation_prompt(text, self._use_lean(text)))
         
-        translated = response.content.strip()
+        return self._finalize(text, content)
+    
+    async def atranslate(self, text: str) -> str:
+        """
+        translate의 비동기 버전 (이벤트 루프를 막지 않음)
+        """
+        content = await self._ainvoke(*get_table_translation_prompt(text, self._use_lean(text)))
+        return self._finalize(text, content)
+    
+    def _finalize(self, original: str, response_content: str) -> str:
+        """
+        응답을 정리하고 표 구조가 깨졌으면 ValueError를 던집니다.
+        (원본을 번역 결과처럼 돌려주면 실패가 캐시됩니다)
+        """
+        translated = self._extract_answer(response_content)
         
         # 표 구조 검증
-        if self._validate_table_structure(text, translated):
+        if self._validate_table_structure(original, translated):
             return translated
-        else:
-            print("Warning: Table structure validation failed, returning original")
-            return text
+        raise ValueError("Table structure validation failed")
     
     def _validate_table_structure(self, original: str, translated: str) -> bool:
         """
@@ -3,14 +3,26 @@ Text Translator Agent
 일반 텍스트를 한국어로 번역합니다.
 """
 
-from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage
+import json
+import re
+from typing import Awaitable, Callable, List, Tuple
+
+from agents.base import BaseAgent
+from agents.masking import mask_protected, unmask
+from agents.streaming import StreamCleaner
+from metrics import Counters
+from prompts.batch_prompt import get_batch_translation_prompt
 from prompts.translation_prompt import get_translation_prompt
 
+# 묶음 번역 호출/세그먼트/누락 수 (GET /metrics)
+pack_metrics = Counters()
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
 
-class TextTranslator:
-    def __init__(self, model_name: str = "gpt-5-mini"):
-        self.llm = ChatOpenAI(model=model_name, temperature=0.3)
+
+class TextTranslator(BaseAgent):
+    name = "text"
+    temperature = 0.3
     
     def translate(self, text: str, context: str = "") -> str:
         """
@@ -23,13 +35,125 @@ class TextTranslator:
         Returns:
             번역된 한국어 텍스트
         """
-        prompt = get_translation_prompt(text, context)
-        response = self.llm.invoke([HumanMessage(content=prompt)])
+        # 인라인 수식, 인용, URL, 숫자는 자리표시자로 가린 뒤 번역
+        masked, spans = mask_protected(text)
+        lean = self._use_lean(masked)
+        content = self._invoke(*get_translation_prompt(masked, context, lean))
+        
+        # <translation> 태그 안의 답을 정제한 뒤 자리표시자 복원
+        translated = unmask(self._clean_translation(self._extract_answer(content)), spans)
+        if translated is None:
+            # 자리표시자가 빠지거나 중복되면 가리지 않은 원문으로 다시 번역
+            content = self._invoke(*get_translation_prompt(text, context, lean))
+            translated = self._clean_translation(self._extract_answer(content))
+        return translated
+    
+    async def atranslate(self, text: str, context: str = "") -> str:
+        """
+        translate의 비동기 버전 (이벤트 루프를 막지 않음)
+        """
+        masked, spans = mask_protected(text)
+        lean = self._use_lean(masked)
+        content = await self._ainvoke(*get_translation_prompt(masked, context, lean))
+        translated = unmask(self._clean_translation(self._extract_answer(content)), spans)
+        if translated is None:
+            content = await self._ainvoke(*get_translation_prompt(text, context, lean))
+            translated = self._clean_translation(self._extract_answer(content))
+        return translated
+    
+    async def astream(self, text: str, context: str, on_delta: Callable[[str], Awaitable[None]]) -> str:
+        """
+        atranslate의 스트리밍 버전. 응답 조각을 정제·복원해 도착하는 대로 on_delta로 넘깁니다.
+        
+        조각은 미리보기입니다. 반환값은 전체 응답을 atranslate와 같은 규칙으로 정제한 최종 번역이며,
+        자리표시자 복원에 실패하면 가리지 않은 원문으로 다시 번역한 결과입니다.
+        """
+        masked, spans = mask_protected(text)
+        lean = self._use_lean(masked)
+        cleaner = StreamCleaner(spans)
+        
+        async def forward(chunk: str) -> None:
+            delta = cleaner.feed(chunk)
+            if delta:
+                await on_delta(delta)
         
-        # 번역 결과 정제
-        translated = self._clean_translation(response.content)
+        content = await self._astream(*get_translation_prompt(masked, context, lean), forward)
+        tail = cleaner.finish()
+        if tail:
+            await on_delta(tail)
+        
+        translated = unmask(self._clean_translation(self._extract_answer(content)), spans)
+        if translated is None:
+            content = await self._ainvoke(*get_translation_prompt(text, context, lean))
+            translated = self._clean_translation(self._extract_answer(content))
         return translated
     
+    def translate_many(self, texts: List[str], content_type: str = "TEXT", context: str = "") -> List[str | None]:
+        """
+        짧은 세그먼트 여러 개를 한 번의 LLM 호출로 번역합니다.
+        
+        Args:
+            texts: 번역할 세그먼트 목록 (같은 콘텐츠 타입)
+            content_type: 'TEXT' 또는 'IMAGE' (프롬프트의 세그먼트 설명)
+            context: 모든 세그먼트에 공통인 추가 컨텍스트
+        
+        Returns:
+            입력 순서대로의 번역 결과. 응답에서 찾지 못한 항목은 None
+            (호출자가 개별 번역으로 대체합니다)
+        """
+        masked = [mask_protected(text) for text in texts]
+        content = self._invoke(*get_batch_translation_prompt([text for text, _ in masked], content_type, context))
+        return self._unmask_many(self._split_translations(content, len(texts)), masked)
+    
+    async def atranslate_many(self, texts: List[str], content_type: str = "TEXT", context: str = "") -> List[str | None]:
+        """
+        translate_many의 비동기 버전
+        """
+        masked = [mask_protected(text) for text in texts]
+        content = await self._ainvoke(*get_batch_translation_prompt([text for text, _ in masked], content_type, context))
+        return self._unmask_many(self._split_translations(content, len(texts)), masked)
+    
+    def _unmask_many(self, translations: List[str | None], masked: List[Tuple[str, List[str]]]) -> List[str | None]:
+        """묶음 번역 결과의 자리표시자 복원 (실패한 항목은 None → 개별 번역)"""
+        return [
+            unmask(translated, spans) if translated is not None else None
+            for translated, (_, spans) in zip(translations, masked)
+        ]
+    
+    def _split_translations(self, response: str, count: int) -> List[str | None]:
+        """
+        {"translations": [{"id", "text"}]} 응답을 세그먼트별로 나눕니다.
+        형식이 깨졌거나 빠진 번호는 None으로 남깁니다.
+        """
+        pack_metrics.incr("calls")
+        pack_metrics.incr("segments", count)
+        
+        results: List[str | None] = [None] * count
+        for item in self._load_translations(response):
+            if not isinstance(item, dict):
+                continue
+            index = item.get("id")
+            text = item.get("text")
+            if isinstance(index, int) and 1 <= index <= count and isinstance(text, str) and text.strip():
+                results[index - 1] = text.strip()
+        
+        pack_metrics.incr("missing", sum(1 for result in results if result is None))
+        return results
+    
+    def _load_translations(self, response: str) -> list:
+        fenced = _FENCE.search(response)
+        if fenced:
+            response = fenced.group(1)
+        start, end = response.find('{'), response.rfind('}')
+        if start == -1 or end <= start:
+            return []
+        try:
+            parsed = json.loads(response[start:end + 1])
+        except json.JSONDecodeError:
+            return []
+        translations = parsed.get("translations") if isinstance(parsed, dict) else None
+        return translations if isinstance(translations, list) else []
+    
     def _clean_translation(self, text: str) -> str:
         """
         번역 결과에서 불필요한 부분 제거
@@ -0,0 +1,6 @@
+"""
+Benchmarks package
+
+각 스크립트는 langraph-agent 디렉토리에서 실행합니다:
+    python -m benchmarks.bench_extract paper.pdf
+"""
@@ -0,0 +1,88 @@
+"""
+콘텐츠 분류 벤치마크
+라벨이 붙은 JSONL(decision log 형식)로 로컬 모델과 기존 경로(휴리스틱 + LLM)의
+정확도와 항목당 지연 시간을 비교합니다.
+
+사용법:
+    python -m benchmarks.bench_classifier data/labelled.jsonl --model data/classifier.json
+    python -m benchmarks.bench_classifier data/labelled.jsonl --model data/classifier.json --llm 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, List, Tuple
+
+from agents.local_classifier import LOCAL_CLASSIFIER_THRESHOLD, LocalClassifier, load_samples
+
+
+def _report(name: str, samples: List[Tuple[str, str]], predictions: List[str | None], seconds: List[float]) -> None:
+    answered = [(predicted, label) for predicted, (_, label) in zip(predictions, samples) if predicted]
+    correct = sum(predicted == label for predicted, label in answered)
+    print(f"{name:<16} answered {len(answered) / len(samples):6.1%}"
+          f"  accuracy {correct / max(len(answered), 1):6.1%}"
+          f"  median {statistics.median(seconds) * 1e6:10.1f} us"
+          f"  max {max(seconds) * 1e6:10.1f} us")
+
+
+def _run(samples: List[Tuple[str, str]], classify: Callable[[str], str | None]) -> Tuple[List[str | None], List[float]]:
+    predictions: List[str | None] = []
+    seconds: List[float] = []
+    for text, _ in samples:
+        started = time.perf_counter()
+        predictions.append(classify(text))
+        seconds.append(time.perf_counter() - started)
+    return predictions, seconds
+
+
+async def _run_llm(samples: List[Tuple[str, str]], model: str) -> Tuple[List[str | None], List[float]]:
+    from dotenv import load_dotenv
+
+    from agents.content_classifier import ContentClassifier
+
+    load_dotenv()
+    # 로컬 모델/디스크 캐시/기록 없이 기존 경로만 측정
+    classifier = ContentClassifier(model)
+    classifier.local = None
+    classifier.decision_log = None
+    predictions: List[str | None] = []
+    seconds: List[float] = []
+    for text, _ in samples:
+        started = time.perf_counter()
+        predictions.append(await classifier.aclassify(text))
+        seconds.append(time.perf_counter() - started)
+    return predictions, seconds
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare the local classifier with the heuristic + LLM path")
+    parser.add_argument("labelled", help="JSONL with {\"text\", \"label\"} per line")
+    parser.add_argument("--model", required=True, help="Model trained by scripts.train_local_classifier")
+    parser.add_argument("--threshold", type=float, default=LOCAL_CLASSIFIER_THRESHOLD)
+    parser.add_argument("--llm", type=int, default=0, help="Also classify the first N samples with the LLM path")
+    parser.add_argument("--llm-model", default="gpt-5-mini")
+    args = parser.parse_args(argv)
+
+    samples = load_samples([args.labelled])
+    local = LocalClassifier.load(args.model)
+    print(f"{len(samples)} samples")
+
+    predictions, seconds = _run(samples, lambda text: local.predict(text)[0])
+    _report("local (all)", samples, predictions, seconds)
+
+    def confident(text: str) -> str | None:
+        label, probability = local.predict(text)
+        return label if probability >= args.threshold else None
+
+    predictions, seconds = _run(samples, confident)
+    _report(f"local (>= {args.threshold})", samples, predictions, seconds)
+
+    if args.llm:
+        subset = samples[:args.llm]
+        predictions, seconds = asyncio.run(_run_llm(subset, args.llm_model))
+        _report("heuristic + llm", subset, predictions, seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+PDF 라인 추출 벤치마크
+직렬 추출과 프로세스 풀 추출의 속도를 워커 수별로 비교하고 결과가 동일한지 확인합니다.
+
+사용법:
+    python -m benchmarks.bench_extract proceedings.pdf --workers 1 2 4 8 --repeat 3
+"""
+
+import argparse
+import os
+import time
+from typing import List
+
+from processors.pdf_pipeline import extract_raw_lines
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: List[str] | None = None) -> None:
+    cpu_count = os.cpu_count() or 1
+    default_workers = [n for n in (1, 2, 4, 8, 16) if n <= cpu_count]
+
+    parser = argparse.ArgumentParser(description="Benchmark serial vs multiprocess extract_raw_lines")
+    parser.add_argument("pdf")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with open(args.pdf, "rb") as handle:
+        pdf_bytes = handle.read()
+
+    serial = extract_raw_lines(pdf_bytes, workers=1)
+    print(f"{args.pdf}: {len(serial)} lines, {cpu_count} CPUs")
+
+    baseline = _best_of(args.repeat, lambda: extract_raw_lines(pdf_bytes, workers=1))
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}  identical")
+    print(f"{'serial':>8} {baseline:9.3f} {1.0:8.2f}  yes")
+
+    for workers in args.workers:
+        if workers <= 1:
+            continue
+        # 첫 호출은 풀 생성과 워커 import 비용을 포함하므로 측정에서 제외합니다
+        parallel = extract_raw_lines(pdf_bytes, workers=workers, min_parallel_pages=0)
+        identical = parallel == serial
+        elapsed = _best_of(
+            args.repeat,
+            lambda: extract_raw_lines(pdf_bytes, workers=workers, min_parallel_pages=0),
+        )
+        print(f"{workers:>8} {elapsed:9.3f} {baseline / elapsed:8.2f}  {'yes' if identical else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
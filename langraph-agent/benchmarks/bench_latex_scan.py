@@ -0,0 +1,114 @@
+"""
+LaTeX 스캔 마이크로벤치마크
+기존 정규식 기반 _quick_classify 수식/표 검사와 _validate_latex를
+latex_scanner의 단일 패스 스캔과 비교합니다. 실제 논문 문단과 최악의 입력을 함께 측정합니다.
+
+사용법:
+    python -m benchmarks.bench_latex_scan
+    python -m benchmarks.bench_latex_scan paper.tex --repeat 20
+"""
+
+import argparse
+import re
+import time
+from typing import Callable, Dict, List
+
+from agents.latex_scanner import has_markdown_table, looks_like_math, scan_latex
+
+# 이전 구현 (content_classifier / math_translator)
+_LEGACY_MATH = re.compile(r'\$\$?.*\$\$?|\\\[|\\\]|\\begin\{equation\}|\\begin\{align\}')
+_LEGACY_TABLE = re.compile(r'\|.*\|.*\n\|[-:| ]+\|')
+
+
+def legacy_is_math_or_table(text: str) -> bool:
+    return bool(_LEGACY_MATH.search(text)) or bool(_LEGACY_TABLE.search(text)) or text.count('|') > 4
+
+
+def scanner_is_math_or_table(text: str) -> bool:
+    return looks_like_math(text) or text.count('|') > 4 or has_markdown_table(text)
+
+
+def legacy_validate(text: str) -> bool:
+    if text.count('{') != text.count('}'):
+        return False
+    if len(re.findall(r'(?<!\$)\$(?!\$)', text)) % 2 != 0:
+        return False
+    if len(re.findall(r'\$\$', text)) % 2 != 0:
+        return False
+    if text.count('\\[') != text.count('\\]'):
+        return False
+    if text.count('\\(') != text.count('\\)'):
+        return False
+    return re.findall(r'\\begin\{(\w+)\}', text) == re.findall(r'\\end\{(\w+)\}', text)
+
+
+def scanner_validate(text: str) -> bool:
+    return scan_latex(text).balanced
+
+
+# 대표 문단 (코퍼스 파일이 없을 때 사용)
+SAMPLE_PARAGRAPHS = [
+    "We propose a novel approach to image classification that outperforms previous methods by a large margin.",
+    "The loss function is defined as $L = \\sum_{i=1}^n (y_i - \\hat{y}_i)^2$ where $y_i$ is the target.",
+    "\\begin{align} \\nabla_\\theta J(\\theta) &= \\mathbb{E}[\\nabla_\\theta \\log \\pi_\\theta(a|s) A(s,a)] \\\\ "
+    "&\\approx \\frac{1}{N} \\sum_{i} g_i \\end{align}",
+    "| Method | Accuracy | F1 |\n|---|---|---|\n| BERT | 92.3 | 0.91 |\n| Ours | 94.1 | 0.93 |",
+    "Figure 3: Overview of the proposed architecture with encoder, bottleneck and decoder.",
+]
+
+
+def worst_cases(size: int) -> Dict[str, str]:
+    """정규식 역추적을 유발하는 입력 (size는 대략적인 문자 수)"""
+    return {
+        "pipes, no rule line": "|" + " a |" * (size // 4),
+        "pipes + newline, no rule": ("| a " * (size // 8)) + "|\n" + "x" * (size // 2),
+        "one dollar, long line": "$" + "x" * size,
+        "many dollars": "$ " * (size // 2),
+        "deep braces": "{" * (size // 2) + "}" * (size // 2),
+    }
+
+
+def _time(fn: Callable[[str], bool], texts: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _load_paragraphs(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as handle:
+        return [paragraph.strip() for paragraph in handle.read().split("\n\n") if paragraph.strip()]
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark regex-based vs single-pass LaTeX scanning")
+    parser.add_argument("corpus", nargs="?", help="Text/TeX file with paragraphs separated by blank lines")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--size", type=int, default=4000, help="Approximate length of worst-case inputs")
+    args = parser.parse_args(argv)
+
+    paragraphs = _load_paragraphs(args.corpus) if args.corpus else SAMPLE_PARAGRAPHS * 200
+    print(f"{len(paragraphs)} paragraphs")
+
+    for name, legacy, scanner in (
+        ("classify", legacy_is_math_or_table, scanner_is_math_or_table),
+        ("validate", legacy_validate, scanner_validate),
+    ):
+        disagree = sum(legacy(text) != scanner(text) for text in paragraphs)
+        legacy_seconds = _time(legacy, paragraphs, args.repeat)
+        scanner_seconds = _time(scanner, paragraphs, args.repeat)
+        print(f"{name:<9} legacy {legacy_seconds * 1e3:9.2f} ms  scanner {scanner_seconds * 1e3:9.2f} ms"
+              f"  ({disagree} disagreements)")
+
+    print("worst cases (classify):")
+    for name, text in worst_cases(args.size).items():
+        legacy_seconds = _time(legacy_is_math_or_table, [text], 1)
+        scanner_seconds = _time(scanner_is_math_or_table, [text], 1)
+        print(f"  {name:<26} legacy {legacy_seconds * 1e3:10.2f} ms  scanner {scanner_seconds * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
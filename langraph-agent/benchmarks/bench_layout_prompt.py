@@ -0,0 +1,107 @@
+"""
+레이아웃 프롬프트 인코딩 벤치마크
+JSON 인코딩과 compact 인코딩의 페이지별 입력 토큰 수를 비교하고,
+--llm 옵션을 주면 실제 모델로 두 형식의 지연 시간과 분할 일치도를 측정합니다.
+
+사용법:
+    python -m benchmarks.bench_layout_prompt paper.pdf
+    python -m benchmarks.bench_layout_prompt paper.pdf --llm --pages 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Sequence
+
+from prompts.layout_prompt import build_layout_prompt, estimate_tokens
+from processors.pdf_pipeline import RawLine, _group_by_page, _request_segmentation, extract_raw_lines
+
+try:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("o200k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+
+except ImportError:  # tiktoken은 langchain-openai와 함께 설치됩니다
+    count_tokens = estimate_tokens
+
+
+def _block_of(parsed: Dict) -> Dict[str, int]:
+    return {
+        line_id: index
+        for index, block in enumerate(parsed.get("blocks", []))
+        for line_id in block.get("line_ids", [])
+    }
+
+
+def agreement(reference: Dict, candidate: Dict, lines: Sequence[RawLine]) -> float:
+    """
+    인접한 라인 쌍이 같은 블록인지에 대한 두 분할의 일치 비율
+    """
+    ref_blocks = _block_of(reference)
+    cand_blocks = _block_of(candidate)
+    pairs = list(zip(lines, lines[1:]))
+    if not pairs:
+        return 1.0
+
+    agree = 0
+    for first, second in pairs:
+        same_ref = ref_blocks.get(first.line_id, -1) == ref_blocks.get(second.line_id, -2)
+        same_cand = cand_blocks.get(first.line_id, -1) == cand_blocks.get(second.line_id, -2)
+        agree += same_ref == same_cand
+    return agree / len(pairs)
+
+
+async def _compare_with_llm(pages: Dict[int, List[RawLine]], limit: int, model: str) -> None:
+    from dotenv import load_dotenv
+    from langchain_openai import ChatOpenAI
+
+    load_dotenv()
+    llm = ChatOpenAI(model=model, temperature=0)
+    latencies = {False: [], True: []}
+    scores: List[float] = []
+
+    for page, page_lines in list(pages.items())[:limit]:
+        results = {}
+        for compact in (False, True):
+            started = time.perf_counter()
+            _, parsed = await _request_segmentation(llm, page, page_lines, timeout=120, compact=compact)
+            latencies[compact].append(time.perf_counter() - started)
+            results[compact] = parsed
+        scores.append(agreement(results[False], results[True], page_lines))
+        print(f"page {page:>4}: agreement {scores[-1]:.2%}")
+
+    print(f"latency (median): json {statistics.median(latencies[False]):.2f}s"
+          f"  compact {statistics.median(latencies[True]):.2f}s")
+    print(f"segmentation agreement (mean): {statistics.mean(scores):.2%}")
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare JSON and compact layout prompt encodings")
+    parser.add_argument("pdf")
+    parser.add_argument("--llm", action="store_true", help="Also call the model and compare segmentations")
+    parser.add_argument("--pages", type=int, default=5, help="Pages to send to the model with --llm")
+    parser.add_argument("--model", default="gpt-5-mini")
+    args = parser.parse_args(argv)
+
+    with open(args.pdf, "rb") as handle:
+        pages = _group_by_page(extract_raw_lines(handle.read()))
+
+    totals = {False: 0, True: 0}
+    for page, page_lines in pages.items():
+        for compact in (False, True):
+            totals[compact] += count_tokens(build_layout_prompt(page, page_lines, compact=compact))
+
+    print(f"{len(pages)} pages")
+    print(f"input tokens: json {totals[False]}  compact {totals[True]}"
+          f"  ({1 - totals[True] / max(totals[False], 1):.0%} fewer)")
+
+    if args.llm:
+        asyncio.run(_compare_with_llm(pages, args.pages, args.model))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+RawLine 메모리/직렬화 벤치마크
+기존 dict 기반 dataclass + __dict__ 직렬화와 slots 기반 RawLine + serialize_raw_lines를 비교합니다.
+
+사용법:
+    python -m benchmarks.bench_raw_lines thesis.pdf --copies 10
+"""
+
+import argparse
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+from processors.pdf_pipeline import RawLine, extract_raw_lines, serialize_raw_lines
+
+
+@dataclass
+class LegacyRawLine:
+    """이전 RawLine 정의 (slots 없음)"""
+
+    line_id: str
+    page: int
+    text: str
+    bbox: Tuple[float, float, float, float]
+    font_size: float
+    font_name: str | None
+    column_hint: float
+
+
+def _measure(build: Callable[[], list]) -> Tuple[list, int]:
+    """build가 새로 할당한 메모리(바이트)"""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def _time(fn: Callable[[], object], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark RawLine memory and serialization")
+    parser.add_argument("pdf")
+    parser.add_argument("--copies", type=int, default=1, help="Replicate lines to simulate larger documents")
+    args = parser.parse_args(argv)
+
+    with open(args.pdf, "rb") as handle:
+        lines = extract_raw_lines(handle.read(), workers=1) * args.copies
+
+    fields = [
+        (line.line_id, line.page, line.text, line.bbox, line.font_size, line.font_name, line.column_hint)
+        for line in lines
+    ]
+
+    legacy, legacy_bytes = _measure(lambda: [LegacyRawLine(*values) for values in fields])
+    slotted, slotted_bytes = _measure(lambda: [RawLine(*values) for values in fields])
+
+    legacy_seconds = _time(lambda: [line.__dict__ for line in legacy])
+    slotted_seconds = _time(lambda: serialize_raw_lines(slotted))
+
+    print(f"{len(lines)} lines")
+    print(f"object overhead : legacy {legacy_bytes / 1e6:8.2f} MB  slots {slotted_bytes / 1e6:8.2f} MB"
+          f"  ({1 - slotted_bytes / legacy_bytes:.0%} less)")
+    print(f"serialization   : legacy {legacy_seconds * 1e3:8.2f} ms  slots {slotted_seconds * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+LLM 스케줄러 시뮬레이션
+RPM/TPM 한도를 강제하는 로컬 fake LLM에 백그라운드 레이아웃 호출 폭주와
+화면 번역 호출을 동시에 보내고, 스케줄러 없이(클라이언트 재시도만) 보낼 때와 비교합니다.
+429 횟수, 실패한 호출, 한도 대비 처리량, 레인별 지연을 출력합니다.
+
+사용법:
+    python -m benchmarks.bench_scheduler
+    python -m benchmarks.bench_scheduler --rpm 1200 --tpm 120000 --background 120 --interactive 30
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List
+
+from llm.scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, LLMScheduler
+
+
+class FakeRateLimitError(Exception):
+    """provider의 429 응답"""
+
+    status_code = 429
+
+
+@dataclass
+class FakeResponse:
+    content: str
+    usage_metadata: Dict[str, int]
+
+
+class RateLimitedFakeLLM:
+    """
+    분당 한도를 강제하는 fake LLM
+
+    provider처럼 요청 수/토큰 수 버킷을 연속으로 채우고 (용량 = burst초 분량),
+    요청 시점에 잔량이 모자라면 FakeRateLimitError(429)를 던집니다.
+    """
+
+    def __init__(self, rpm: float, tpm: float, burst: float = 1.0, latency: float = 0.2):
+        self.limits = (rpm / 60, tpm / 60)
+        self.capacity = (rpm * burst / 60, tpm * burst / 60)
+        self.levels = list(self.capacity)
+        self.updated = time.monotonic()
+        self.latency = latency
+        self.accepted = 0
+        self.rejected = 0
+        self.tokens = 0
+
+    async def ainvoke(self, tokens: int) -> FakeResponse:
+        now = time.monotonic()
+        for index, rate in enumerate(self.limits):
+            self.levels[index] = min(self.capacity[index], self.levels[index] + (now - self.updated) * rate)
+        self.updated = now
+        if self.levels[0] < 1 or self.levels[1] < min(tokens, self.capacity[1]):
+            self.rejected += 1
+            raise FakeRateLimitError("rate limit exceeded")
+
+        self.levels[0] -= 1
+        self.levels[1] -= tokens
+        self.accepted += 1
+        self.tokens += tokens
+        await asyncio.sleep(self.latency * random.uniform(0.5, 1.5))
+        return FakeResponse("ok", {"input_tokens": tokens // 2, "output_tokens": tokens - tokens // 2, "total_tokens": tokens})
+
+
+@dataclass
+class LaneResult:
+    latencies: List[float] = field(default_factory=list)
+    failures: int = 0
+
+
+async def client_retry(call: Callable[[], Awaitable[Any]], retries: int = 2, backoff: float = 0.5) -> Any:
+    """스케줄러 없는 경우: SDK 기본값처럼 짧은 고정 백오프로 몇 번만 재시도"""
+    for attempt in range(retries + 1):
+        try:
+            return await call()
+        except FakeRateLimitError:
+            if attempt == retries:
+                raise
+            await asyncio.sleep(backoff * (attempt + 1))
+
+
+async def simulate(args: argparse.Namespace, scheduled: bool) -> Dict[str, Any]:
+    llm = RateLimitedFakeLLM(args.rpm, args.tpm, args.burst, args.latency)
+    scheduler = LLMScheduler(args.rpm, args.tpm, burst_seconds=args.burst, backoff_base=0.2, backoff_max=5)
+    lanes = {PRIORITY_INTERACTIVE: LaneResult(), PRIORITY_BACKGROUND: LaneResult()}
+
+    async def one(tokens: int, priority: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        started = time.monotonic()
+        try:
+            if scheduled:
+                await scheduler.arun(lambda: llm.ainvoke(tokens), tokens, priority)
+            else:
+                await client_retry(lambda: llm.ainvoke(tokens))
+        except FakeRateLimitError:
+            lanes[priority].failures += 1
+            return
+        lanes[priority].latencies.append(time.monotonic() - started)
+
+    started = time.monotonic()
+    await asyncio.gather(
+        # 업로드 직후 모든 페이지의 레이아웃 호출이 한꺼번에 들어옵니다
+        *(one(args.background_tokens, PRIORITY_BACKGROUND, 0) for _ in range(args.background)),
+        # 사용자가 보고 있는 페이지의 번역은 조금씩 나눠 들어옵니다
+        *(one(args.interactive_tokens, PRIORITY_INTERACTIVE, 0.5 + index * 0.1) for index in range(args.interactive)),
+    )
+    elapsed = time.monotonic() - started
+
+    return {
+        "mode": "scheduled" if scheduled else "client retry",
+        "elapsed": elapsed,
+        "rejected": llm.rejected,
+        "interactive": lanes[PRIORITY_INTERACTIVE],
+        "background": lanes[PRIORITY_BACKGROUND],
+        "token_rate": llm.tokens / elapsed * 60,
+        "request_rate": llm.accepted / elapsed * 60,
+    }
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(ratio * len(ordered)))]
+
+
+def report(result: Dict[str, Any], args: argparse.Namespace) -> None:
+    interactive, background = result["interactive"], result["background"]
+    print(f"[{result['mode']}] {result['elapsed']:.1f}s, 429 responses: {result['rejected']}")
+    print(
+        f"  failed calls: interactive {interactive.failures}/{args.interactive}, "
+        f"background {background.failures}/{args.background}"
+    )
+    print(
+        f"  throughput: {result['token_rate']:.0f} TPM ({result['token_rate'] / args.tpm:.0%} of quota), "
+        f"{result['request_rate']:.0f} RPM ({result['request_rate'] / args.rpm:.0%} of quota)"
+    )
+    for name, lane in (("interactive", interactive), ("background", background)):
+        if lane.latencies:
+            print(
+                f"  {name} latency: p50 {statistics.median(lane.latencies):.2f}s, "
+                f"p95 {percentile(lane.latencies, 0.95):.2f}s"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate LLM rate limits with and without the scheduler")
+    parser.add_argument("--rpm", type=float, default=1200)
+    parser.add_argument("--tpm", type=float, default=120000)
+    parser.add_argument("--burst", type=float, default=1.0, help="burst allowance of the fake LLM limits (seconds of quota)")
+    parser.add_argument("--latency", type=float, default=0.2, help="mean fake LLM response time (s)")
+    parser.add_argument("--background", type=int, default=120, help="layout calls sent at once")
+    parser.add_argument("--background-tokens", type=int, default=300)
+    parser.add_argument("--interactive", type=int, default=30, help="translation calls arriving over time")
+    parser.add_argument("--interactive-tokens", type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(0)
+    for scheduled in (False, True):
+        report(asyncio.run(simulate(args, scheduled)), args)
+
+
+if __name__ == "__main__":
+    main()
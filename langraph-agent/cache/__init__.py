@@ -0,0 +1,18 @@
+"""
+Cache package for translation results
+"""
+
+from .disk import DiskStore, get_default_store
+from .keys import make_classification_key, make_translation_key, normalize_text
+from .memory import LRUCache
+from .single_flight import SingleFlight
+
+__all__ = [
+    'DiskStore',
+    'LRUCache',
+    'SingleFlight',
+    'get_default_store',
+    'make_classification_key',
+    'make_translation_key',
+    'normalize_text',
+]
@@ -0,0 +1,99 @@
+"""
+Disk Store CLI
+
+사용법:
+    python -m cache stats
+    python -m cache inspect --namespace translation --limit 10
+    python -m cache compact --max-mb 256
+    python -m cache warm segments.jsonl --concurrency 8
+
+warm 입력 파일은 한 줄에 하나의 텍스트이거나 {"text", "context"} JSON 객체입니다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Dict, List
+
+from .disk import DiskStore
+
+
+def _open_store(args: argparse.Namespace) -> DiskStore:
+    path = args.path or os.getenv("TRANSLATION_STORE_PATH")
+    if not path:
+        sys.exit("Store path is required (--path or TRANSLATION_STORE_PATH)")
+    max_mb = args.max_mb if args.max_mb is not None else float(os.getenv("TRANSLATION_STORE_MAX_MB", 512))
+    return DiskStore(path, max_bytes=int(max_mb * 1024 * 1024))
+
+
+def _read_segments(path: str) -> List[Dict[str, str]]:
+    segments: List[Dict[str, str]] = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                item = json.loads(line)
+                segments.append({"text": item["text"], "context": item.get("context", "")})
+            else:
+                segments.append({"text": line, "context": ""})
+    return segments
+
+
+def cmd_stats(args: argparse.Namespace) -> None:
+    print(json.dumps(_open_store(args).stats(), indent=2, ensure_ascii=False))
+
+
+def cmd_inspect(args: argparse.Namespace) -> None:
+    for entry in _open_store(args).iter_entries(args.namespace, args.limit):
+        print(json.dumps(entry, ensure_ascii=False))
+
+
+def cmd_compact(args: argparse.Namespace) -> None:
+    print(json.dumps(_open_store(args).compact(), indent=2))
+
+
+def cmd_warm(args: argparse.Namespace) -> None:
+    from dotenv import load_dotenv
+    from graph import TranslationGraph
+
+    load_dotenv()
+    store = _open_store(args)
+    segments = _read_segments(args.file)
+    graph = TranslationGraph(model_name=args.model, store=store)
+
+    results = asyncio.run(graph.atranslate_batch(segments, args.concurrency))
+    failed = sum(1 for result in results if result.get("error"))
+    print(f"Warmed {len(results) - failed}/{len(results)} segments into {store.path}")
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m cache", description="Translation disk store tools")
+    parser.add_argument("--path", help="SQLite store path (default: TRANSLATION_STORE_PATH)")
+    parser.add_argument("--max-mb", type=float, default=None, help="Size limit in MB")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="Show entry counts and sizes").set_defaults(func=cmd_stats)
+
+    inspect_parser = subparsers.add_parser("inspect", help="List recently used entries")
+    inspect_parser.add_argument("--namespace", default=None)
+    inspect_parser.add_argument("--limit", type=int, default=20)
+    inspect_parser.set_defaults(func=cmd_inspect)
+
+    subparsers.add_parser("compact", help="Evict to the size limit and VACUUM").set_defaults(func=cmd_compact)
+
+    warm_parser = subparsers.add_parser("warm", help="Translate segments from a file into the store")
+    warm_parser.add_argument("file")
+    warm_parser.add_argument("--model", default="gpt-5-mini")
+    warm_parser.add_argument("--concurrency", type=int, default=8)
+    warm_parser.set_defaults(func=cmd_warm)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
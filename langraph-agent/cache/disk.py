@@ -0,0 +1,238 @@
+"""
+Disk Store
+여러 uvicorn 워커가 함께 쓰는 SQLite(WAL) 기반 영구 캐시입니다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+
+# 읽기 시 accessed_at 갱신 간격(초) - 히트마다 쓰기가 발생하지 않도록 합니다
+ACCESS_RESOLUTION = 60.0
+
+# 이 횟수만큼 쓸 때마다 백그라운드 스레드에서 전체 크기를 확인합니다
+EVICTION_CHECK_INTERVAL = 100
+
+# 크기 초과 시 max_bytes의 이 비율까지 줄입니다
+EVICTION_LOW_WATERMARK = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entries_accessed_at ON entries (accessed_at);
+"""
+
+
+class DiskStore:
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite 파일 경로
+            max_bytes: 저장 값의 최대 총 크기 (초과 시 오래 사용되지 않은 항목부터 제거)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._evicting = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        스레드(및 프로세스)마다 별도 연결을 사용합니다.
+        fork된 워커가 부모의 연결을 재사용하지 않도록 pid도 확인합니다.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """저장된 값을 JSON 디코딩해 반환합니다."""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, accessed_at FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return default
+
+        value, accessed_at = row
+        now = time.time()
+        if now - accessed_at > ACCESS_RESOLUTION:
+            conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key),
+            )
+
+        with self._lock:
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """값을 JSON으로 저장합니다."""
+        encoded = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO entries (namespace, key, value, size, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (namespace, key, encoded, len(encoded.encode("utf-8")), now, now),
+        )
+
+        with self._lock:
+            self._writes += 1
+            check = self._writes % EVICTION_CHECK_INTERVAL == 0 and not self._evicting
+            if check:
+                self._evicting = True
+        if check:
+            # 전체 스캔과 삭제는 쓰기 호출자(요청 경로)를 막지 않도록 별도 스레드에서
+            threading.Thread(target=self._evict_in_background, name="disk-store-evict", daemon=True).start()
+
+    def _evict_in_background(self) -> None:
+        try:
+            self.evict()
+        except sqlite3.Error:
+            # 잠금 경합 등으로 실패하면 다음 확인 때 다시 시도합니다
+            pass
+        finally:
+            with self._lock:
+                self._evicting = False
+
+    def total_bytes(self) -> int:
+        """저장 값의 총 크기"""
+        row = self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return int(row[0])
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """
+        총 크기가 max_bytes를 넘으면 오래 사용되지 않은 항목부터 제거합니다.
+
+        Returns:
+            제거된 항목 수
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        total = self.total_bytes()
+        if total <= limit:
+            return 0
+
+        excess = total - int(limit * EVICTION_LOW_WATERMARK)
+        conn = self._connect()
+        victims: List[tuple] = []
+        freed = 0
+        rows = conn.execute(
+            "SELECT namespace, key, size FROM entries ORDER BY accessed_at ASC"
+        ).fetchall()
+        for namespace, key, size in rows:
+            victims.append((namespace, key))
+            freed += size
+            if freed >= excess:
+                break
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", victims)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._lock:
+            self.evictions += len(victims)
+        return len(victims)
+
+    def compact(self) -> Dict[str, int]:
+        """크기 제한을 적용한 뒤 VACUUM으로 파일을 줄입니다."""
+        conn = self._connect()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        before = os.path.getsize(self.path)
+        evicted = self.evict()
+        conn.execute("VACUUM")
+        return {
+            "evicted": evicted,
+            "file_bytes_before": before,
+            "file_bytes_after": os.path.getsize(self.path),
+        }
+
+    def iter_entries(self, namespace: str | None = None, limit: int = 20) -> Iterator[Dict[str, Any]]:
+        """최근 사용된 항목 메타데이터를 순회합니다 (inspect용)."""
+        query = "SELECT namespace, key, size, created_at, accessed_at, substr(value, 1, 120) FROM entries"
+        params: tuple = ()
+        if namespace:
+            query += " WHERE namespace = ?"
+            params = (namespace,)
+        query += " ORDER BY accessed_at DESC LIMIT ?"
+
+        for row in self._connect().execute(query, params + (limit,)):
+            yield {
+                "namespace": row[0],
+                "key": row[1],
+                "size": row[2],
+                "created_at": row[3],
+                "accessed_at": row[4],
+                "preview": row[5],
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        """네임스페이스별 항목 수, 크기와 이 프로세스의 히트/미스 카운터"""
+        namespaces = {
+            namespace: {"entries": count, "bytes": size}
+            for namespace, count, size in self._connect().execute(
+                "SELECT namespace, COUNT(*), SUM(size) FROM entries GROUP BY namespace"
+            )
+        }
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "max_bytes": self.max_bytes,
+                "total_bytes": sum(item["bytes"] for item in namespaces.values()),
+                "namespaces": namespaces,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# 프로세스 전역 인스턴스
+_default_store: DiskStore | None = None
+
+
+def get_default_store() -> DiskStore | None:
+    """
+    TRANSLATION_STORE_PATH가 설정된 경우에만 디스크 캐시를 엽니다.
+    """
+    global _default_store
+    path = os.getenv("TRANSLATION_STORE_PATH")
+    if not path:
+        return None
+    if _default_store is None:
+        max_mb = float(os.getenv("TRANSLATION_STORE_MAX_MB", 512))
+        _default_store = DiskStore(path, max_bytes=int(max_mb * 1024 * 1024))
+    return _default_store
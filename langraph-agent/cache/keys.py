@@ -0,0 +1,64 @@
+"""
+Cache Keys
+번역 결과 캐시 키를 생성합니다.
+"""
+
+import hashlib
+import json
+import re
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """
+    공백 차이로 같은 문장이 다른 키를 갖지 않도록 정규화합니다.
+    """
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def make_translation_key(
+    text: str,
+    context: str,
+    content_type: str,
+    model_name: str,
+    prompt_version: str,
+) -> str:
+    """
+    번역 결과 캐시 키를 생성합니다.
+
+    프롬프트 버전이 키에 포함되므로 프롬프트를 수정하면
+    이전 캐시 항목은 자동으로 무효화됩니다.
+
+    Args:
+        text: 원문
+        context: 추가 컨텍스트
+        content_type: 콘텐츠 타입 (알 수 없으면 빈 문자열)
+        model_name: 모델 이름
+        prompt_version: 프롬프트 템플릿 해시
+
+    Returns:
+        SHA-256 hex 문자열
+    """
+    payload = json.dumps(
+        [
+            normalize_text(text),
+            normalize_text(context),
+            content_type,
+            model_name,
+            prompt_version,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def make_classification_key(text: str, model_name: str, prompt_version: str) -> str:
+    """
+    분류 결과 캐시 키를 생성합니다.
+    """
+    payload = json.dumps(
+        [normalize_text(text), model_name, prompt_version],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
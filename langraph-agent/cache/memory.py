@@ -0,0 +1,110 @@
+"""
+In-process LRU Cache
+크기 제한과 TTL을 갖는 스레드 안전 LRU 캐시입니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class LRUCache:
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        ttl: float | None = None,
+        max_bytes: int = 0,
+        sizeof: Callable[[Any], int] | None = None,
+    ):
+        """
+        Args:
+            maxsize: 최대 항목 수 (0이면 캐시 비활성화)
+            ttl: 항목 유효 시간(초), None 또는 0이면 만료 없음
+            max_bytes: 값 크기 합계 상한 (0이면 항목 수로만 제한). 이보다 큰 값은 저장하지 않습니다
+            sizeof: 값의 크기(바이트)를 재는 함수 (max_bytes를 쓸 때 필요)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl or None
+        self.max_bytes = max_bytes if sizeof is not None else 0
+        self.sizeof = sizeof
+        self._data: "OrderedDict[Hashable, Tuple[Any, float | None, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        캐시에서 값을 조회합니다. 만료된 항목은 삭제하고 miss로 처리합니다.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        값을 저장하고 크기를 넘으면 가장 오래 사용되지 않은 항목을 제거합니다.
+        """
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        size = self.sizeof(value) if self.max_bytes else 0
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            if self.max_bytes and size > self.max_bytes:
+                return
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+
+            while len(self._data) > self.maxsize or (self.max_bytes and self._bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """모든 항목 삭제 (카운터는 유지)"""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """히트/미스/제거 카운터"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+            if self.max_bytes:
+                stats["bytes"] = self._bytes
+                stats["max_bytes"] = self.max_bytes
+            return stats
@@ -3,7 +3,13 @@ LangGraph Workflow
 번역 에이전트들을 연결하여 워크플로우를 구성합니다.
 """
 
-from typing import TypedDict, Literal
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, TypedDict, Literal, List, Dict, Tuple
+from langchain_core.callbacks.manager import adispatch_custom_event
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langgraph.graph import StateGraph, END
 from agents import (
     ContentClassifier,
@@ -12,6 +18,54 @@ from agents import (
     TableTranslator,
     ImageHandler
 )
+from agents.base import token_metrics
+from agents.content_classifier import classify_metrics
+from agents.masking import mask_metrics
+from agents.math_translator import latex_metrics
+from agents.text_translator import pack_metrics
+from cache import DiskStore, LRUCache, SingleFlight, get_default_store, make_translation_key
+from llm import LLMScheduler
+from prompts import TRANSLATION_PROMPT_VERSION
+
+# 프로세스 내 번역 캐시 설정 (크기 0이면 비활성화, TTL 0이면 만료 없음)
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", 4096))
+TRANSLATION_CACHE_TTL = float(os.getenv("TRANSLATION_CACHE_TTL", 86400))
+
+# 디스크 캐시 네임스페이스
+STORE_NAMESPACE = "translation"
+
+# 배치 번역 시 짧은 TEXT/IMAGE 세그먼트를 한 번의 LLM 호출로 묶는 크기 (1 이하면 비활성화)
+TRANSLATION_PACK_SIZE = int(os.getenv("TRANSLATION_PACK_SIZE", 16))
+# 이 길이(문자 수) 이하의 세그먼트만 묶습니다
+TRANSLATION_PACK_MAX_CHARS = int(os.getenv("TRANSLATION_PACK_MAX_CHARS", 300))
+
+# 묶음 번역이 가능한 콘텐츠 타입
+PACKABLE_TYPES = ("TEXT", "IMAGE")
+
+# 텍스트 노드가 스트리밍 중 번역 조각을 보내는 custom event 이름
+TEXT_DELTA_EVENT = "translation_delta"
+
+# process_pdf 레이아웃 블록 타입 → 번역 경로 (분류 노드를 건너뜁니다)
+# TEXT로 가는 블록도 LLM 호출 없는 휴리스틱이 수식/표로 보면 그 경로로 보냅니다 (_entry_route)
+BLOCK_TYPE_ROUTES = {
+    "HEADER": "TEXT",
+    "BODY": "TEXT",
+    "BULLET": "TEXT",
+    "FOOTNOTE": "TEXT",
+    "CAPTION": "IMAGE",
+    "IMAGE_REF": "IMAGE",
+    "TABLE": "TABLE",
+    "TEXT": "TEXT",
+    "MATH": "MATH",
+    "IMAGE": "IMAGE",
+}
+
+
+def resolve_block_type(block_type: str | None) -> str:
+    """블록 타입을 번역 경로로 변환 (모르는 타입이면 빈 문자열 = 분류 노드 사용)"""
+    if not block_type:
+        return ""
+    return BLOCK_TYPE_ROUTES.get(block_type.strip().upper(), "")
 
 
 class TranslationState(TypedDict):
@@ -26,12 +80,26 @@ class TranslationState(TypedDict):
 class TranslationGraph:
     """번역 워크플로우 그래프"""
     
-    def __init__(self):
-        self.classifier = ContentClassifier()
-        self.text_translator = TextTranslator()
-        self.math_translator = MathTranslator()
-        self.table_translator = TableTranslator()
-        self.image_handler = ImageHandler()
+    def __init__(
+        self,
+        model_name: str = "gpt-5-mini",
+        llm: BaseChatModel | None = None,
+        store: DiskStore | None = None,
+        scheduler: LLMScheduler | None = None,
+    ):
+        # llm을 주입하면 모든 에이전트가 공유합니다 (테스트 시 로컬 fake chat model 사용)
+        # scheduler를 주지 않으면 레이아웃 파이프라인과 같은 프로세스 공유 스케줄러를 씁니다
+        self.model_name = model_name
+        # 워커 간에 공유되는 디스크 캐시 (TRANSLATION_STORE_PATH 미설정 시 None)
+        self.store = store if store is not None else get_default_store()
+        self.classifier = ContentClassifier(model_name, llm=llm, store=self.store, scheduler=scheduler)
+        self.text_translator = TextTranslator(model_name, llm=llm, scheduler=scheduler)
+        self.math_translator = MathTranslator(model_name, llm=llm, scheduler=scheduler)
+        self.table_translator = TableTranslator(model_name, llm=llm, scheduler=scheduler)
+        self.image_handler = ImageHandler(model_name, llm=llm, scheduler=scheduler)
+        self.cache = LRUCache(maxsize=TRANSLATION_CACHE_SIZE, ttl=TRANSLATION_CACHE_TTL)
+        # 같은 키로 동시에 들어온 번역은 한 번만 실행
+        self.flight = SingleFlight()
         
         # 그래프 구축
         self.graph = self._build_graph()
@@ -41,15 +109,24 @@ class TranslationGraph:
         """LangGraph 워크플로우 구축"""
         workflow = StateGraph(TranslationState)
         
-        # 노드 추가
-        workflow.add_node("classify", self._classify_node)
-        workflow.add_node("translate_text", self._translate_text_node)
-        workflow.add_node("translate_math", self._translate_math_node)
-        workflow.add_node("translate_table", self._translate_table_node)
-        workflow.add_node("handle_image", self._handle_image_node)
+        # 노드 추가 (invoke는 동기 함수, ainvoke는 비동기 함수를 실행)
+        workflow.add_node("classify", RunnableLambda(self._classify_node, afunc=self._aclassify_node))
+        workflow.add_node("translate_text", RunnableLambda(self._translate_text_node, afunc=self._atranslate_text_node))
+        workflow.add_node("translate_math", RunnableLambda(self._translate_math_node, afunc=self._atranslate_math_node))
+        workflow.add_node("translate_table", RunnableLambda(self._translate_table_node, afunc=self._atranslate_table_node))
+        workflow.add_node("handle_image", RunnableLambda(self._handle_image_node, afunc=self._ahandle_image_node))
         
-        # 시작점
-        workflow.set_entry_point("classify")
+        # 시작점 (블록 타입을 알고 있으면 분류 노드를 건너뜀)
+        workflow.set_conditional_entry_point(
+            self._route_entry,
+            {
+                "classify": "classify",
+                "TEXT": "translate_text",
+                "MATH": "translate_math",
+                "TABLE": "translate_table",
+                "IMAGE": "handle_image",
+            }
+        )
         
         # 조건부 라우팅
         workflow.add_conditional_edges(
@@ -124,40 +201,406 @@ class TranslationGraph:
             state["translated_text"] = state["text"]
         return state
     
+    async def _aclassify_node(self, state: TranslationState) -> TranslationState:
+        """콘텐츠 분류 노드 (비동기)"""
+        try:
+            state["content_type"] = await self.classifier.aclassify(state["text"])
+        except Exception as e:
+            state["error"] = f"Classification error: {str(e)}"
+            state["content_type"] = "TEXT"  # 기본값
+        return state
+    
+    async def _atranslate_text_node(self, state: TranslationState, config: RunnableConfig) -> TranslationState:
+        """텍스트 번역 노드 (비동기). configurable.stream_text이면 번역 조각을 custom event로 보냅니다"""
+        try:
+            if (config.get("configurable") or {}).get("stream_text"):
+                async def emit(delta: str) -> None:
+                    await adispatch_custom_event(TEXT_DELTA_EVENT, {"text": delta}, config=config)
+                
+                state["translated_text"] = await self.text_translator.astream(
+                    state["text"],
+                    state.get("context", ""),
+                    emit,
+                )
+                return state
+            state["translated_text"] = await self.text_translator.atranslate(
+                state["text"],
+                state.get("context", "")
+            )
+        except Exception as e:
+            state["error"] = f"Text translation error: {str(e)}"
+            state["translated_text"] = state["text"]
+        return state
+    
+    async def _atranslate_math_node(self, state: TranslationState) -> TranslationState:
+        """수식 번역 노드 (비동기)"""
+        try:
+            state["translated_text"] = await self.math_translator.atranslate(state["text"])
+        except Exception as e:
+            state["error"] = f"Math translation error: {str(e)}"
+            state["translated_text"] = state["text"]
+        return state
+    
+    async def _atranslate_table_node(self, state: TranslationState) -> TranslationState:
+        """표 번역 노드 (비동기)"""
+        try:
+            state["translated_text"] = await self.table_translator.atranslate(state["text"])
+        except Exception as e:
+            state["error"] = f"Table translation error: {str(e)}"
+            state["translated_text"] = state["text"]
+        return state
+    
+    async def _ahandle_image_node(self, state: TranslationState) -> TranslationState:
+        """이미지 처리 노드 (비동기)"""
+        try:
+            state["translated_text"] = await self.image_handler.atranslate(state["text"])
+        except Exception as e:
+            state["error"] = f"Image handling error: {str(e)}"
+            state["translated_text"] = state["text"]
+        return state
+    
+    def _route_entry(
+        self, state: TranslationState
+    ) -> Literal["classify", "TEXT", "MATH", "TABLE", "IMAGE"]:
+        """블록 타입으로 정해진 경로가 있으면 바로 번역 노드로"""
+        return state["content_type"] or "classify"
+    
     def _route_by_content_type(
         self, state: TranslationState
     ) -> Literal["TEXT", "MATH", "TABLE", "IMAGE"]:
         """콘텐츠 타입에 따라 라우팅"""
         return state["content_type"]
     
-    def translate(self, text: str, context: str = "") -> dict:
+    def translate(
+        self, text: str, context: str = "", block_type: str | None = None, route: str | None = None
+    ) -> dict:
         """
         텍스트를 번역합니다.
         
         Args:
             text: 번역할 텍스트
             context: 추가 컨텍스트
+            block_type: 호출자가 알고 있는 블록 타입 (HEADER, BODY, CAPTION, TABLE 등).
+                주어지면 분류 LLM 호출 없이 해당 번역 경로로 바로 가며, 캐시 키에도 들어갑니다.
+            route: 이미 분류된 콘텐츠 타입 (배치 분류 결과). 분류 노드만 건너뛰고
+                캐시 키는 block_type 기준이라 같은 텍스트의 일반 요청과 캐시를 공유합니다.
         
         Returns:
             번역 결과 딕셔너리
         """
-        initial_state: TranslationState = {
+        content_type = resolve_block_type(block_type)
+        key = self._cache_key(text, context, content_type)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+        state = self._initial_state(text, context, content_type or resolve_block_type(route))
+        
+        def run() -> dict:
+            # 그래프 실행
+            result = self._to_response(self.app.invoke(state))
+            self._cache_result(key, result)
+            return result
+        
+        return dict(self.flight.do(key, run))
+    
+    async def atranslate(
+        self, text: str, context: str = "", block_type: str | None = None, route: str | None = None
+    ) -> dict:
+        """
+        translate의 비동기 버전. 노드들이 ainvoke로 실행되므로
+        LLM 응답을 기다리는 동안 이벤트 루프가 다른 요청을 처리할 수 있습니다.
+        """
+        content_type = resolve_block_type(block_type)
+        key = self._cache_key(text, context, content_type)
+        cached = await self._acache_lookup(key)
+        if cached is not None:
+            return cached
+        state = self._initial_state(text, context, content_type or resolve_block_type(route))
+        
+        async def run() -> dict:
+            result = self._to_response(await self.app.ainvoke(state))
+            await self._acache_result(key, result)
+            return result
+        
+        return dict(await self.flight.ado(key, run))
+    
+    async def astream_translate(
+        self, text: str, context: str = "", block_type: str | None = None
+    ) -> AsyncIterator[dict]:
+        """
+        atranslate의 스트리밍 버전.
+        
+        TEXT 경로에서는 모델 응답 조각이 텍스트 노드를 거쳐 도착하는 대로
+        {"event": "token", "text"}를 내보내고, 마지막에 {"event": "done", **응답}을 보냅니다.
+        token 조각은 미리보기이고 done의 translatedText가 최종 결과입니다.
+        캐시 히트와 다른 경로(수식/표/이미지)는 done 하나만 보냅니다.
+        스트림은 화면에 보이는 요청용이라 single-flight를 거치지 않습니다.
+        """
+        content_type = resolve_block_type(block_type)
+        key = self._cache_key(text, context, content_type)
+        cached = await self._acache_lookup(key)
+        if cached is not None:
+            yield {"event": "done", **cached}
+            return
+        
+        result = None
+        async for event in self.app.astream_events(
+            self._initial_state(text, context, content_type),
+            config={"configurable": {"stream_text": True}},
+            version="v2",
+        ):
+            if event["event"] == "on_custom_event" and event["name"] == TEXT_DELTA_EVENT:
+                yield {"event": "token", "text": event["data"]["text"]}
+            elif event["event"] == "on_chain_end" and not event.get("parent_ids"):
+                # 루트 그래프의 종료 이벤트에 최종 상태가 담깁니다
+                result = self._to_response(event["data"]["output"])
+        
+        if result is None:
+            raise RuntimeError("Translation graph finished without a final state")
+        await self._acache_result(key, result)
+        yield {"event": "done", **result}
+    
+    def stats(self) -> dict:
+        """캐시 등 구성 요소별 카운터"""
+        stats = {
+            "translation_cache": self.cache.stats(),
+            "single_flight": self.flight.stats(),
+            "translation_packing": pack_metrics.snapshot(),
+            "classifier": classify_metrics.snapshot(),
+            "math_latex": latex_metrics.snapshot(),
+            "masking": mask_metrics.snapshot(),
+            "agent_tokens": token_metrics.snapshot(),
+        }
+        if self.store is not None:
+            stats["translation_store"] = self.store.stats()
+        return stats
+    
+    def _cache_key(self, text: str, context: str, content_type: str = "") -> str:
+        """정규화된 원문, 컨텍스트, 타입, 모델, 프롬프트 버전으로 만든 캐시 키"""
+        return make_translation_key(
+            text,
+            context,
+            content_type,
+            self.model_name,
+            TRANSLATION_PROMPT_VERSION,
+        )
+    
+    def _cache_lookup(self, key: str) -> dict | None:
+        """메모리 캐시 → 디스크 캐시 순으로 조회 (디스크 히트는 메모리로 올립니다)"""
+        cached = self.cache.get(key)
+        if cached is None and self.store is not None:
+            cached = self.store.get(STORE_NAMESPACE, key)
+            if cached is not None:
+                self.cache.set(key, cached)
+        return dict(cached) if cached is not None else None
+    
+    def _cache_result(self, key: str, result: dict) -> None:
+        """오류 없이 끝난 결과만 캐시합니다 (실패한 번역은 다음 요청에서 다시 시도)"""
+        if not result.get("error"):
+            self.cache.set(key, dict(result))
+            if self.store is not None:
+                self.store.set(STORE_NAMESPACE, key, result)
+    
+    async def _acache_lookup(self, key: str) -> dict | None:
+        """_cache_lookup의 비동기 버전 (디스크 캐시는 SQLite 잠금을 기다릴 수 있어 스레드에서 조회)"""
+        cached = self.cache.get(key)
+        if cached is None and self.store is not None:
+            cached = await asyncio.to_thread(self.store.get, STORE_NAMESPACE, key)
+            if cached is not None:
+                self.cache.set(key, cached)
+        return dict(cached) if cached is not None else None
+    
+    async def _acache_result(self, key: str, result: dict) -> None:
+        """_cache_result의 비동기 버전 (디스크 쓰기는 스레드에서)"""
+        if self.store is None:
+            self._cache_result(key, result)
+        else:
+            await asyncio.to_thread(self._cache_result, key, result)
+    
+    def _initial_state(self, text: str, context: str, content_type: str = "") -> TranslationState:
+        """그래프 초기 상태 생성 (content_type이 있으면 분류 노드를 건너뜀)"""
+        return {
             "text": text,
             "context": context,
-            "content_type": "",
+            "content_type": self._entry_route(text, content_type),
             "translated_text": "",
             "error": None,
         }
-        
-        # 그래프 실행
-        result = self.app.invoke(initial_state)
-        
+    
+    def _entry_route(self, text: str, content_type: str) -> str:
+        """
+        TEXT 경로의 블록(HEADER, BODY 등)에 디스플레이 수식이나 표가 섞여 있으면
+        수식/표 번역기로 보냅니다. 분류기의 휴리스틱만 쓰므로 LLM 호출은 없습니다.
+        """
+        if content_type == "TEXT":
+            detected = self.classifier._quick_classify(text)
+            if detected in ("MATH", "TABLE"):
+                return detected
+        return content_type
+    
+    def _error_response(self, text: str, error: Exception) -> dict:
+        """배치 항목 실패 시 원문을 그대로 담은 응답"""
+        return {
+            "translatedText": text,
+            "contentType": "TEXT",
+            "error": f"Translation error: {str(error)}",
+        }
+    
+    def _to_response(self, result: TranslationState) -> dict:
+        """그래프 최종 상태를 API 응답 형태로 변환"""
         return {
             "translatedText": result["translated_text"],
             "contentType": result["content_type"],
             "error": result.get("error"),
         }
 
+    def translate_batch(self, items: List[Dict[str, str]], concurrency: int = 8) -> List[dict]:
+        """
+        여러 세그먼트를 동시에 번역합니다.
+
+        Args:
+            items: {"text", "context", "blockType"(선택)} 딕셔너리 목록
+            concurrency: 동시에 실행할 최대 번역 수
+
+        Returns:
+            입력 순서와 동일한 번역 결과 목록 (항목별 error 포함)
+        """
+        if not items:
+            return []
+
+        def run(item: Dict[str, str]) -> dict:
+            try:
+                return self.translate(item["text"], item.get("context", ""), item.get("blockType"))
+            except Exception as e:
+                return self._error_response(item["text"], e)
+
+        workers = max(1, min(concurrency, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map은 입력 순서대로 결과를 돌려줍니다
+            return list(executor.map(run, items))
+
+    async def atranslate_batch(self, items: List[Dict[str, str]], concurrency: int = 8) -> List[dict]:
+        """
+        translate_batch의 비동기 버전. 스레드 대신 세마포어로 동시 실행 수를 제한합니다.
+
+        짧은 TEXT/IMAGE 세그먼트는 TRANSLATION_PACK_SIZE개씩 한 번의 LLM 호출로 묶어
+        번역하고, 묶음 응답에서 빠진 항목만 개별 번역으로 다시 처리합니다.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        results: List[dict | None] = [None] * len(items)
+
+        async def run(index: int, content_type: str | None = None) -> None:
+            item = items[index]
+            async with semaphore:
+                try:
+                    # 분류 결과는 경로로만 쓰고, 캐시 키는 호출자의 blockType 기준
+                    results[index] = await self.atranslate(
+                        item["text"],
+                        item.get("context", ""),
+                        item.get("blockType"),
+                        route=content_type,
+                    )
+                except Exception as e:
+                    results[index] = self._error_response(item["text"], e)
+
+        packs, singles = await self._aplan_packs(items, results, semaphore)
+        await asyncio.gather(
+            *(self._arun_pack(items, pack, content_type, results, semaphore) for content_type, pack in packs),
+            *(run(index, content_type) for index, content_type in singles),
+        )
+
+        # 묶음 응답이 깨졌거나 빠진 항목은 이미 정해진 타입으로 개별 호출
+        routes = {index: content_type for content_type, pack in packs for index in pack}
+        await asyncio.gather(*(run(index, routes.get(index)) for index, result in enumerate(results) if result is None))
+        return results
+
+    async def _aplan_packs(
+        self,
+        items: List[Dict[str, str]],
+        results: List[dict | None],
+        semaphore: asyncio.Semaphore,
+    ) -> Tuple[List[Tuple[str, List[int]]], List[Tuple[int, str | None]]]:
+        """
+        배치 항목을 묶음과 개별 번역으로 나눕니다. 캐시 히트는 results에 바로 채웁니다.
+        blockType이 있는 항목은 분류하지 않고 그 경로를 그대로 쓰고, 나머지는 길이와 관계없이
+        모두 한 번의 분류 호출로 타입을 정합니다 (개별 번역도 그 타입으로 분류 노드를 건너뜀).
+
+        Returns:
+            ([(content_type, 항목 인덱스 목록)], [(개별 번역할 항목 인덱스, 분류된 타입 또는 None)])
+        """
+        singles: List[Tuple[int, str | None]] = []
+        routed: List[Tuple[int, str | None]] = []
+        unknown: List[int] = []
+        for index, item in enumerate(items):
+            content_type = resolve_block_type(item.get("blockType"))
+            cached = await self._acache_lookup(self._cache_key(item["text"], item.get("context", ""), content_type))
+            if cached is not None:
+                results[index] = cached
+            elif content_type:
+                routed.append((index, self._entry_route(item["text"], content_type)))
+            else:
+                unknown.append(index)
+
+        # 타입을 모르는 항목 전체를 한 번의 분류 호출로 처리 (실패하면 항목별 분류 노드로)
+        content_types: List[str | None] = [None] * len(unknown)
+        if unknown:
+            try:
+                async with semaphore:
+                    content_types = await self.classifier.aclassify_many([items[index]["text"] for index in unknown])
+            except Exception:
+                pass
+        routed.extend(zip(unknown, content_types))
+
+        if TRANSLATION_PACK_SIZE <= 1:
+            return [], routed
+
+        # 짧은 세그먼트만, 같은 타입·같은 컨텍스트끼리 묶습니다
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, content_type in routed:
+            if content_type in PACKABLE_TYPES and len(items[index]["text"]) <= TRANSLATION_PACK_MAX_CHARS:
+                groups.setdefault((content_type, items[index].get("context", "")), []).append(index)
+            else:
+                singles.append((index, content_type))
+
+        packs: List[Tuple[str, List[int]]] = []
+        for (content_type, _), indices in groups.items():
+            for start in range(0, len(indices), TRANSLATION_PACK_SIZE):
+                pack = indices[start:start + TRANSLATION_PACK_SIZE]
+                if len(pack) > 1:
+                    packs.append((content_type, pack))
+                else:
+                    singles.extend((index, content_type) for index in pack)
+        return packs, singles
+
+    async def _arun_pack(
+        self,
+        items: List[Dict[str, str]],
+        pack: List[int],
+        content_type: str,
+        results: List[dict | None],
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """묶음 하나를 번역해 results에 채웁니다 (실패한 항목은 None으로 남김)"""
+        context = items[pack[0]].get("context", "")
+        async with semaphore:
+            try:
+                translations = await self.text_translator.atranslate_many(
+                    [items[index]["text"] for index in pack],
+                    content_type,
+                    context,
+                )
+            except Exception:
+                pack_metrics.incr("failed_calls")
+                return
+
+        for index, translated in zip(pack, translations):
+            if translated is None:
+                continue
+            result = {"translatedText": translated, "contentType": content_type, "error": None}
+            content_key = resolve_block_type(items[index].get("blockType"))
+            await self._acache_result(self._cache_key(items[index]["text"], context, content_key), result)
+            results[index] = result
+
 
 # 전역 인스턴스 (FastAPI에서 재사용)
 translation_graph = None
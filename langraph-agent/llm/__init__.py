@@ -0,0 +1,21 @@
+"""
+LLM access shared by agents and the PDF pipeline
+"""
+
+from .models import get_chat_model
+from .scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    LLMScheduler,
+    TokenBucket,
+    get_scheduler,
+)
+
+__all__ = [
+    'LLMScheduler',
+    'PRIORITY_BACKGROUND',
+    'PRIORITY_INTERACTIVE',
+    'TokenBucket',
+    'get_chat_model',
+    'get_scheduler',
+]
@@ -0,0 +1,23 @@
+"""
+Chat Model Factory
+모델 이름/temperature별로 하나의 chat model 인스턴스를 공유합니다.
+재시도는 LLMScheduler가 맡으므로 클라이언트 자체 재시도는 끕니다.
+"""
+
+import threading
+from typing import Dict, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_openai import ChatOpenAI
+
+_models: Dict[Tuple[str, float], BaseChatModel] = {}
+_models_lock = threading.Lock()
+
+
+def get_chat_model(model_name: str = "gpt-5-mini", temperature: float = 0.3) -> BaseChatModel:
+    """(모델 이름, temperature)마다 하나씩 만든 공유 ChatOpenAI (HTTP 연결 풀도 공유됩니다)"""
+    key = (model_name, float(temperature))
+    with _models_lock:
+        if key not in _models:
+            _models[key] = ChatOpenAI(model=model_name, temperature=temperature, max_retries=0)
+        return _models[key]
@@ -0,0 +1,264 @@
+"""
+LLM Scheduler
+모든 LLM 호출(번역 에이전트, 레이아웃 분석)이 거치는 프로세스 공유 스케줄러.
+
+- RPM/TPM 토큰 버킷: 요청 수와 토큰 수를 분당 한도에 맞춰 내보냅니다
+- 우선순위 레인: 화면에 보이는 번역(INTERACTIVE)이 기다리는 동안 백그라운드 레이아웃 호출은 대기합니다
+- 재시도: 429/5xx/연결 오류는 지터가 섞인 지수 백오프로 다시 시도하고,
+  429를 받으면 모든 호출을 잠시 멈춰 오류가 한꺼번에 쏟아지지 않게 합니다
+
+스레드(동기 그래프)와 이벤트 루프(비동기 그래프) 양쪽에서 쓸 수 있도록 상태는 lock으로 보호하고,
+대기는 각 호출자가 time.sleep / asyncio.sleep으로 합니다.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from metrics import Counters
+
+# 분당 요청 수 / 토큰 수 한도 (0이면 제한 없음)
+LLM_RPM = float(os.getenv("LLM_RPM", 0))
+LLM_TPM = float(os.getenv("LLM_TPM", 0))
+# 버킷 용량 = 이 시간(초)만큼의 한도. provider는 분당 한도를 더 짧은 구간으로 나눠 적용하므로 작게 둡니다
+LLM_BURST_SECONDS = float(os.getenv("LLM_BURST_SECONDS", 1))
+# 재시도 횟수와 백오프 (초)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 4))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 1))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", 30))
+
+# 우선순위 레인 (작을수록 먼저)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+_LANES = ("interactive", "background")
+
+# 상위 레인이 대기 중일 때 하위 레인이 다시 확인하는 간격 (초)
+_POLL_INTERVAL = 0.05
+
+# 재시도할 HTTP 상태 코드와 (상태 코드가 없는) 전송 오류 이름
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_RETRYABLE_ERRORS = ("APIConnectionError", "APITimeoutError")
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    분당 한도로 채워지는 버킷
+
+    잔량이 요청량 이상이면 통과시키고 그만큼 뺍니다. 용량보다 큰 요청은 버킷이 가득 차면 통과하고
+    잔량이 음수(빚)가 되며, 빚을 갚는 동안 다음 요청이 기다리므로 평균 속도는 한도를 넘지 않습니다.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = LLM_BURST_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def wait_time(self, amount: float = 1) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 초 (0이면 지금)"""
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        needed = min(amount, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def give(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class LLMScheduler:
+    """RPM/TPM 버킷, 우선순위 레인, 백오프 재시도를 적용해 LLM 호출을 실행합니다"""
+
+    def __init__(
+        self,
+        rpm: float = LLM_RPM,
+        tpm: float = LLM_TPM,
+        burst_seconds: float = LLM_BURST_SECONDS,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE,
+        backoff_max: float = LLM_BACKOFF_MAX,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.requests = TokenBucket(rpm, burst_seconds, clock) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm, burst_seconds, clock) if tpm > 0 else None
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.clock = clock
+        self.lock = threading.Lock()
+        # 레인별 대기 중인 호출 수
+        self.waiting = [0, 0]
+        # 429 이후 모든 호출을 멈추는 시각
+        self.paused_until = 0.0
+        self.metrics = Counters()
+
+    def run(self, call: Callable[[], T], tokens: int, priority: int = PRIORITY_INTERACTIVE) -> T:
+        """
+        동기 호출을 한도에 맞춰 실행합니다.
+
+        Args:
+            call: 모델을 한 번 호출하는 함수 (재시도 때마다 다시 부름)
+            tokens: 예상 토큰 수 (입력 + 출력 상한). 응답의 usage_metadata로 정산합니다
+            priority: PRIORITY_INTERACTIVE 또는 PRIORITY_BACKGROUND
+        """
+        for attempt in range(self.max_retries + 1):
+            self._wait(priority, tokens, time.sleep)
+            try:
+                result = call()
+            except Exception as error:
+                time.sleep(self._handle_failure(error, tokens, attempt))
+                continue
+            self._settle(tokens, result)
+            return result
+        raise AssertionError("unreachable")
+
+    async def arun(self, call: Callable[[], Awaitable[T]], tokens: int, priority: int = PRIORITY_INTERACTIVE) -> T:
+        """run의 비동기 버전 (대기 중에 이벤트 루프를 막지 않음)"""
+        for attempt in range(self.max_retries + 1):
+            await self._await(priority, tokens)
+            try:
+                result = await call()
+            except Exception as error:
+                await asyncio.sleep(self._handle_failure(error, tokens, attempt))
+                continue
+            self._settle(tokens, result)
+            return result
+        raise AssertionError("unreachable")
+
+    def stats(self) -> Dict[str, Any]:
+        """호출/대기/재시도 카운터와 현재 버킷 잔량"""
+        with self.lock:
+            stats: Dict[str, Any] = self.metrics.snapshot()
+            stats["waiting_interactive"], stats["waiting_background"] = self.waiting
+            if self.requests is not None:
+                stats["request_bucket"] = round(self.requests.level, 2)
+            if self.tokens is not None:
+                stats["token_bucket"] = round(self.tokens.level, 2)
+        return stats
+
+    def _wait(self, priority: int, tokens: int, sleep: Callable[[float], None]) -> None:
+        self._enter(priority)
+        try:
+            delay = self._try_acquire(priority, tokens)
+            if delay > 0:
+                self.metrics.incr("throttled")
+            while delay > 0:
+                sleep(delay)
+                delay = self._try_acquire(priority, tokens)
+        finally:
+            self._leave(priority)
+
+    async def _await(self, priority: int, tokens: int) -> None:
+        self._enter(priority)
+        try:
+            delay = self._try_acquire(priority, tokens)
+            if delay > 0:
+                self.metrics.incr("throttled")
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self._try_acquire(priority, tokens)
+        finally:
+            self._leave(priority)
+
+    def _enter(self, priority: int) -> None:
+        with self.lock:
+            self.waiting[priority] += 1
+
+    def _leave(self, priority: int) -> None:
+        with self.lock:
+            self.waiting[priority] -= 1
+
+    def _try_acquire(self, priority: int, tokens: int) -> float:
+        """지금 통과할 수 있으면 버킷에서 빼고 0, 아니면 다시 확인할 때까지의 초"""
+        with self.lock:
+            limited = self.requests is not None or self.tokens is not None
+            delays = [self.paused_until - self.clock()]
+            if any(self.waiting[:priority]) and (limited or delays[0] > 0):
+                # 한도를 나눠 쓰는 동안에는 상위 레인이 먼저 (하위 레인은 상위 레인이 빌 때까지 양보)
+                delays.append(_POLL_INTERVAL)
+            if self.requests is not None:
+                delays.append(self.requests.wait_time())
+            if self.tokens is not None:
+                delays.append(self.tokens.wait_time(tokens))
+
+            delay = max(delays)
+            if delay > 0:
+                return delay
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(tokens)
+            self.metrics.incr("calls")
+            self.metrics.incr(f"calls_{_LANES[priority]}")
+            return 0.0
+
+    def _settle(self, tokens: int, result: Any) -> None:
+        """예상 토큰 수와 실제 사용량의 차이를 버킷에 돌려주거나 더 뺍니다"""
+        usage = getattr(result, "usage_metadata", None)
+        if self.tokens is None or not usage:
+            return
+        actual = usage.get("total_tokens") or usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
+        with self.lock:
+            self.tokens.give(tokens - actual)
+
+    def _handle_failure(self, error: Exception, tokens: int, attempt: int) -> float:
+        """재시도할 오류면 백오프 시간(초)을 돌려주고, 아니면 오류를 다시 던집니다"""
+        if not is_retryable(error) or attempt >= self.max_retries:
+            self.metrics.incr("failures")
+            raise error
+
+        span = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        # 절반은 고정, 절반은 무작위 - 동시에 실패한 호출들이 같은 순간에 다시 몰리지 않게 합니다
+        delay = max(span / 2 + random.uniform(0, span / 2), _retry_after(error))
+        with self.lock:
+            if self.tokens is not None:
+                # 실패한 요청의 토큰은 돌려줍니다
+                self.tokens.give(tokens)
+            if _status_code(error) == 429:
+                self.metrics.incr("rate_limited")
+                self.paused_until = max(self.paused_until, self.clock() + delay)
+            self.metrics.incr("retries")
+        return delay
+
+
+def is_retryable(error: Exception) -> bool:
+    """429, 5xx, 요청 시간 초과, 연결 오류만 재시도합니다"""
+    return _status_code(error) in RETRYABLE_STATUS or type(error).__name__ in _RETRYABLE_ERRORS
+
+
+def _status_code(error: Exception) -> int | None:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(error: Exception) -> float:
+    """응답의 retry-after 헤더 (초). 없으면 0"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+_scheduler: LLMScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """환경 변수 설정으로 만든 프로세스 공유 스케줄러"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
@@ -4,16 +4,21 @@ FastAPI Server for LangGraph Translation Agent
 
 from __future__ import annotations
 
+import json
 import os
 from typing import Any, Dict, List
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from graph import get_translation_graph
-from processors.pdf_pipeline import process_pdf
+from llm import get_scheduler
+from processors.json_recovery import parse_metrics
+from processors.layout_cache import get_layout_cache
+from processors.pdf_pipeline import aiter_process_pdf, aprocess_pdf
 
 # 환경 변수 로드
 load_dotenv()
@@ -22,6 +27,9 @@ load_dotenv()
 if not os.getenv("OPENAI_API_KEY"):
     raise ValueError("OPENAI_API_KEY environment variable is not set")
 
+# 배치 번역 동시 실행 상한
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", 8))
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="Paper Translation Agent",
@@ -44,6 +52,8 @@ class TranslationRequest(BaseModel):
 
     text: str
     context: str = ""
+    # process_pdf 블록 타입 (HEADER, BODY, CAPTION, TABLE 등) - 주면 분류 단계를 건너뜁니다
+    blockType: str | None = None
 
 
 class TranslationResponse(BaseModel):
@@ -54,6 +64,19 @@ class TranslationResponse(BaseModel):
     error: str | None = None
 
 
+class BatchTranslationRequest(BaseModel):
+    """배치 번역 요청 모델"""
+
+    segments: List[TranslationRequest]
+    concurrency: int | None = Field(default=None, ge=1)
+
+
+class BatchTranslationResponse(BaseModel):
+    """배치 번역 응답 모델 (입력 순서 유지)"""
+
+    results: List[TranslationResponse]
+
+
 class PDFProcessResponse(BaseModel):
     """PDF 레이아웃 분석 응답 모델"""
 
@@ -78,13 +101,24 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """캐시 히트율 등 번역 그래프와 PDF 파이프라인 카운터"""
+    return {
+        **get_translation_graph().stats(),
+        "layout_cache": get_layout_cache().stats(),
+        "layout_parse": parse_metrics.snapshot(),
+        "llm_scheduler": get_scheduler().stats(),
+    }
+
+
 @app.post("/translate", response_model=TranslationResponse)
 async def translate(request: TranslationRequest):
     """
     텍스트 번역 엔드포인트
 
     Args:
-        request: 번역 요청 (text, context)
+        request: 번역 요청 (text, context, 선택적 blockType)
 
     Returns:
         번역 결과
@@ -92,7 +126,7 @@ async def translate(request: TranslationRequest):
 
     try:
         graph = get_translation_graph()
-        result = graph.translate(request.text, request.context)
+        result = await graph.atranslate(request.text, request.context, request.blockType)
         return TranslationResponse(**result)
 
     except Exception as error:
@@ -102,6 +136,59 @@ async def translate(request: TranslationRequest):
         ) from error
 
 
+@app.post("/translate/stream")
+async def translate_stream(request: TranslationRequest):
+    """
+    텍스트 번역 스트리밍 엔드포인트
+
+    TEXT 경로는 번역 조각이 도착하는 대로 NDJSON 한 줄({"event": "token", "text"})을 보내고,
+    마지막에 {"event": "done", "translatedText", "contentType", "error"} 또는 {"event": "error"}를 보냅니다.
+    token 조각은 미리보기이며 done의 translatedText가 최종 번역입니다.
+    """
+
+    graph = get_translation_graph()
+
+    async def stream():
+        try:
+            async for payload in graph.astream_translate(request.text, request.context, request.blockType):
+                yield json.dumps(payload, ensure_ascii=False) + "\n"
+        except Exception as error:
+            yield json.dumps({"event": "error", "detail": f"Translation failed: {str(error)}"}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/translate/batch", response_model=BatchTranslationResponse)
+async def translate_batch(request: BatchTranslationRequest):
+    """
+    배치 번역 엔드포인트
+
+    Args:
+        request: 세그먼트 목록과 선택적 동시 실행 수
+
+    Returns:
+        입력 순서대로 정렬된 번역 결과 (항목별 error 포함)
+    """
+
+    concurrency = min(request.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+
+    try:
+        graph = get_translation_graph()
+        results = await graph.atranslate_batch(
+            [segment.model_dump() for segment in request.segments],
+            concurrency,
+        )
+        return BatchTranslationResponse(
+            results=[TranslationResponse(**result) for result in results]
+        )
+
+    except Exception as error:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch translation failed: {str(error)}",
+        ) from error
+
+
 @app.post("/classify")
 async def classify_content(request: TranslationRequest):
     """
@@ -115,10 +202,9 @@ async def classify_content(request: TranslationRequest):
     """
 
     try:
-        from agents import ContentClassifier
-
-        classifier = ContentClassifier()
-        content_type = classifier.classify(request.text)
+        # 그래프의 분류기를 재사용 (디스크 캐시 공유)
+        classifier = get_translation_graph().classifier
+        content_type = await classifier.aclassify(request.text)
 
         return {
             "contentType": content_type,
@@ -140,7 +226,7 @@ async def process_pdf_endpoint(file: UploadFile = File(...)):
 
     try:
         pdf_bytes = await file.read()
-        result = process_pdf(pdf_bytes)
+        result = await aprocess_pdf(pdf_bytes)
         return PDFProcessResponse(**result)
     except Exception as error:
         raise HTTPException(
@@ -149,6 +235,38 @@ async def process_pdf_endpoint(file: UploadFile = File(...)):
         ) from error
 
 
+@app.post("/process-pdf/stream")
+async def process_pdf_stream_endpoint(
+    file: UploadFile = File(...),
+    pages: str = Query("", description="먼저 처리할 페이지 번호 (예: 3,4)"),
+):
+    """
+    PDF 레이아웃 분석 스트리밍 엔드포인트
+
+    페이지 분석이 끝날 때마다 NDJSON 한 줄({"event": "page", ...})을 보내고,
+    마지막에 {"event": "done"} 또는 {"event": "error"}를 보냅니다.
+    """
+
+    try:
+        priority_pages = [int(page) for page in pages.split(",") if page.strip()]
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail="pages must be comma-separated integers") from error
+
+    pdf_bytes = await file.read()
+
+    async def stream():
+        count = 0
+        try:
+            async for payload in aiter_process_pdf(pdf_bytes, priority_pages=priority_pages):
+                count += 1
+                yield json.dumps({"event": "page", **payload}, ensure_ascii=False) + "\n"
+            yield json.dumps({"event": "done", "pages": count}) + "\n"
+        except Exception as error:
+            yield json.dumps({"event": "error", "detail": f"PDF processing failed: {str(error)}"}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,24 @@
+"""
+Metrics
+모듈 단위 카운터. GET /metrics에서 스냅샷으로 노출됩니다.
+"""
+
+import threading
+from collections import Counter
+from typing import Dict
+
+
+class Counters:
+    """스레드 안전 이름별 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += value
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
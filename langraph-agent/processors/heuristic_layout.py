@@ -0,0 +1,236 @@
+"""
+Deterministic, geometry-based layout segmentation.
+
+Used as a fast path ahead of the LLM segmenter: it clusters lines into
+columns, splits blocks on vertical gaps and font changes, and reports a
+confidence score so that only ambiguous pages are sent to the LLM.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import statistics
+from collections import Counter
+from typing import Any, Dict, List, Sequence, Tuple
+
+from prompts.layout_prompt import SupportsLineProtocol
+
+# Bump whenever a change here alters the blocks or confidence for the same
+# lines; it is part of the layout cache key, so cached pages are recomputed.
+HEURISTIC_LAYOUT_VERSION = 1
+
+# Pages whose heuristic segmentation scores at least this skip the LLM
+# (set above 1 to always use the LLM).
+LAYOUT_HEURISTIC_THRESHOLD = float(os.getenv("LAYOUT_HEURISTIC_THRESHOLD", 0.85))
+
+# Font size ratio (relative to body text) above which a short line is a heading.
+HEADER_FONT_RATIO = 1.15
+
+# Font size ratio below which text at the page bottom is a footnote.
+FOOTNOTE_FONT_RATIO = 0.88
+
+# Headings longer than this are treated as body text.
+HEADER_MAX_CHARS = 120
+
+# A vertical gap this many times the typical line pitch starts a new block.
+GAP_RATIO = 1.6
+
+_CAPTION = re.compile(r"^(Figure|Fig\.|Table|Algorithm)\s*[A-Z]?\d+", re.IGNORECASE)
+_BULLET = re.compile(r"^([•‣◦⁃∙\-\*–]|\(?\d{1,2}[.)]|\(?[a-z][.)])\s+")
+_NUMERIC_TOKEN = re.compile(r"^[\d.,%±+\-()]+$")
+
+
+def segment_page_heuristically(
+  lines: Sequence[SupportsLineProtocol],
+) -> Tuple[Dict[str, Any], float]:
+  """
+  Segments one page's lines into blocks without calling the LLM.
+
+  Returns:
+      ({"blocks": [...]}, confidence) where blocks have the same shape as the
+      LLM segmentation consumed by `align_blocks`, and confidence is in [0, 1].
+  """
+  if not lines:
+    return {"blocks": []}, 1.0
+
+  body_size = _body_font_size(lines)
+  page_top = min(line.bbox[1] for line in lines)
+  page_bottom = max(line.bbox[3] for line in lines)
+  columns, spanning_inside = _assign_columns(lines)
+
+  blocks: List[Dict[str, Any]] = []
+  ambiguous = 0
+  for column_lines in columns:
+    pitch = _line_pitch(column_lines)
+    current: Dict[str, Any] | None = None
+    previous: SupportsLineProtocol | None = None
+
+    for line in column_lines:
+      kind = _line_kind(line, body_size, page_top, page_bottom)
+      if kind == "AMBIGUOUS":
+        ambiguous += 1
+        kind = "BODY"
+
+      if current is None or _starts_new_block(previous, line, kind, current["type"], pitch, body_size):
+        current = {"type": kind, "line_ids": []}
+        blocks.append(current)
+      current["line_ids"].append(line.line_id)
+      previous = line
+
+  confidence = _confidence(lines, ambiguous, spanning_inside)
+  return {"blocks": blocks}, confidence
+
+
+def _body_font_size(lines: Sequence[SupportsLineProtocol]) -> float:
+  """Most common font size, weighted by the amount of text set in it."""
+  weights: Counter = Counter()
+  for line in lines:
+    weights[round(line.font_size * 2) / 2] += len(line.text)
+  size = weights.most_common(1)[0][0]
+  return size or 1.0
+
+
+def _assign_columns(
+  lines: Sequence[SupportsLineProtocol],
+) -> Tuple[List[List[SupportsLineProtocol]], int]:
+  """
+  Orders lines into reading-order groups: full-width lines above the columns,
+  each column top to bottom, then full-width lines below.
+
+  Returns the groups and the number of full-width lines found between column
+  lines, which the reading order cannot place reliably.
+  """
+  left = min(line.bbox[0] for line in lines)
+  right = max(line.bbox[2] for line in lines)
+  middle = (left + right) / 2.0
+  gutter = (right - left) * 0.02
+
+  left_lines = [line for line in lines if line.bbox[2] <= middle + gutter]
+  right_lines = [line for line in lines if line.bbox[0] >= middle - gutter and line.bbox[2] > middle + gutter]
+  two_columns = len(left_lines) >= 3 and len(right_lines) >= 3
+
+  if not two_columns:
+    return [sorted(lines, key=_vertical_key)], 0
+
+  left_ids = {id(line) for line in left_lines}
+  right_ids = {id(line) for line in right_lines}
+  column_lines = left_lines + right_lines
+  column_top = min(line.bbox[1] for line in column_lines)
+  column_bottom = max(line.bbox[3] for line in column_lines)
+
+  above: List[SupportsLineProtocol] = []
+  below: List[SupportsLineProtocol] = []
+  spanning_inside = 0
+  for line in lines:
+    if id(line) in left_ids or id(line) in right_ids:
+      continue
+    if line.bbox[3] <= column_top:
+      above.append(line)
+    elif line.bbox[1] >= column_bottom:
+      below.append(line)
+    else:
+      # Full-width line interleaved with the columns; keep it with the nearer side.
+      spanning_inside += 1
+      (left_lines if line.column_hint <= middle else right_lines).append(line)
+
+  groups = [sorted(group, key=_vertical_key) for group in (above, left_lines, right_lines, below)]
+  return [group for group in groups if group], spanning_inside
+
+
+def _vertical_key(line: SupportsLineProtocol) -> Tuple[float, float]:
+  return (line.bbox[1], line.bbox[0])
+
+
+def _line_pitch(lines: Sequence[SupportsLineProtocol]) -> float:
+  """Typical distance between consecutive line tops in a column."""
+  deltas = [
+    current.bbox[1] - previous.bbox[1]
+    for previous, current in zip(lines, lines[1:])
+    if current.bbox[1] > previous.bbox[1]
+  ]
+  if deltas:
+    return statistics.median(deltas)
+  heights = [line.bbox[3] - line.bbox[1] for line in lines]
+  return statistics.median(heights) if heights else 0.0
+
+
+def _line_kind(
+  line: SupportsLineProtocol,
+  body_size: float,
+  page_top: float,
+  page_bottom: float,
+) -> str:
+  """Classifies a single line by font size, position and leading text."""
+  text = line.text
+  ratio = line.font_size / body_size
+
+  if _CAPTION.match(text):
+    return "CAPTION"
+  if ratio >= HEADER_FONT_RATIO and len(text) <= HEADER_MAX_CHARS:
+    return "HEADER"
+  if _BULLET.match(text):
+    return "BULLET"
+
+  lower_fifth = page_top + (page_bottom - page_top) * 0.8
+  if ratio <= FOOTNOTE_FONT_RATIO and line.bbox[1] >= lower_fifth:
+    return "FOOTNOTE"
+
+  tokens = text.split()
+  numeric = sum(1 for token in tokens if _NUMERIC_TOKEN.match(token))
+  # Short fragments that do not end a sentence, and number-heavy lines, are
+  # usually table cells or equations rather than the tail of a paragraph.
+  if (len(text) < 25 and not text.endswith((".", ":", ";", "?", "!"))) or numeric * 2 > len(tokens):
+    return "AMBIGUOUS"
+  return "BODY"
+
+
+def _starts_new_block(
+  previous: SupportsLineProtocol | None,
+  line: SupportsLineProtocol,
+  kind: str,
+  current_type: str,
+  pitch: float,
+  body_size: float,
+) -> bool:
+  """Decides whether `line` begins a new block after `previous`."""
+  if previous is None:
+    return True
+  if kind in ("CAPTION", "BULLET"):
+    return True
+  if (kind == "HEADER") != (current_type == "HEADER"):
+    return True
+  if kind == "FOOTNOTE" and current_type != "FOOTNOTE":
+    return True
+  if abs(line.font_size - previous.font_size) > body_size * 0.2:
+    return True
+
+  gap = line.bbox[1] - previous.bbox[1]
+  # A backwards jump means the text moved to another region of the page.
+  return gap < 0 or (pitch > 0 and gap > pitch * GAP_RATIO)
+
+
+def _confidence(
+  lines: Sequence[SupportsLineProtocol],
+  ambiguous: int,
+  spanning_inside: int,
+) -> float:
+  """
+  Scores how closely the page matches the regular layouts handled here.
+
+  Pages with many short or numeric fragments (tables, equations), full-width
+  lines inside a two-column region, or many distinct font sizes score low.
+  """
+  total = len(lines)
+  penalty = 1.5 * ambiguous / total
+  penalty += 2.0 * spanning_inside / total
+
+  sizes = {round(line.font_size) for line in lines}
+  if len(sizes) > 4:
+    penalty += 0.05 * (len(sizes) - 4)
+
+  if total < 3:
+    # Too little text to tell layout from noise.
+    penalty += 0.3
+
+  return max(0.0, min(1.0, 1.0 - penalty))
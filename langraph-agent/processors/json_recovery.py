@@ -0,0 +1,109 @@
+"""
+Tolerant parsing of layout segmentation replies.
+
+Models sometimes wrap JSON in code fences, add prose around it, or stop
+mid-array when they run out of output tokens. Instead of discarding the
+page, the parser tries progressively looser strategies and, as a last
+resort, salvages every complete block object that precedes the cut.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+from metrics import Counters
+
+# Parse outcomes and re-request counts, reported by GET /metrics.
+parse_metrics = Counters()
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+_BLOCKS_KEY = re.compile(r'"blocks"\s*:\s*\[')
+
+
+def parse_layout_response(raw_response: str) -> Tuple[Dict[str, Any], str]:
+  """
+  Parses a layout reply.
+
+  Returns:
+      (parsed, outcome) where outcome is one of "ok", "fenced", "extracted",
+      "salvaged" or "failed". Only "salvaged" and "failed" may be missing blocks.
+  """
+  parsed, outcome = _parse(raw_response or "")
+  parse_metrics.incr(outcome)
+  return parsed, outcome
+
+
+def _parse(raw: str) -> Tuple[Dict[str, Any], str]:
+  parsed = _loads_object(raw)
+  if parsed is not None:
+    return parsed, "ok"
+
+  fenced = _FENCE.search(raw)
+  if fenced:
+    parsed = _loads_object(fenced.group(1))
+    if parsed is not None:
+      return parsed, "fenced"
+
+  start = raw.find("{")
+  end = raw.rfind("}")
+  if start != -1 and end > start:
+    parsed = _loads_object(raw[start:end + 1])
+    if parsed is not None:
+      return parsed, "extracted"
+
+  blocks = _salvage_blocks(raw)
+  if blocks:
+    return {"blocks": blocks}, "salvaged"
+  return {}, "failed"
+
+
+def _loads_object(text: str) -> Dict[str, Any] | None:
+  try:
+    value = json.loads(text)
+  except json.JSONDecodeError:
+    return None
+  return value if isinstance(value, dict) else None
+
+
+def _salvage_blocks(raw: str) -> List[Dict[str, Any]]:
+  """Decodes every complete object inside the "blocks" array, stopping at the cut."""
+  match = _BLOCKS_KEY.search(raw)
+  if not match:
+    return []
+
+  blocks: List[Dict[str, Any]] = []
+  depth = 0
+  in_string = False
+  escaped = False
+  object_start = -1
+
+  for index in range(match.end(), len(raw)):
+    char = raw[index]
+    if in_string:
+      if escaped:
+        escaped = False
+      elif char == "\\":
+        escaped = True
+      elif char == '"':
+        in_string = False
+      continue
+
+    if char == '"':
+      in_string = True
+    elif char == "{":
+      if depth == 0:
+        object_start = index
+      depth += 1
+    elif char == "}":
+      depth -= 1
+      if depth == 0 and object_start != -1:
+        block = _loads_object(raw[object_start:index + 1])
+        if block is not None:
+          blocks.append(block)
+        object_start = -1
+    elif char == "]" and depth == 0:
+      break
+
+  return blocks
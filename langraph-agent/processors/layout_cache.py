@@ -0,0 +1,102 @@
+"""
+Content-addressed cache for PDF layout results.
+
+Extracted lines are keyed by the hash of the PDF bytes, and each page's
+segmentation by that hash plus the model name, the layout prompt version and
+the heuristic segmenter's version and confidence threshold. Pages are cached
+individually, so an interrupted document resumes from the pages that already
+finished.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List
+
+from cache import DiskStore, LRUCache, get_default_store
+from processors.heuristic_layout import HEURISTIC_LAYOUT_VERSION, LAYOUT_HEURISTIC_THRESHOLD
+from prompts.version import LAYOUT_PROMPT_VERSION
+
+# Disk store namespace.
+STORE_NAMESPACE = "layout"
+
+# In-memory entries (line lists and page segmentations).
+LAYOUT_CACHE_SIZE = int(os.getenv("LAYOUT_CACHE_SIZE", 2048))
+
+# Serialized size of everything held in memory. A dense paper's line list
+# alone can run to tens of megabytes; lists larger than this stay on disk only.
+LAYOUT_CACHE_MAX_BYTES = int(float(os.getenv("LAYOUT_CACHE_MAX_MB", 64)) * 1024 * 1024)
+
+
+def document_hash(pdf_bytes: bytes) -> str:
+  """SHA-256 of the raw PDF bytes."""
+  return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+class LayoutCache:
+  """Memory tier in front of the optional shared disk store."""
+
+  def __init__(
+    self,
+    store: DiskStore | None = None,
+    maxsize: int = LAYOUT_CACHE_SIZE,
+    max_bytes: int = LAYOUT_CACHE_MAX_BYTES,
+    heuristic_threshold: float = LAYOUT_HEURISTIC_THRESHOLD,
+  ):
+    self.memory = LRUCache(maxsize=maxsize, max_bytes=max_bytes, sizeof=_serialized_size)
+    self.store = store
+    # Pages segmented under another threshold may have taken the other path.
+    self.segmenter = f"h{HEURISTIC_LAYOUT_VERSION}@{heuristic_threshold:g}"
+
+  def get_lines(self, doc_hash: str) -> List[Dict[str, Any]] | None:
+    """Returns serialized raw lines for the document, if cached."""
+    return self._get(f"{doc_hash}:lines")
+
+  def put_lines(self, doc_hash: str, records: List[Dict[str, Any]]) -> None:
+    self._put(f"{doc_hash}:lines", records)
+
+  def get_page(self, doc_hash: str, model_name: str, page: int) -> Dict[str, Any] | None:
+    """Returns a page's segmentation payload, if cached."""
+    return self._get(self._page_key(doc_hash, model_name, page))
+
+  def put_page(self, doc_hash: str, model_name: str, page: int, payload: Dict[str, Any]) -> None:
+    """Caches a page's segmentation unless it failed or is incomplete (such pages are retried)."""
+    if payload.get("error") or payload.get("incomplete"):
+      return
+    self._put(self._page_key(doc_hash, model_name, page), payload)
+
+  def stats(self) -> Dict[str, Any]:
+    return self.memory.stats()
+
+  def _page_key(self, doc_hash: str, model_name: str, page: int) -> str:
+    return f"{doc_hash}:{model_name}:{LAYOUT_PROMPT_VERSION}:{self.segmenter}:{page}"
+
+  def _get(self, key: str) -> Any:
+    value = self.memory.get(key)
+    if value is None and self.store is not None:
+      value = self.store.get(STORE_NAMESPACE, key)
+      if value is not None:
+        self.memory.set(key, value)
+    return value
+
+  def _put(self, key: str, value: Any) -> None:
+    self.memory.set(key, value)
+    if self.store is not None:
+      self.store.set(STORE_NAMESPACE, key, value)
+
+
+def _serialized_size(value: Any) -> int:
+  return len(json.dumps(value, ensure_ascii=False))
+
+
+_layout_cache: LayoutCache | None = None
+
+
+def get_layout_cache() -> LayoutCache:
+  """Process-wide layout cache sharing the translation disk store."""
+  global _layout_cache
+  if _layout_cache is None:
+    _layout_cache = LayoutCache(store=get_default_store())
+  return _layout_cache
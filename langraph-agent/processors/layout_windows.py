@@ -0,0 +1,121 @@
+"""
+Token-budgeted windowing for dense pages.
+
+Pages whose layout prompt would exceed the token budget are cut into
+overlapping line windows that are segmented independently. Each window owns
+a non-overlapping "core" range; the overlap only gives the LLM context so a
+block crossing a cut can be recognised on both sides and joined back.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+from prompts.layout_prompt import SupportsLineProtocol, build_layout_prompt, estimate_line_tokens, estimate_tokens
+
+# Tokens taken by the instructions around the line payload, per encoding.
+TEMPLATE_TOKENS = {
+  False: estimate_tokens(build_layout_prompt(0, [])),
+  True: estimate_tokens(build_layout_prompt(0, [], compact=True)),
+}
+
+
+@dataclass(slots=True)
+class LayoutWindow:
+  """A slice of a page's lines; `core_start`/`core_end` are the lines it owns."""
+
+  start: int
+  end: int
+  core_start: int
+  core_end: int
+
+
+def plan_windows(
+  lines: Sequence[SupportsLineProtocol],
+  token_budget: int,
+  overlap: int,
+  compact: bool = False,
+) -> List[LayoutWindow]:
+  """
+  Splits a page into windows whose prompts stay within `token_budget`.
+
+  Returns a single window covering the page when it already fits.
+  """
+  costs = [estimate_line_tokens(line, compact) for line in lines]
+  available = token_budget - TEMPLATE_TOKENS[compact]
+  if sum(costs) <= available or len(lines) <= 1:
+    return [LayoutWindow(0, len(lines), 0, len(lines))]
+
+  # Leave room for the overlap lines added on both sides of each core.
+  average = sum(costs) / len(costs)
+  core_budget = max(available - 2 * overlap * average, average)
+
+  cores: List[List[int]] = []
+  start = 0
+  used = 0.0
+  for index, cost in enumerate(costs):
+    if index > start and used + cost > core_budget:
+      cores.append([start, index])
+      start = index
+      used = 0.0
+    used += cost
+  cores.append([start, len(lines)])
+
+  return [
+    LayoutWindow(
+      start=max(0, core_start - overlap),
+      end=min(len(lines), core_end + overlap),
+      core_start=core_start,
+      core_end=core_end,
+    )
+    for core_start, core_end in cores
+  ]
+
+
+def stitch_windows(
+  lines: Sequence[SupportsLineProtocol],
+  windows: Sequence[LayoutWindow],
+  parsed_windows: Sequence[Dict[str, Any]],
+) -> Dict[str, Any]:
+  """
+  Joins per-window segmentations into one page segmentation.
+
+  Each window keeps only the lines in its core. When the block holding the
+  last core line of one window reaches into the overlap (or the next
+  window's first block reaches back), the two halves are merged.
+  """
+  position = {line.line_id: index for index, line in enumerate(lines)}
+  stitched: List[Dict[str, Any]] = []
+  # Block from the previous window holding its last core line, if that block
+  # continued into the overlap.
+  open_tail: Dict[str, Any] | None = None
+
+  for window, parsed in zip(windows, parsed_windows):
+    blocks = parsed.get("blocks", []) if isinstance(parsed, dict) else []
+    tail: Dict[str, Any] | None = None
+
+    for block in blocks:
+      indices = [position[line_id] for line_id in block.get("line_ids", []) if line_id in position]
+      core = [index for index in indices if window.core_start <= index < window.core_end]
+      if not core:
+        continue
+
+      line_ids = [lines[index].line_id for index in core]
+      continues_back = window.core_start in core and any(index < window.core_start for index in indices)
+      if open_tail is not None and window.core_start in core and (continues_back or open_tail["continues"]):
+        open_tail["line_ids"].extend(line_ids)
+        current = open_tail
+      else:
+        current = {"type": block.get("type", "BODY"), "line_ids": line_ids, "continues": False}
+        stitched.append(current)
+
+      if window.core_end - 1 in core:
+        current["continues"] = any(index >= window.core_end for index in indices)
+        tail = current
+
+    open_tail = tail
+
+  return {
+    "blocks": [{"type": block["type"], "line_ids": block["line_ids"]} for block in stitched],
+  }
@@ -4,20 +4,62 @@ PDF processing pipeline leveraging LangGraph and LLM-assisted layout understandi
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, AsyncIterator, Dict, Iterable, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+import asyncio
+import math
+import multiprocessing
+import os
 import statistics
+import sys
+import threading
 
 import fitz  # PyMuPDF
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
 from langchain.schema import HumanMessage
 
-from prompts.layout_prompt import build_layout_prompt
+from llm import PRIORITY_BACKGROUND, get_chat_model, get_scheduler
+from prompts.layout_prompt import build_layout_prompt, estimate_tokens, expand_line_refs
+from processors.heuristic_layout import LAYOUT_HEURISTIC_THRESHOLD, segment_page_heuristically
+from processors.json_recovery import parse_layout_response, parse_metrics
+from processors.layout_cache import document_hash, get_layout_cache
+from processors.layout_windows import plan_windows, stitch_windows
 
+# Maximum number of pages segmented concurrently.
+LAYOUT_CONCURRENCY = int(os.getenv("LAYOUT_CONCURRENCY", 8))
 
-@dataclass
+# Seconds before a single page's segmentation call is abandoned.
+LAYOUT_PAGE_TIMEOUT = float(os.getenv("LAYOUT_PAGE_TIMEOUT", 60))
+
+# Estimated prompt tokens above which a page is split into line windows.
+LAYOUT_PAGE_TOKEN_BUDGET = int(os.getenv("LAYOUT_PAGE_TOKEN_BUDGET", 6000))
+
+# Lines shared between neighbouring windows so cut blocks can be stitched.
+LAYOUT_WINDOW_OVERLAP = int(os.getenv("LAYOUT_WINDOW_OVERLAP", 3))
+
+# "compact" sends indexed, quantized, truncated rows instead of JSON objects.
+LAYOUT_PROMPT_MODE = os.getenv("LAYOUT_PROMPT_MODE", "json")
+
+# Process count for extracting large documents (1 disables the pool).
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", min(os.cpu_count() or 1, 4)))
+
+# Documents shorter than this are extracted serially in the calling thread.
+EXTRACT_PARALLEL_MIN_PAGES = int(os.getenv("EXTRACT_PARALLEL_MIN_PAGES", 64))
+
+# Extraction pools keyed by worker count, shared across requests.
+_extraction_pools: Dict[int, ProcessPoolExecutor] = {}
+_extraction_pools_lock = threading.Lock()
+
+
+@dataclass(slots=True)
 class RawLine:
-  """Represents a single textual line extracted from the PDF."""
+  """
+  Represents a single textual line extracted from the PDF.
+
+  Slotted: dense papers produce hundreds of thousands of these, and dropping
+  the per-instance __dict__ cuts their footprint by about a third.
+  """
 
   line_id: str
   page: int
@@ -28,7 +70,7 @@ class RawLine:
   column_hint: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ContentBlock:
   """Structured block after LLM segmentation."""
 
@@ -40,79 +82,407 @@ class ContentBlock:
   line_ids: List[str]
 
 
-def extract_raw_lines(pdf_bytes: bytes) -> List[RawLine]:
-  """Extracts raw lines with geometry data using PyMuPDF."""
+def extract_raw_lines(
+  pdf_bytes: bytes,
+  workers: int | None = None,
+  min_parallel_pages: int = EXTRACT_PARALLEL_MIN_PAGES,
+) -> List[RawLine]:
+  """
+  Extracts raw lines with geometry data using PyMuPDF.
+
+  Documents with at least `min_parallel_pages` pages are split into page
+  ranges and extracted in a shared process pool of `workers` processes.
+  The merged result is identical to the serial path.
+  """
+  workers = EXTRACT_WORKERS if workers is None else workers
   doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-  lines: List[RawLine] = []
+  page_count = doc.page_count
+
+  if workers > 1 and page_count >= max(min_parallel_pages, 2):
+    doc.close()
+    return _extract_parallel(pdf_bytes, page_count, workers)
 
+  lines: List[RawLine] = []
   for page_index, page in enumerate(doc):
-    text_dict = page.get_text("dict")
-    blocks = text_dict.get("blocks", [])
+    lines.extend(_extract_page_lines(page_index, page))
+  doc.close()
+  return lines
+
 
-    for block_index, block in enumerate(blocks):
-      if block.get("type") != 0:
+def _extract_page_lines(page_index: int, page: "fitz.Page") -> List[RawLine]:
+  """Extracts the non-empty text lines of a single page."""
+  lines: List[RawLine] = []
+  text_dict = page.get_text("dict")
+  blocks = text_dict.get("blocks", [])
+
+  for block_index, block in enumerate(blocks):
+    if block.get("type") != 0:
+      continue
+
+    for line_index, line in enumerate(block.get("lines", [])):
+      spans = line.get("spans", [])
+      raw_text = "".join(span.get("text", "") for span in spans)
+      text = raw_text.strip()
+      if not text:
         continue
 
-      for line_index, line in enumerate(block.get("lines", [])):
-        spans = line.get("spans", [])
-        raw_text = "".join(span.get("text", "") for span in spans)
-        text = raw_text.strip()
-        if not text:
-          continue
-
-        bbox = tuple(line.get("bbox", (0, 0, 0, 0)))
-        font_sizes = [span.get("size", 0.0) for span in spans if span.get("size")]
-        font_names = [span.get("font", "") for span in spans if span.get("font")]
-        font_size = statistics.mean(font_sizes) if font_sizes else 0.0
-        font_name = font_names[0] if font_names else None
-
-        x0, _, x1, _ = bbox
-        column_hint = (x0 + x1) / 2.0
-
-        line_id = f"p{page_index + 1}-b{block_index}-l{line_index}"
-        lines.append(
-          RawLine(
-            line_id=line_id,
-            page=page_index + 1,
-            text=text,
-            bbox=bbox,
-            font_size=font_size,
-            font_name=font_name,
-            column_hint=column_hint,
-          )
+      bbox = tuple(line.get("bbox", (0, 0, 0, 0)))
+      font_sizes = [span.get("size", 0.0) for span in spans if span.get("size")]
+      font_names = [span.get("font", "") for span in spans if span.get("font")]
+      font_size = statistics.mean(font_sizes) if font_sizes else 0.0
+      # A page uses a handful of fonts; share one string per name.
+      font_name = sys.intern(font_names[0]) if font_names else None
+
+      x0, _, x1, _ = bbox
+      column_hint = (x0 + x1) / 2.0
+
+      line_id = f"p{page_index + 1}-b{block_index}-l{line_index}"
+      lines.append(
+        RawLine(
+          line_id=line_id,
+          page=page_index + 1,
+          text=text,
+          bbox=bbox,
+          font_size=font_size,
+          font_name=font_name,
+          column_hint=column_hint,
         )
+      )
 
   return lines
 
 
-def segment_layout_with_llm(lines: List[RawLine], model_name: str = "gpt-5-mini") -> Dict[int, Dict[str, Any]]:
+def _extract_page_range(pdf_bytes: bytes, start: int, stop: int) -> List[RawLine]:
+  """Worker entry point: opens the document and extracts pages [start, stop)."""
+  doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+  lines: List[RawLine] = []
+  for page_index in range(start, stop):
+    lines.extend(_extract_page_lines(page_index, doc[page_index]))
+  doc.close()
+  return lines
+
+
+def _extract_parallel(pdf_bytes: bytes, page_count: int, workers: int) -> List[RawLine]:
+  """Fans page ranges out to the process pool and merges them in page order."""
+  pool = _get_extraction_pool(workers)
+  # Several ranges per worker keeps the pool busy when page costs are uneven.
+  chunk_size = max(1, math.ceil(page_count / (workers * 4)))
+  futures = [
+    pool.submit(_extract_page_range, pdf_bytes, start, min(start + chunk_size, page_count))
+    for start in range(0, page_count, chunk_size)
+  ]
+
+  lines: List[RawLine] = []
+  for future in futures:
+    lines.extend(future.result())
+  return lines
+
+
+def _get_extraction_pool(workers: int) -> ProcessPoolExecutor:
+  """Returns the process pool for `workers`, creating it once per process."""
+  with _extraction_pools_lock:
+    pool = _extraction_pools.get(workers)
+    if pool is None:
+      # spawn avoids forking the server's threads and event loop.
+      pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+      _extraction_pools[workers] = pool
+    return pool
+
+
+def segment_layout_with_llm(
+  lines: List[RawLine],
+  model_name: str = "gpt-5-mini",
+  llm: BaseChatModel | None = None,
+  concurrency: int = LAYOUT_CONCURRENCY,
+  page_timeout: float = LAYOUT_PAGE_TIMEOUT,
+  doc_hash: str | None = None,
+) -> Dict[int, Dict[str, Any]]:
   """
   Requests the LLM to segment lines into logical content blocks.
 
+  Synchronous wrapper around `asegment_layout_with_llm`; must not be called
+  from a running event loop.
+
   Returns:
       Dict[page_number, segmentation_json]
   """
+  return asyncio.run(
+    asegment_layout_with_llm(
+      lines,
+      model_name=model_name,
+      llm=llm,
+      concurrency=concurrency,
+      page_timeout=page_timeout,
+      doc_hash=doc_hash,
+    )
+  )
+
+
+async def asegment_layout_with_llm(
+  lines: List[RawLine],
+  model_name: str = "gpt-5-mini",
+  llm: BaseChatModel | None = None,
+  concurrency: int = LAYOUT_CONCURRENCY,
+  page_timeout: float = LAYOUT_PAGE_TIMEOUT,
+  doc_hash: str | None = None,
+) -> Dict[int, Dict[str, Any]]:
+  """
+  Segments all pages concurrently, at most `concurrency` pages at a time.
+
+  A page that does not finish within `page_timeout` seconds is recorded with
+  an empty parse and an `error` entry instead of blocking the whole document.
+  When `doc_hash` is given, pages already in the layout cache are reused.
+
+  Returns:
+      Dict[page_number, segmentation_json] in page order
+  """
   if not lines:
     return {}
 
-  llm = ChatOpenAI(model=model_name, temperature=0)
-  pages: Dict[int, List[RawLine]] = {}
-  for line in lines:
-    pages.setdefault(line.page, []).append(line)
+  llm = llm or get_chat_model(model_name, 0)
+  pages = _group_by_page(lines)
+
+  results: Dict[int, Dict[str, Any]] = {}
+  async for page, payload in _iter_segmented_pages(
+    llm, pages, list(pages), concurrency, page_timeout, model_name, doc_hash
+  ):
+    results[page] = payload
+  return {page: results[page] for page in pages}
+
+
+async def _iter_segmented_pages(
+  llm: BaseChatModel,
+  pages: Dict[int, List[RawLine]],
+  order: List[int],
+  concurrency: int,
+  page_timeout: float,
+  model_name: str,
+  doc_hash: str | None,
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+  """
+  Yields (page, segmentation) pairs in completion order.
 
-  segmentation: Dict[int, Dict[str, Any]] = {}
+  Cached pages come first, without taking a semaphore slot. The remaining
+  tasks are created in `order`; the semaphore admits waiters first-in
+  first-out, so pages earlier in `order` start first. Cache reads and writes
+  may hit the disk store, so they run in worker threads -- all reads in one
+  hop before scheduling, so thread timing cannot reorder the pages.
+  """
+  semaphore = asyncio.Semaphore(max(1, concurrency))
+  layout_cache = get_layout_cache()
+
+  def lookup() -> Dict[int, Dict[str, Any]]:
+    found: Dict[int, Dict[str, Any]] = {}
+    for page in order:
+      payload = layout_cache.get_page(doc_hash, model_name, page)
+      if payload is not None:
+        found[page] = payload
+    return found
+
+  cached = await asyncio.to_thread(lookup) if doc_hash else {}
+
+  async def run(page: int) -> Tuple[int, Dict[str, Any]]:
+    async with semaphore:
+      payload = await _segment_page(llm, page, pages[page], page_timeout)
 
-  for page, page_lines in pages.items():
-    prompt = build_layout_prompt(page, page_lines)
-    response = llm.invoke([HumanMessage(content=prompt)])
-    raw_content = response.content
-    parsed = _safe_parse_json(raw_content)
-    segmentation[page] = {
-      "raw": raw_content,
-      "parsed": parsed,
+    if doc_hash:
+      await asyncio.to_thread(layout_cache.put_page, doc_hash, model_name, page, payload)
+    return page, payload
+
+  tasks = [asyncio.create_task(run(page)) for page in order if page not in cached]
+  try:
+    for page in order:
+      if page in cached:
+        yield page, cached[page]
+    for next_done in asyncio.as_completed(tasks):
+      yield await next_done
+  finally:
+    # Stop outstanding LLM calls if the consumer goes away early.
+    for task in tasks:
+      task.cancel()
+
+
+async def _segment_page(
+  llm: BaseChatModel,
+  page: int,
+  page_lines: List[RawLine],
+  page_timeout: float,
+) -> Dict[str, Any]:
+  """
+  Segments a single page, using the geometric heuristic when it is confident
+  enough and the layout prompt otherwise.
+  """
+  heuristic, confidence = segment_page_heuristically(page_lines)
+  if confidence >= LAYOUT_HEURISTIC_THRESHOLD:
+    return {
+      "raw": "",
+      "parsed": heuristic,
+      "source": "heuristic",
+      "confidence": confidence,
     }
 
-  return segmentation
+  compact = LAYOUT_PROMPT_MODE == "compact"
+  windows = plan_windows(page_lines, LAYOUT_PAGE_TOKEN_BUDGET, LAYOUT_WINDOW_OVERLAP, compact)
+  # Windows of one page are segmented in parallel under the page's slot.
+  outcomes = await asyncio.gather(
+    *(
+      _request_segmentation(llm, page, page_lines[window.start:window.end], page_timeout, compact)
+      for window in windows
+    ),
+    return_exceptions=True,
+  )
+
+  timed_out = [outcome for outcome in outcomes if isinstance(outcome, asyncio.TimeoutError)]
+  for outcome in outcomes:
+    if isinstance(outcome, BaseException) and not isinstance(outcome, asyncio.TimeoutError):
+      raise outcome
+
+  raws = ["" if isinstance(outcome, BaseException) else outcome[0] for outcome in outcomes]
+  parsed_windows = [{} if isinstance(outcome, BaseException) else outcome[1] for outcome in outcomes]
+
+  if len(windows) == 1:
+    parsed = parsed_windows[0]
+  else:
+    parsed = stitch_windows(page_lines, windows, parsed_windows)
+
+  payload: Dict[str, Any] = {
+    "raw": "\n".join(raws),
+    "parsed": parsed,
+    "source": "llm",
+    "confidence": confidence,
+  }
+  if len(windows) > 1:
+    payload["windows"] = len(windows)
+  if timed_out:
+    payload["error"] = (
+      f"Layout segmentation timed out after {page_timeout:.0f}s "
+      f"({len(timed_out)}/{len(windows)} windows)"
+    )
+    return payload
+
+  # Replies that stay unparseable or partial after recovery are reported, so
+  # the layout cache retries the page instead of keeping the gap.
+  blocks = parsed.get("blocks", [])
+  if not blocks:
+    payload["error"] = "Layout reply could not be parsed"
+    return payload
+  covered = {
+    line_id for block in blocks if isinstance(block, dict) for line_id in block.get("line_ids", [])
+  }
+  missing = sum(end - start for start, end in _missing_ranges(page_lines, covered))
+  if missing:
+    payload["incomplete"] = missing
+  return payload
+
+
+async def _request_segmentation(
+  llm: BaseChatModel,
+  page: int,
+  lines: List[RawLine],
+  timeout: float,
+  compact: bool = False,
+  recover: bool = True,
+) -> Tuple[str, Dict[str, Any]]:
+  """
+  Runs the layout prompt for a set of lines; raises asyncio.TimeoutError.
+
+  The call goes through the shared LLM scheduler in the background lane, so
+  visible-page translations are admitted first. `timeout` is one deadline for
+  the whole request -- queueing for rate-limit capacity, every attempt, the
+  backoff between them and the recovery re-request -- so a page never waits
+  longer than that.
+
+  The parsed result always references real line ids, whatever the encoding.
+  When the reply had to be salvaged (or could not be parsed at all), only the
+  lines it did not cover are sent again, once, within the time left.
+  """
+  loop = asyncio.get_running_loop()
+  deadline = loop.time() + timeout
+  prompt = build_layout_prompt(page, lines, compact=compact)
+  messages = [HumanMessage(content=prompt)]
+  # Layout replies echo every line id, so reserve about as many tokens again.
+  response = await asyncio.wait_for(
+    get_scheduler().arun(lambda: llm.ainvoke(messages), 2 * estimate_tokens(prompt), PRIORITY_BACKGROUND),
+    timeout=timeout,
+  )
+  raw_content = response.content
+  parsed, outcome = parse_layout_response(raw_content)
+  if compact and parsed:
+    parsed = expand_line_refs(parsed, lines)
+  remaining = deadline - loop.time()
+  if recover and outcome in ("salvaged", "failed") and remaining > 0:
+    parsed = await _recover_missing_lines(llm, page, lines, parsed, remaining, compact)
+  return raw_content, parsed
+
+
+async def _recover_missing_lines(
+  llm: BaseChatModel,
+  page: int,
+  lines: List[RawLine],
+  parsed: Dict[str, Any],
+  timeout: float,
+  compact: bool,
+) -> Dict[str, Any]:
+  """Re-segments the contiguous line ranges missing from a partial reply."""
+  blocks: List[Dict[str, Any]] = list(parsed.get("blocks", []))
+  covered = {line_id for block in blocks for line_id in block.get("line_ids", [])}
+  ranges = _missing_ranges(lines, covered)
+  if not ranges:
+    return parsed
+
+  parse_metrics.incr("rerequests", len(ranges))
+  outcomes = await asyncio.gather(
+    *(
+      _request_segmentation(llm, page, lines[start:end], timeout, compact, recover=False)
+      for start, end in ranges
+    ),
+    return_exceptions=True,
+  )
+
+  position = {line.line_id: index for index, line in enumerate(lines)}
+
+  def first_index(block: Dict[str, Any]) -> int:
+    return min((position[line_id] for line_id in block.get("line_ids", []) if line_id in position), default=-1)
+
+  for outcome in outcomes:
+    if isinstance(outcome, asyncio.TimeoutError):
+      continue
+    if isinstance(outcome, BaseException):
+      raise outcome
+    for block in outcome[1].get("blocks", []):
+      start = first_index(block)
+      if start < 0:
+        continue
+      parse_metrics.incr("recovered_lines", len(block.get("line_ids", [])))
+      # Keep reading order: place the block before the first one that starts later.
+      insert_at = next((i for i, existing in enumerate(blocks) if first_index(existing) > start), len(blocks))
+      blocks.insert(insert_at, block)
+
+  return {**parsed, "blocks": blocks}
+
+
+def _missing_ranges(lines: List[RawLine], covered: set) -> List[Tuple[int, int]]:
+  """Contiguous [start, end) index ranges of lines not in `covered`."""
+  ranges: List[Tuple[int, int]] = []
+  start = None
+  for index, line in enumerate(lines):
+    if line.line_id in covered:
+      if start is not None:
+        ranges.append((start, index))
+        start = None
+    elif start is None:
+      start = index
+  if start is not None:
+    ranges.append((start, len(lines)))
+  return ranges
+
+
+def _group_by_page(lines: List[RawLine]) -> Dict[int, List[RawLine]]:
+  """Groups lines by page number, preserving extraction order."""
+  pages: Dict[int, List[RawLine]] = {}
+  for line in lines:
+    pages.setdefault(line.page, []).append(line)
+  return pages
 
 
 def align_blocks(
@@ -121,8 +491,12 @@ def align_blocks(
 ) -> List[ContentBlock]:
   """
   Aligns LLM segmentation results with raw line geometry to create structured blocks.
+
+  Compact-mode blocks that still reference lines by per-page index
+  (`"lines": [...]`) are mapped back to line ids against the page's lines.
   """
-  line_lookup: Dict[str, RawLine] = {line.line_id: line for line in lines}
+  line_lookup = index_lines(lines)
+  pages: Dict[int, List[RawLine]] | None = None
   blocks: List[ContentBlock] = []
 
   for page, payload in segmentation.items():
@@ -130,6 +504,10 @@ def align_blocks(
     if not parsed:
       continue
 
+    if any(isinstance(block, dict) and "line_ids" not in block for block in parsed.get("blocks", [])):
+      pages = pages if pages is not None else _group_by_page(lines)
+      parsed = expand_line_refs(parsed, pages.get(page, []))
+
     for idx, block in enumerate(parsed.get("blocks", [])):
       line_ids: List[str] = block.get("line_ids", [])
       filtered_lines = [line_lookup[line_id] for line_id in line_ids if line_id in line_lookup]
@@ -159,12 +537,83 @@ def process_pdf(pdf_bytes: bytes, model_name: str = "gpt-5-mini") -> Dict[str, A
   """
   Executes the full PDF processing pipeline.
   """
-  raw_lines = extract_raw_lines(pdf_bytes)
-  segmentation = segment_layout_with_llm(raw_lines, model_name=model_name)
+  doc_hash = document_hash(pdf_bytes)
+  raw_lines = _load_raw_lines(pdf_bytes, doc_hash)
+  segmentation = segment_layout_with_llm(raw_lines, model_name=model_name, doc_hash=doc_hash)
+  return _build_result(raw_lines, segmentation)
+
+
+async def aprocess_pdf(pdf_bytes: bytes, model_name: str = "gpt-5-mini") -> Dict[str, Any]:
+  """
+  Async variant of `process_pdf`; extraction runs in a worker thread and
+  pages are segmented concurrently.
+  """
+  doc_hash = document_hash(pdf_bytes)
+  raw_lines = await asyncio.to_thread(_load_raw_lines, pdf_bytes, doc_hash)
+  segmentation = await asegment_layout_with_llm(raw_lines, model_name=model_name, doc_hash=doc_hash)
+  return _build_result(raw_lines, segmentation)
+
+
+async def aiter_process_pdf(
+  pdf_bytes: bytes,
+  model_name: str = "gpt-5-mini",
+  priority_pages: Iterable[int] = (),
+  llm: BaseChatModel | None = None,
+) -> AsyncIterator[Dict[str, Any]]:
+  """
+  Streaming variant of `process_pdf`.
+
+  Yields one payload per page (raw lines, segmentation and aligned blocks) as
+  soon as that page is segmented. Pages listed in `priority_pages` are
+  scheduled ahead of the rest of the document.
+  """
+  doc_hash = document_hash(pdf_bytes)
+  raw_lines = await asyncio.to_thread(_load_raw_lines, pdf_bytes, doc_hash)
+  if not raw_lines:
+    return
+
+  llm = llm or get_chat_model(model_name, 0)
+  pages = _group_by_page(raw_lines)
+  order = _prioritize_pages(list(pages), priority_pages)
+
+  async for page, payload in _iter_segmented_pages(
+    llm, pages, order, LAYOUT_CONCURRENCY, LAYOUT_PAGE_TIMEOUT, model_name, doc_hash
+  ):
+    result = _build_result(pages[page], {page: payload})
+    yield {
+      "page": page,
+      "raw_lines": result["raw_lines"],
+      "segmentation": payload,
+      "content_blocks": result["content_blocks"],
+    }
+
+
+def _load_raw_lines(pdf_bytes: bytes, doc_hash: str) -> List[RawLine]:
+  """Returns cached lines for a previously seen document, extracting otherwise."""
+  layout_cache = get_layout_cache()
+  records = layout_cache.get_lines(doc_hash)
+  if records is not None:
+    return deserialize_raw_lines(records)
+
+  lines = extract_raw_lines(pdf_bytes)
+  layout_cache.put_lines(doc_hash, serialize_raw_lines(lines))
+  return lines
+
+
+def _prioritize_pages(pages: List[int], priority_pages: Iterable[int]) -> List[int]:
+  """Moves requested pages (in request order) to the front of the schedule."""
+  available = set(pages)
+  first = list(dict.fromkeys(page for page in priority_pages if page in available))
+  chosen = set(first)
+  return first + [page for page in pages if page not in chosen]
+
+
+def _build_result(raw_lines: List[RawLine], segmentation: Dict[int, Any]) -> Dict[str, Any]:
+  """Assembles the response payload for the processed document."""
   content_blocks = align_blocks(raw_lines, segmentation)
 
   return {
-    "raw_lines": [line.__dict__ for line in raw_lines],
+    "raw_lines": serialize_raw_lines(raw_lines),
     "segmentation": segmentation,
     "content_blocks": [
       {
@@ -180,6 +629,43 @@ def process_pdf(pdf_bytes: bytes, model_name: str = "gpt-5-mini") -> Dict[str, A
   }
 
 
+def index_lines(lines: Iterable[RawLine]) -> Dict[str, RawLine]:
+  """Builds an id -> line lookup table."""
+  return {line.line_id: line for line in lines}
+
+
+def serialize_raw_lines(lines: Iterable[RawLine]) -> List[Dict[str, Any]]:
+  """Converts lines to JSON-ready records by reading slots directly."""
+  return [
+    {
+      "line_id": line.line_id,
+      "page": line.page,
+      "text": line.text,
+      "bbox": line.bbox,
+      "font_size": line.font_size,
+      "font_name": line.font_name,
+      "column_hint": line.column_hint,
+    }
+    for line in lines
+  ]
+
+
+def deserialize_raw_lines(records: Iterable[Dict[str, Any]]) -> List[RawLine]:
+  """Inverse of `serialize_raw_lines`."""
+  return [
+    RawLine(
+      line_id=record["line_id"],
+      page=record["page"],
+      text=record["text"],
+      bbox=tuple(record["bbox"]),
+      font_size=record["font_size"],
+      font_name=record["font_name"],
+      column_hint=record["column_hint"],
+    )
+    for record in records
+  ]
+
+
 def _merge_bboxes(bboxes: List[Tuple[float, float, float, float]]) -> Tuple[float, float, float, float]:
   """Merges multiple bounding boxes into one."""
   xs0 = [bbox[0] for bbox in bboxes]
@@ -189,12 +675,3 @@ def _merge_bboxes(bboxes: List[Tuple[float, float, float, float]]) -> Tuple[floa
 
   return (min(xs0), min(ys0), max(xs1), max(ys1))
 
-
-def _safe_parse_json(raw_response: str) -> Dict[str, Any]:
-  """Attempts to parse the LLM response as JSON with graceful failure."""
-  import json
-
-  try:
-    return json.loads(raw_response)
-  except json.JSONDecodeError:
-    return {}
@@ -2,18 +2,24 @@
 Prompts package for LangGraph agents
 """
 
-from .classifier_prompt import get_classifier_prompt
+from .classifier_prompt import get_batch_classifier_prompt, get_classifier_prompt
 from .translation_prompt import get_translation_prompt
 from .math_prompt import get_math_translation_prompt, get_math_validation_prompt
 from .table_prompt import get_table_translation_prompt
 from .image_prompt import get_image_translation_prompt
+from .batch_prompt import get_batch_translation_prompt
+from .version import CLASSIFIER_PROMPT_VERSION, TRANSLATION_PROMPT_VERSION
 
 __all__ = [
+    'CLASSIFIER_PROMPT_VERSION',
+    'TRANSLATION_PROMPT_VERSION',
     'get_classifier_prompt',
+    'get_batch_classifier_prompt',
     'get_translation_prompt',
     'get_math_translation_prompt',
     'get_math_validation_prompt',
     'get_table_translation_prompt',
     'get_image_translation_prompt',
+    'get_batch_translation_prompt',
 ]
 
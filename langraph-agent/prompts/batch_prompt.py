@@ -0,0 +1,41 @@
+"""
+Batch Translation Prompt
+짧은 세그먼트 여러 개를 번호를 붙여 한 번에 번역하고, JSON으로 돌려받습니다.
+"""
+
+import json
+from typing import List, Tuple
+
+BATCH_TRANSLATION_SYSTEM_PROMPT = """You are a professional academic translator specializing in translating English research papers to Korean.
+
+## Task
+Translate each numbered segment in the user message to Korean independently. The segments are short pieces of the same paper.
+
+## Guidelines
+- Keep technical terms in English if commonly used (e.g., "deep learning", "CNN", "BERT")
+- Use formal academic Korean (합니다체)
+- Preserve citations, references, numbers and figure/table numbers exactly
+- Copy placeholders such as ⟦0⟧ unchanged, each exactly once
+- Translate every segment; never merge, split or skip segments
+
+## Output Format
+Reply with JSON only, no explanations:
+{"translations": [{"id": 1, "text": "<Korean translation of segment 1>"}, ...]}
+"""
+
+# 세그먼트 종류별 설명 (사용자 메시지 첫 줄)
+SEGMENT_KINDS = {
+    "TEXT": "headings, list items and sentences",
+    "IMAGE": "figure and table captions or image references",
+}
+
+
+def get_batch_translation_prompt(texts: List[str], content_type: str = "TEXT", context: str = "") -> Tuple[str, str]:
+    # 세그먼트는 JSON 문자열로 넣어 줄바꿈/따옴표가 번호 경계를 흐리지 않게 합니다
+    segments = "\n".join(
+        f"{index}. {json.dumps(text, ensure_ascii=False)}"
+        for index, text in enumerate(texts, start=1)
+    )
+    user = f"Context (for reference): {context}\n\n" if context else ""
+    user += f"## Segments ({SEGMENT_KINDS.get(content_type, SEGMENT_KINDS['TEXT'])})\n{segments}"
+    return BATCH_TRANSLATION_SYSTEM_PROMPT, user
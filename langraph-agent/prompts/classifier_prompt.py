@@ -3,7 +3,10 @@ Content Classifier Prompt
 텍스트 청크를 분석하여 TEXT, MATH, TABLE, IMAGE 중 하나로 분류합니다.
 """
 
-CLASSIFIER_PROMPT = """You are an expert content classifier for academic papers.
+import json
+from typing import List, Tuple
+
+CLASSIFIER_SYSTEM_PROMPT = """You are an expert content classifier for academic papers.
 
 ## Task
 Analyze the given text chunk and classify it into ONE of the following categories:
@@ -12,46 +15,49 @@ Analyze the given text chunk and classify it into ONE of the following categorie
 - TABLE: Tabular data, structured information
 - IMAGE: Image descriptions, figure captions, or image-related content
 
-## Chain of Thought Process
-1. First, examine the structure and formatting of the content
-2. Look for LaTeX markers (\\[, \\], $, $$, \\begin, \\end)
-3. Check for tabular structures (|, rows, columns)
-4. Identify image-related keywords (Figure, Fig., caption, image)
-5. If none of the above, classify as TEXT
-
 ## Examples (Few-shot)
 
 Example 1:
 Input: "We propose a novel approach to image classification using deep learning."
-Thought: Regular academic sentence, no special markers
 Output: TEXT
 
 Example 2:
 Input: "The loss function is defined as $L = \\sum_{i=1}^n (y_i - \\hat{y}_i)^2$"
-Thought: Contains LaTeX markers $ and mathematical notation
 Output: MATH
 
 Example 3:
 Input: "| Method | Accuracy | F1-Score |\\n| BERT | 92.3% | 0.91 |"
-Thought: Contains table structure with pipes and rows
 Output: TABLE
 
 Example 4:
 Input: "Figure 1: Our proposed architecture shows significant improvements."
-Thought: Contains "Figure" keyword, referring to image
 Output: IMAGE
 
-## Input Text
-{text}
+## Output Format
+Reply with one line only, no reasoning:
+Classification: [TEXT|MATH|TABLE|IMAGE]
+"""
 
-## Classification
-Think step by step and provide your reasoning, then output only one of: TEXT, MATH, TABLE, IMAGE
+BATCH_CLASSIFIER_SYSTEM_PROMPT = """You are an expert content classifier for academic papers.
 
-Your response format:
-Reasoning: [your step-by-step analysis]
-Classification: [TEXT|MATH|TABLE|IMAGE]
+## Task
+Classify each numbered text chunk in the user message into ONE of the following categories:
+- TEXT: Regular academic text (paragraphs, sentences)
+- MATH: Mathematical equations, formulas, LaTeX expressions
+- TABLE: Tabular data, structured information
+- IMAGE: Image descriptions, figure captions, or image-related content
+
+## Output Format
+Reply with JSON only, one label per chunk, no explanations:
+{"labels": [{"id": 1, "type": "TEXT"}, ...]}
 """
 
-def get_classifier_prompt(text: str) -> str:
-    return CLASSIFIER_PROMPT.format(text=text)
+def get_classifier_prompt(text: str) -> Tuple[str, str]:
+    return CLASSIFIER_SYSTEM_PROMPT, f"## Input Text\n{text}"
 
+def get_batch_classifier_prompt(texts: List[str]) -> Tuple[str, str]:
+    chunks = "\n".join(
+        f"{index}. {json.dumps(text, ensure_ascii=False)}"
+        for index, text in enumerate(texts, start=1)
+    )
+    return BATCH_CLASSIFIER_SYSTEM_PROMPT, f"## Chunks\n{chunks}"
@@ -3,18 +3,13 @@ Image Caption Translation Prompt
 이미지 캡션과 설명을 번역합니다.
 """
 
-IMAGE_TRANSLATION_PROMPT = """You are an expert translator for academic paper figures and images.
+from typing import Tuple
+
+IMAGE_TRANSLATION_SYSTEM_PROMPT = """You are an expert translator for academic paper figures and images.
 
 ## Task
 Translate the image caption, description, or reference to Korean while maintaining academic precision.
 
-## Chain of Thought Process
-1. Identify if this is a figure caption, image reference, or description
-2. Parse the figure/image number and keep it in original format
-3. Understand the technical content being described
-4. Translate the description maintaining academic terminology
-5. Ensure Korean translation is clear and professional
-
 ## Guidelines
 - Keep "Figure", "Fig.", "Image" keywords in English OR translate to Korean consistently
 - Preserve figure numbers (e.g., "Figure 1" → "그림 1" or keep "Figure 1")
@@ -26,36 +21,47 @@ Translate the image caption, description, or reference to Korean while maintaini
 
 Example 1:
 Input: "Figure 1: Overview of the proposed model architecture."
-Thought: Simple caption, translate description part
 Output: 그림 1: 제안된 모델 아키텍처의 개요.
 
 Example 2:
 Input: "Fig. 2 shows the comparison of different methods."
-Thought: Figure reference in sentence, keep figure number
 Output: 그림 2는 다양한 방법들의 비교를 보여줍니다.
 
 Example 3:
 Input: "The network architecture is illustrated in Figure 3, which consists of three main components: the encoder, the bottleneck layer, and the decoder."
-Thought: Complex sentence with figure reference, translate full context
 Output: 네트워크 아키텍처는 그림 3에 설명되어 있으며, 세 가지 주요 구성 요소로 이루어져 있습니다: 인코더, 병목 계층, 그리고 디코더.
 
 Example 4:
 Input: "As shown in the x-ray image (left), the bone spur is clearly visible near the joint."
-Thought: Image description with medical terminology
 Output: X-ray 이미지(왼쪽)에서 보듯이, 관절 근처에서 골극(bone spur)이 명확하게 보입니다.
 
 Example 5:
 Input: "The bird species identification model uses wing color and beak length as key features (see Figure 4)."
-Thought: Technical description referencing a figure
 Output: 조류 종 식별 모델은 날개 색상과 부리 길이를 주요 특징으로 사용합니다 (그림 4 참조).
 
-## Input Text
+## Output Format
+Reply with the final Korean translation only, wrapped in <translation></translation> tags.
+Do not write your reasoning, notes or labels.
+"""
+
+IMAGE_TRANSLATION_LEAN_SYSTEM_PROMPT = """You are an expert translator for academic paper figures and images.
+
+## Guidelines
+- Preserve figure numbers (e.g., "Figure 1" → "그림 1")
+- Translate technical descriptions accurately
+- Use formal academic Korean
+
+Reply with the Korean translation only, wrapped in <translation></translation> tags.
+"""
+
+IMAGE_TRANSLATION_USER_PROMPT = """## Input Text
 {text}
 
 ## Your Translation
 Provide accurate Korean translation for the image-related content:
 """
 
-def get_image_translation_prompt(text: str) -> str:
-    return IMAGE_TRANSLATION_PROMPT.format(text=text)
-
+def get_image_translation_prompt(text: str, lean: bool = False) -> Tuple[str, str]:
+    if lean:
+        return IMAGE_TRANSLATION_LEAN_SYSTEM_PROMPT, text
+    return IMAGE_TRANSLATION_SYSTEM_PROMPT, IMAGE_TRANSLATION_USER_PROMPT.format(text=text)
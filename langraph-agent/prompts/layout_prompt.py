@@ -4,7 +4,12 @@ Prompt template for PDF layout segmentation.
 
 from __future__ import annotations
 
-from typing import Iterable, List, Protocol, Tuple
+from typing import Any, Dict, Iterable, List, Protocol, Sequence, Tuple
+
+# Characters kept from each end of a line in compact mode; segmentation only
+# needs to see how a line starts and ends.
+COMPACT_HEAD_CHARS = 48
+COMPACT_TAIL_CHARS = 16
 
 
 class SupportsLineProtocol(Protocol):
@@ -16,15 +21,21 @@ class SupportsLineProtocol(Protocol):
   column_hint: float
 
 
-def build_layout_prompt(page_number: int, lines: Iterable[SupportsLineProtocol]) -> str:
+def build_layout_prompt(
+  page_number: int,
+  lines: Iterable[SupportsLineProtocol],
+  compact: bool = False,
+) -> str:
   """
   Creates an instruction prompt for the LLM to segment lines into blocks.
+
+  In compact mode lines are referenced by their index in `lines`; use
+  `expand_line_refs` to map the reply back to real line ids.
   """
-  line_descriptions: List[str] = []
-  for line in lines:
-    line_descriptions.append(
-      f'{{"line_id":"{line.line_id}","text":{_escape_json_string(line.text)},"column_hint":{line.column_hint:.2f},"font_size":{line.font_size:.2f}}}'
-    )
+  if compact:
+    return _build_compact_prompt(page_number, lines)
+
+  line_descriptions: List[str] = [_describe_line(line) for line in lines]
   lines_payload = ",\n  ".join(line_descriptions)
 
   return f"""
@@ -58,6 +69,91 @@ Return ONLY the JSON.
 """.strip()
 
 
+def _build_compact_prompt(page_number: int, lines: Iterable[SupportsLineProtocol]) -> str:
+  rows = "\n".join(_describe_line_compact(index, line) for index, line in enumerate(lines))
+
+  return f"""
+You act as a PDF layout analyst. Below are the text lines from page {page_number} of an academic paper,
+one per row as `index|x|size|text`: x is the horizontal center, size the font size, and long
+texts are shortened with "~".
+
+Group the lines into logical blocks (headings, paragraphs, list items, figure/table captions, footnotes).
+Never merge lines from different columns, and keep top-to-bottom, left-to-right order.
+Valid types: HEADER, BODY, BULLET, CAPTION, TABLE, IMAGE_REF, FOOTNOTE.
+Reply with JSON only, listing line indexes or inclusive "start-end" ranges:
+{{"blocks":[{{"type":"HEADER","lines":[0]}},{{"type":"BODY","lines":["1-4"]}}]}}
+
+{rows}
+""".strip()
+
+
+def _describe_line_compact(index: int, line: SupportsLineProtocol) -> str:
+  text = " ".join(line.text.split()).replace("|", "/")
+  if len(text) > COMPACT_HEAD_CHARS + COMPACT_TAIL_CHARS + 1:
+    text = f"{text[:COMPACT_HEAD_CHARS]}~{text[-COMPACT_TAIL_CHARS:]}"
+  size = round(line.font_size * 2) / 2
+  return f"{index}|{round(line.column_hint)}|{size:g}|{text}"
+
+
+def expand_line_refs(parsed: Dict[str, Any], lines: Sequence[SupportsLineProtocol]) -> Dict[str, Any]:
+  """
+  Maps a compact-mode reply (`"lines": [0, "2-5"]`) to `line_ids`.
+
+  Blocks that already carry `line_ids` are passed through unchanged.
+  """
+  blocks: List[Dict[str, Any]] = []
+  for block in parsed.get("blocks", []) if isinstance(parsed, dict) else []:
+    if not isinstance(block, dict):
+      continue
+    if "line_ids" in block:
+      blocks.append(block)
+      continue
+
+    line_ids = [lines[index].line_id for index in _iter_refs(block.get("lines", []), len(lines))]
+    blocks.append({"type": block.get("type", "BODY"), "line_ids": line_ids})
+  return {"blocks": blocks}
+
+
+def _iter_refs(refs: Any, count: int) -> Iterable[int]:
+  """
+  Yields indexes in [0, count) from ints, digit strings and "start-end" ranges.
+
+  Ranges are clamped before they are expanded, so a reply like "0-999999999"
+  costs no more than listing every line once.
+  """
+  if not isinstance(refs, list):
+    refs = [refs]
+  for ref in refs:
+    if isinstance(ref, int):
+      if 0 <= ref < count:
+        yield ref
+    elif isinstance(ref, str):
+      start, _, end = ref.partition("-")
+      if start.strip().isdigit() and (not end or end.strip().isdigit()):
+        first = int(start)
+        last = int(end) if end else first
+        yield from range(first, min(last, count - 1) + 1)
+
+
+def estimate_tokens(text: str) -> int:
+  """Rough token count (about four characters per token for mixed English/JSON)."""
+  return len(text) // 4 + 1
+
+
+def estimate_line_tokens(line: SupportsLineProtocol, compact: bool = False) -> int:
+  """Estimated prompt tokens contributed by one line."""
+  if compact:
+    return estimate_tokens(_describe_line_compact(0, line)) + 1
+  return estimate_tokens(_describe_line(line)) + 1
+
+
+def _describe_line(line: SupportsLineProtocol) -> str:
+  return (
+    f'{{"line_id":"{line.line_id}","text":{_escape_json_string(line.text)},'
+    f'"column_hint":{line.column_hint:.2f},"font_size":{line.font_size:.2f}}}'
+  )
+
+
 def _escape_json_string(value: str) -> str:
   """Escapes characters so that the text can be safely embedded into JSON."""
   escaped = (
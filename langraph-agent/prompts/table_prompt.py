@@ -3,18 +3,13 @@ Table Translation Prompt
 표 구조를 유지하면서 번역합니다.
 """
 
-TABLE_TRANSLATION_PROMPT = """You are an expert table translator for academic papers.
+from typing import Tuple
+
+TABLE_TRANSLATION_SYSTEM_PROMPT = """You are an expert table translator for academic papers.
 
 ## Task
 Translate the table content to Korean while preserving the exact table structure and formatting.
 
-## Chain of Thought Process
-1. Identify the table structure (rows, columns, headers)
-2. Translate headers and cell contents to Korean
-3. Keep numbers, symbols, and formatting intact
-4. Preserve alignment and structure markers
-5. Verify the table structure remains valid
-
 ## Guidelines
 - Preserve table delimiters (|, -, +, etc.)
 - Keep column alignment
@@ -26,26 +21,39 @@ Translate the table content to Korean while preserving the exact table structure
 
 Example 1:
 Input: "| Method | Accuracy | F1-Score |\\n|--------|----------|----------|\\n| BERT | 92.3% | 0.91 |"
-Thought: Simple table with headers, translate method names but keep metrics
 Output: | 방법 | 정확도 | F1-점수 |\\n|--------|----------|----------|\\n| BERT | 92.3% | 0.91 |
 
 Example 2:
 Input: "| Model | Train Loss | Test Loss |\\n| CNN | 0.23 | 0.45 |"
-Thought: Table with model comparison, translate headers
 Output: | 모델 | 훈련 손실 | 테스트 손실 |\\n| CNN | 0.23 | 0.45 |
 
 Example 3:
 Input: "| Feature | Description | Value |\\n| Learning Rate | Initial LR | 0.001 |"
-Thought: Table with descriptions, translate both headers and descriptions
 Output: | 특성 | 설명 | 값 |\\n| 학습률 | 초기 LR | 0.001 |
 
-## Input Table
+## Output Format
+Reply with the final translated table only, wrapped in <translation></translation> tags.
+Do not write your reasoning, notes or labels.
+"""
+
+TABLE_TRANSLATION_LEAN_SYSTEM_PROMPT = """You are an expert table translator for academic papers.
+
+## Guidelines
+- Preserve table delimiters (|, -, +, etc.) and the same number of rows and columns
+- Translate headers and text cells only
+- Do NOT translate numbers, percentages, or mathematical symbols
+
+Reply with the translated table only, wrapped in <translation></translation> tags.
+"""
+
+TABLE_TRANSLATION_USER_PROMPT = """## Input Table
 {text}
 
 ## Your Translation
 Translate while preserving exact structure:
 """
 
-def get_table_translation_prompt(text: str) -> str:
-    return TABLE_TRANSLATION_PROMPT.format(text=text)
-
+def get_table_translation_prompt(text: str, lean: bool = False) -> Tuple[str, str]:
+    if lean:
+        return TABLE_TRANSLATION_LEAN_SYSTEM_PROMPT, text
+    return TABLE_TRANSLATION_SYSTEM_PROMPT, TABLE_TRANSLATION_USER_PROMPT.format(text=text)
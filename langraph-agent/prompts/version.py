@@ -0,0 +1,70 @@
+"""
+Prompt Version
+프롬프트 템플릿 해시. 번역 캐시 키에 포함되어 프롬프트가 바뀌면 캐시가 무효화됩니다.
+"""
+
+import hashlib
+
+from .classifier_prompt import BATCH_CLASSIFIER_SYSTEM_PROMPT, CLASSIFIER_SYSTEM_PROMPT
+from .translation_prompt import (
+    TRANSLATION_LEAN_SYSTEM_PROMPT,
+    TRANSLATION_SYSTEM_PROMPT,
+    TRANSLATION_USER_PROMPT,
+)
+from .math_prompt import (
+    MATH_TRANSLATION_LEAN_SYSTEM_PROMPT,
+    MATH_TRANSLATION_SYSTEM_PROMPT,
+    MATH_TRANSLATION_USER_PROMPT,
+    MATH_VALIDATION_SYSTEM_PROMPT,
+)
+from .table_prompt import (
+    TABLE_TRANSLATION_LEAN_SYSTEM_PROMPT,
+    TABLE_TRANSLATION_SYSTEM_PROMPT,
+    TABLE_TRANSLATION_USER_PROMPT,
+)
+from .image_prompt import (
+    IMAGE_TRANSLATION_LEAN_SYSTEM_PROMPT,
+    IMAGE_TRANSLATION_SYSTEM_PROMPT,
+    IMAGE_TRANSLATION_USER_PROMPT,
+)
+from .batch_prompt import BATCH_TRANSLATION_SYSTEM_PROMPT
+from .layout_prompt import build_layout_prompt
+
+
+def prompt_fingerprint(*templates: str) -> str:
+    """템플릿 문자열들의 짧은 SHA-256 해시"""
+    digest = hashlib.sha256()
+    for template in templates:
+        digest.update(template.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+# 레이아웃 분할 템플릿 (라인이 없는 프롬프트 = 템플릿 본문, JSON/compact 두 형식)
+LAYOUT_PROMPT_VERSION = prompt_fingerprint(
+    build_layout_prompt(0, []),
+    build_layout_prompt(0, [], compact=True),
+)
+
+# 분류기 템플릿
+CLASSIFIER_PROMPT_VERSION = prompt_fingerprint(CLASSIFIER_SYSTEM_PROMPT, BATCH_CLASSIFIER_SYSTEM_PROMPT)
+
+# 번역 그래프가 사용하는 모든 템플릿 (일반/lean 변형 포함)
+TRANSLATION_PROMPT_VERSION = prompt_fingerprint(
+    CLASSIFIER_SYSTEM_PROMPT,
+    BATCH_CLASSIFIER_SYSTEM_PROMPT,
+    TRANSLATION_SYSTEM_PROMPT,
+    TRANSLATION_LEAN_SYSTEM_PROMPT,
+    TRANSLATION_USER_PROMPT,
+    MATH_TRANSLATION_SYSTEM_PROMPT,
+    MATH_TRANSLATION_LEAN_SYSTEM_PROMPT,
+    MATH_TRANSLATION_USER_PROMPT,
+    MATH_VALIDATION_SYSTEM_PROMPT,
+    TABLE_TRANSLATION_SYSTEM_PROMPT,
+    TABLE_TRANSLATION_LEAN_SYSTEM_PROMPT,
+    TABLE_TRANSLATION_USER_PROMPT,
+    IMAGE_TRANSLATION_SYSTEM_PROMPT,
+    IMAGE_TRANSLATION_LEAN_SYSTEM_PROMPT,
+    IMAGE_TRANSLATION_USER_PROMPT,
+    BATCH_TRANSLATION_SYSTEM_PROMPT,
+)
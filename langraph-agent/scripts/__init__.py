@@ -0,0 +1,6 @@
+"""
+Scripts package
+
+각 스크립트는 langraph-agent 디렉토리에서 실행합니다:
+    python -m scripts.train_local_classifier data/classifier_log.jsonl --out data/classifier.json
+"""
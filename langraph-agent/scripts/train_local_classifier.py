@@ -0,0 +1,57 @@
+"""
+로컬 분류기 학습
+CLASSIFIER_LOG_PATH에 쌓인 LLM 분류 결과로 문자 n-gram 모델을 학습하고,
+홀드아웃 정확도와 확신 구간별 커버리지를 출력한 뒤 LOCAL_CLASSIFIER_PATH용 모델 파일을 저장합니다.
+
+사용법:
+    python -m scripts.train_local_classifier data/classifier_log.jsonl --out data/classifier.json
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from typing import List
+
+from agents.local_classifier import LOCAL_CLASSIFIER_THRESHOLD, LocalClassifier, load_samples
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Train the local content classifier from logged LLM decisions")
+    parser.add_argument("logs", nargs="+", help="Decision log JSONL files ({\"text\", \"label\"} per line)")
+    parser.add_argument("--out", required=True, help="Model JSON path (set LOCAL_CLASSIFIER_PATH to it)")
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of samples kept for evaluation")
+    parser.add_argument("--threshold", type=float, default=LOCAL_CLASSIFIER_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    samples = load_samples(args.logs)
+    random.Random(0).shuffle(samples)
+    split = int(len(samples) * (1 - args.holdout))
+    train, test = samples[:split], samples[split:]
+    print(f"{len(samples)} samples ({len(train)} train / {len(test)} test): {dict(Counter(label for _, label in samples))}")
+
+    started = time.perf_counter()
+    model = LocalClassifier.train(train, epochs=args.epochs)
+    print(f"trained in {time.perf_counter() - started:.1f}s")
+
+    if test:
+        correct = confident = confident_correct = 0
+        for text, label in test:
+            predicted, probability = model.predict(text)
+            correct += predicted == label
+            if probability >= args.threshold:
+                confident += 1
+                confident_correct += predicted == label
+        print(f"holdout accuracy: {correct / len(test):.2%}")
+        print(f"threshold {args.threshold}: answers {confident / len(test):.2%} locally"
+              f" with {confident_correct / max(confident, 1):.2%} accuracy")
+
+    # 평가 후에는 전체 데이터로 다시 학습해 저장
+    model = LocalClassifier.train(samples, epochs=args.epochs)
+    model.save(args.out)
+    print(f"saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Tests package
+
+langraph-agent 디렉토리에서 실행합니다 (네트워크/API 키 불필요):
+    python -m pytest -q
+"""
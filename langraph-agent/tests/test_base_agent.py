@@ -0,0 +1,102 @@
+"""
+BaseAgent 테스트
+<translation> 답 추출과, 출력 상한에 걸려 잘린 응답을 상한 없이 한 번만 다시 요청하는지
+호출 인자를 기록하는 fake chat model로 확인합니다.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+from agents import base
+from agents.base import BaseAgent
+from llm import LLMScheduler
+
+
+class BudgetedFakeLLM(BaseChatModel):
+    """
+    max_completion_tokens가 걸린 호출에는 finish_reason "length"로 잘린 답을,
+    상한 없는 호출에는 완전한 답을 돌려주는 fake chat model
+    """
+
+    truncate: bool = True
+    calls: List[Dict[str, Any]] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-budgeted"
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self.calls.append(kwargs)
+        if self.truncate and "max_completion_tokens" in kwargs:
+            message = AIMessage(content="<translation>잘린", response_metadata={"finish_reason": "length"})
+        else:
+            message = AIMessage(content="<translation>완성된 번역</translation>", response_metadata={"finish_reason": "stop"})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class EchoAgent(BaseAgent):
+    name = "test"
+    output_ratio = 2.0
+
+
+def make_agent(llm: BaseChatModel) -> EchoAgent:
+    return EchoAgent(llm=llm, scheduler=LLMScheduler(rpm=0, tpm=0))
+
+
+def test_extract_answer_variants():
+    agent = make_agent(BudgetedFakeLLM())
+
+    assert agent._extract_answer("<translation>\n안녕하세요\n</translation>") == "안녕하세요"
+    # 닫는 태그가 없으면(상한에 걸린 응답) 끝까지가 답입니다
+    assert agent._extract_answer("<translation> 잘린 답 ") == "잘린 답"
+    # 태그 앞의 사고 과정과 태그 뒤의 내용은 버립니다
+    assert agent._extract_answer("Thought: 용어를 확인\n<translation>번역</translation>\nNote: x") == "번역"
+    # 태그가 없으면 전체를 호출자의 정제 로직에 넘깁니다
+    assert agent._extract_answer("  Translation: 번역  ") == "Translation: 번역"
+
+
+def test_output_budget_scales_with_input(monkeypatch):
+    agent = make_agent(BudgetedFakeLLM())
+    monkeypatch.setattr(base, "MAX_OUTPUT_TOKENS_FLOOR", 100)
+
+    assert agent._output_budget("x" * 40) == 100 + int(2.0 * 11)
+    monkeypatch.setattr(base, "MAX_OUTPUT_TOKENS_FLOOR", 0)
+    assert agent._output_budget("x" * 40) is None
+
+
+def test_truncated_response_is_requested_once_more_without_the_cap():
+    llm = BudgetedFakeLLM()
+    agent = make_agent(llm)
+
+    content = agent._invoke("system", "user text")
+
+    assert content == "<translation>완성된 번역</translation>"
+    assert len(llm.calls) == 2
+    assert "max_completion_tokens" in llm.calls[0]
+    assert "max_completion_tokens" not in llm.calls[1]
+
+
+def test_async_truncated_response_is_requested_once_more_without_the_cap():
+    llm = BudgetedFakeLLM()
+    agent = make_agent(llm)
+
+    content = asyncio.run(agent._ainvoke("system", "user text"))
+
+    assert agent._extract_answer(content) == "완성된 번역"
+    assert [("max_completion_tokens" in kwargs) for kwargs in llm.calls] == [True, False]
+
+
+def test_complete_response_is_not_requested_again():
+    llm = BudgetedFakeLLM(truncate=False)
+    agent = make_agent(llm)
+
+    agent._invoke("system", "user text")
+
+    assert len(llm.calls) == 1
+    assert not agent._truncated(AIMessage(content="x", response_metadata={"finish_reason": "stop"}))
+    assert agent._truncated(AIMessage(content="x", response_metadata={"finish_reason": "length"}))
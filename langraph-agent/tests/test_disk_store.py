@@ -0,0 +1,23 @@
+"""
+DiskStore 테스트
+"""
+
+import time
+
+from cache import DiskStore
+from cache.disk import EVICTION_CHECK_INTERVAL
+
+
+def test_eviction_runs_off_the_writing_thread(tmp_path):
+    store = DiskStore(str(tmp_path / "store.db"), max_bytes=2000)
+    for index in range(EVICTION_CHECK_INTERVAL):
+        store.set("translation", f"key-{index}", "x" * 100)
+
+    # 쓰기는 스캔을 기다리지 않고 돌아오고, 제거는 백그라운드 스레드에서 끝납니다
+    deadline = time.monotonic() + 5
+    while store.total_bytes() > store.max_bytes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store.total_bytes() <= store.max_bytes
+    assert store.evictions > 0
+    # 가장 최근 항목은 남습니다
+    assert store.get("translation", f"key-{EVICTION_CHECK_INTERVAL - 1}") == "x" * 100
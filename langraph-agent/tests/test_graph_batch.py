@@ -0,0 +1,250 @@
+"""
+TranslationGraph 배치 번역 테스트
+프롬프트 종류에 따라 답하는 로컬 fake chat model로 입력 순서, 항목별 오류, 동시 실행 상한,
+묶음 응답이 빠지거나 깨졌을 때의 개별 번역 대체를 확인합니다.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from typing import Any, List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+import graph
+from cache import DiskStore
+from graph import TranslationGraph
+from llm import LLMScheduler
+from prompts.batch_prompt import BATCH_TRANSLATION_SYSTEM_PROMPT
+from prompts.classifier_prompt import BATCH_CLASSIFIER_SYSTEM_PROMPT, CLASSIFIER_SYSTEM_PROMPT
+from prompts.table_prompt import TABLE_TRANSLATION_LEAN_SYSTEM_PROMPT, TABLE_TRANSLATION_SYSTEM_PROMPT
+
+_NUMBERED = re.compile(r'^(\d+)\. (".*")$', re.MULTILINE)
+
+# 이 표시가 들어간 세그먼트는 개별 번역이 실패하고, 묶음 응답에서는 빠집니다
+FAILING = "unlucky"
+
+
+class FakeTranslatorLLM(BaseChatModel):
+    """
+    시스템 프롬프트로 호출 종류를 구분해 답하는 fake chat model
+
+    분류는 모두 TEXT, 번역은 "KO:" + 원문. pack_mode가 "drop"이면 묶음 응답에서 마지막 항목을 빼고,
+    "garbled"면 JSON이 아닌 응답을 돌려줍니다. 표 번역은 구조가 깨진 답을 돌려줍니다.
+    동시에 실행 중인 호출 수의 최댓값을 기록합니다.
+    """
+
+    pack_mode: str = "ok"
+    delay: float = 0.02
+    calls: List[str] = Field(default_factory=list)
+    active: int = 0
+    peak: int = 0
+    lock: Any = Field(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-translator"
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self._enter()
+        try:
+            time.sleep(self.delay)
+            return self._reply(messages)
+        finally:
+            self._leave()
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self._enter()
+        try:
+            await asyncio.sleep(self.delay)
+            return self._reply(messages)
+        finally:
+            self._leave()
+
+    def _enter(self) -> None:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def _leave(self) -> None:
+        with self.lock:
+            self.active -= 1
+
+    def _reply(self, messages: List[BaseMessage]) -> ChatResult:
+        system, user = messages[0].content, messages[-1].content
+        if system == BATCH_CLASSIFIER_SYSTEM_PROMPT:
+            kind = "classify_many"
+            labels = [{"id": int(index), "type": "TEXT"} for index, _ in _NUMBERED.findall(user)]
+            content = json.dumps({"labels": labels})
+        elif system == CLASSIFIER_SYSTEM_PROMPT:
+            kind = "classify"
+            content = "Classification: TEXT"
+        elif system == BATCH_TRANSLATION_SYSTEM_PROMPT:
+            kind = "pack"
+            content = self._pack_reply(user)
+        elif system in (TABLE_TRANSLATION_SYSTEM_PROMPT, TABLE_TRANSLATION_LEAN_SYSTEM_PROMPT):
+            kind = "table"
+            content = "<translation>표를 번역할 수 없습니다</translation>"
+        else:
+            kind = "single"
+            if FAILING in user:
+                self._record(kind)
+                raise ValueError("model refused")
+            content = f"<translation>KO:{user}</translation>"
+        self._record(kind)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _pack_reply(self, user: str) -> str:
+        if self.pack_mode == "garbled":
+            return "Sure! Here are the translations: 1) ..."
+        segments = [(int(index), json.loads(text)) for index, text in _NUMBERED.findall(user)]
+        if self.pack_mode == "drop":
+            segments = segments[:-1]
+        translations = [{"id": index, "text": f"KO:{text}"} for index, text in segments if FAILING not in text]
+        return json.dumps({"translations": translations}, ensure_ascii=False)
+
+    def _record(self, kind: str) -> None:
+        with self.lock:
+            self.calls.append(kind)
+
+
+def make_graph(llm: FakeTranslatorLLM) -> TranslationGraph:
+    return TranslationGraph(llm=llm, scheduler=LLMScheduler(rpm=0, tpm=0, max_retries=0))
+
+
+def sentences(count: int) -> List[dict]:
+    words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliett", "kilo", "lima"]
+    return [{"text": f"The {words[index]} sentence describes the method"} for index in range(count)]
+
+
+def test_batch_keeps_input_order_and_isolates_item_errors(monkeypatch):
+    monkeypatch.setattr(graph, "TRANSLATION_PACK_SIZE", 1)
+    items = sentences(6)
+    items[3] = {"text": f"The {FAILING} sentence describes the method"}
+    llm = FakeTranslatorLLM()
+
+    results = asyncio.run(make_graph(llm).atranslate_batch(items, concurrency=4))
+
+    assert [result["translatedText"] for result in results] == [
+        item["text"] if index == 3 else f"KO:{item['text']}" for index, item in enumerate(items)
+    ]
+    assert results[3]["error"] and "model refused" in results[3]["error"]
+    assert all(result["error"] is None for index, result in enumerate(results) if index != 3)
+    # 타입을 모르는 항목 전체를 분류 호출 한 번으로 처리합니다
+    assert llm.calls.count("classify_many") == 1
+    assert "classify" not in llm.calls
+
+
+def test_batch_respects_concurrency_cap(monkeypatch):
+    monkeypatch.setattr(graph, "TRANSLATION_PACK_SIZE", 1)
+    llm = FakeTranslatorLLM(delay=0.05)
+
+    results = asyncio.run(make_graph(llm).atranslate_batch(sentences(12), concurrency=3))
+
+    assert len(results) == 12
+    assert llm.calls.count("single") == 12
+    assert llm.peak == 3
+
+
+def test_sync_batch_keeps_order_and_cap():
+    items = sentences(8)
+    items[5] = {"text": f"The {FAILING} sentence describes the method"}
+    llm = FakeTranslatorLLM()
+
+    results = make_graph(llm).translate_batch(items, concurrency=2)
+
+    assert [result["translatedText"] for result in results[:5]] == [f"KO:{item['text']}" for item in items[:5]]
+    assert results[5]["translatedText"] == items[5]["text"] and results[5]["error"]
+    assert llm.peak <= 2
+
+
+def test_packed_batch_falls_back_to_single_calls_for_missing_entries():
+    items = sentences(5)
+    items[1] = {"text": f"The {FAILING} sentence describes the method"}
+    llm = FakeTranslatorLLM(pack_mode="drop")
+
+    results = asyncio.run(make_graph(llm).atranslate_batch(items, concurrency=4))
+
+    assert [result["translatedText"] for result in results] == [
+        item["text"] if index == 1 else f"KO:{item['text']}" for index, item in enumerate(items)
+    ]
+    assert results[1]["error"]
+    assert llm.calls.count("pack") == 1
+    # 묶음에서 빠진 항목(마지막)과 실패 항목만 개별로 다시 번역합니다
+    assert llm.calls.count("single") == 2
+    assert "classify" not in llm.calls
+
+
+def test_garbled_pack_response_falls_back_for_every_item():
+    items = sentences(4)
+    llm = FakeTranslatorLLM(pack_mode="garbled")
+
+    results = asyncio.run(make_graph(llm).atranslate_batch(items, concurrency=4))
+
+    assert [result["translatedText"] for result in results] == [f"KO:{item['text']}" for item in items]
+    assert llm.calls.count("pack") == 1
+    assert llm.calls.count("single") == 4
+    # 개별 번역도 배치 분류 결과로 경로가 정해져 분류 노드를 다시 거치지 않습니다
+    assert "classify" not in llm.calls
+
+
+def test_batch_results_are_cached_under_the_plain_request_key():
+    items = sentences(3)
+    llm = FakeTranslatorLLM()
+    translation_graph = make_graph(llm)
+
+    asyncio.run(translation_graph.atranslate_batch(items))
+    calls = len(llm.calls)
+    result = asyncio.run(translation_graph.atranslate(items[0]["text"]))
+
+    assert result["translatedText"] == f"KO:{items[0]['text']}"
+    assert len(llm.calls) == calls
+
+
+def test_batch_shares_results_through_the_disk_store(tmp_path):
+    store = DiskStore(str(tmp_path / "store.db"))
+    items = sentences(3)
+    asyncio.run(TranslationGraph(llm=FakeTranslatorLLM(), store=store).atranslate_batch(items))
+
+    # 다른 워커(새 그래프, 빈 메모리 캐시)는 디스크 캐시에서 결과를 읽습니다
+    llm = FakeTranslatorLLM()
+    results = asyncio.run(TranslationGraph(llm=llm, store=store).atranslate_batch(items))
+
+    assert [result["translatedText"] for result in results] == [f"KO:{item['text']}" for item in items]
+    assert llm.calls == []
+
+
+def test_table_fallback_is_reported_and_not_cached():
+    table = "| a | b |\n|---|---|\n| 1 | 2 |\n| 3 | 4 |"
+    llm = FakeTranslatorLLM()
+    translation_graph = make_graph(llm)
+
+    first = asyncio.run(translation_graph.atranslate(table, block_type="TABLE"))
+    second = asyncio.run(translation_graph.atranslate(table, block_type="TABLE"))
+
+    # 구조 검증에 실패하면 원문을 error와 함께 돌려주고, 다음 요청에서 다시 번역합니다
+    assert first["translatedText"] == table
+    assert "Table structure validation failed" in first["error"]
+    assert second["error"]
+    assert llm.calls.count("table") == 2
+
+
+def test_text_mapped_blocks_with_display_math_go_to_the_math_translator():
+    body = "The energy is given by\n\\[ E = mc^2 \\]"
+    llm = FakeTranslatorLLM()
+    translation_graph = make_graph(llm)
+
+    single = asyncio.run(translation_graph.atranslate(body, block_type="BODY"))
+    batch = asyncio.run(make_graph(FakeTranslatorLLM()).atranslate_batch([{"text": body, "blockType": "BODY"}]))
+    plain = asyncio.run(translation_graph.atranslate("The method is simple", block_type="BODY"))
+
+    # 휴리스틱만으로 경로를 바꾸므로 분류 호출은 없습니다
+    assert single["contentType"] == "MATH"
+    assert batch[0]["contentType"] == "MATH"
+    assert plain["contentType"] == "TEXT"
+    assert not any(kind.startswith("classify") for kind in llm.calls)
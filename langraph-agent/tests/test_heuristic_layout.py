@@ -0,0 +1,70 @@
+"""
+기하 기반 레이아웃 분할 테스트
+"""
+
+from types import SimpleNamespace
+
+from processors.heuristic_layout import LAYOUT_HEURISTIC_THRESHOLD, segment_page_heuristically
+
+SENTENCE = "The proposed encoder maps every token to a contextual representation."
+
+
+def make_line(line_id: str, text: str, x0: float, y: float, x1: float, size: float = 10.0):
+    return SimpleNamespace(
+        line_id=line_id,
+        text=text,
+        bbox=(x0, y, x1, y + size),
+        font_size=size,
+        column_hint=(x0 + x1) / 2,
+    )
+
+
+def block_summary(parsed):
+    return [(block["type"], block["line_ids"]) for block in parsed["blocks"]]
+
+
+def test_single_column_page_splits_on_headings_gaps_and_captions():
+    lines = [make_line("h", "1 Introduction", 50, 50, 550, size=14)]
+    lines += [make_line(f"a{index}", SENTENCE, 50, 80 + 12 * index, 550) for index in range(5)]
+    # 문단 사이 빈 줄 (줄 간격의 1.6배 초과)
+    lines += [make_line(f"b{index}", SENTENCE, 50, 154 + 12 * index, 550) for index in range(4)]
+    lines.append(make_line("c", "Figure 1: Overview of the model.", 50, 230, 550))
+
+    parsed, confidence = segment_page_heuristically(lines)
+
+    assert block_summary(parsed) == [
+        ("HEADER", ["h"]),
+        ("BODY", [f"a{index}" for index in range(5)]),
+        ("BODY", [f"b{index}" for index in range(4)]),
+        ("CAPTION", ["c"]),
+    ]
+    assert confidence >= LAYOUT_HEURISTIC_THRESHOLD
+
+
+def test_two_column_page_reads_left_column_before_right():
+    lines = [make_line("title", "Attention Is All You Need", 50, 50, 550, size=16)]
+    # 입력 순서를 섞어도 읽기 순서(위 → 왼쪽 단 → 오른쪽 단)로 정렬됩니다
+    for index in range(4):
+        lines.append(make_line(f"r{index}", SENTENCE, 310, 100 + 12 * index, 550))
+        lines.append(make_line(f"l{index}", SENTENCE, 50, 100 + 12 * index, 290))
+
+    parsed, confidence = segment_page_heuristically(lines)
+
+    assert block_summary(parsed) == [
+        ("HEADER", ["title"]),
+        ("BODY", [f"l{index}" for index in range(4)]),
+        ("BODY", [f"r{index}" for index in range(4)]),
+    ]
+    assert confidence >= LAYOUT_HEURISTIC_THRESHOLD
+
+
+def test_table_like_page_is_left_to_the_llm():
+    lines = [make_line(f"t{index}", "0.91 0.87 12.5", 50, 100 + 12 * index, 300) for index in range(6)]
+
+    _, confidence = segment_page_heuristically(lines)
+
+    assert confidence < LAYOUT_HEURISTIC_THRESHOLD
+
+
+def test_empty_page():
+    assert segment_page_heuristically([]) == ({"blocks": []}, 1.0)
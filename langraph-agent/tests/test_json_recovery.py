@@ -0,0 +1,57 @@
+"""
+레이아웃 응답 파싱 테스트
+"""
+
+import json
+
+from processors.json_recovery import parse_layout_response
+
+BLOCKS = {"blocks": [
+    {"type": "HEADER", "line_ids": ["p1-l0"]},
+    {"type": "BODY", "line_ids": ["p1-l1", "p1-l2"]},
+]}
+
+
+def test_plain_json():
+    assert parse_layout_response(json.dumps(BLOCKS)) == (BLOCKS, "ok")
+
+
+def test_fenced_json():
+    raw = f"Here is the layout:\n```json\n{json.dumps(BLOCKS)}\n```"
+    assert parse_layout_response(raw) == (BLOCKS, "fenced")
+
+
+def test_unclosed_fence_is_still_parsed():
+    raw = f"```json\n{json.dumps(BLOCKS)}"
+    assert parse_layout_response(raw) == (BLOCKS, "fenced")
+
+
+def test_json_surrounded_by_prose():
+    raw = f"Sure. {json.dumps(BLOCKS)} Let me know if you need more."
+    assert parse_layout_response(raw) == (BLOCKS, "extracted")
+
+
+def test_truncated_reply_keeps_complete_blocks():
+    full = json.dumps({"blocks": BLOCKS["blocks"] + [{"type": "BODY", "line_ids": ["p1-l3", "p1-l4"]}]})
+    # 출력 상한에 걸려 세 번째 블록 중간에서 끊긴 응답
+    raw = full[:full.index('"p1-l4"')]
+
+    parsed, outcome = parse_layout_response(raw)
+
+    assert outcome == "salvaged"
+    assert parsed == BLOCKS
+
+
+def test_braces_and_quotes_inside_strings_do_not_confuse_salvage():
+    raw = '{"blocks": [{"type": "BODY", "line_ids": ["a"], "note": "x } \\" {"}, {"type": "BODY", "line_ids": ["b'
+
+    parsed, outcome = parse_layout_response(raw)
+
+    assert outcome == "salvaged"
+    assert parsed == {"blocks": [{"type": "BODY", "line_ids": ["a"], "note": 'x } " {'}]}
+
+
+def test_unusable_replies_fail():
+    assert parse_layout_response("") == ({}, "failed")
+    assert parse_layout_response("I cannot segment this page.") == ({}, "failed")
+    assert parse_layout_response('["not", "an", "object"]') == ({}, "failed")
@@ -0,0 +1,35 @@
+"""
+latex_repair 로컬 복구 테스트
+"""
+
+from agents.latex_repair import repair_latex, restore_source_math
+from agents.latex_scanner import scan_latex
+
+
+def test_restores_modified_math_from_source():
+    repaired = repair_latex("손실은 $L = \\sum_{i} (y_i$ 입니다", "The loss is $L = \\sum_{i} (y_i)^2$")
+    assert repaired == "손실은 $L = \\sum_{i} (y_i)^2$ 입니다"
+    assert scan_latex(repaired).balanced
+
+
+def test_unmatched_delimiter_kinds_are_not_substituted():
+    # 번역에서 $x의 닫는 $가 빠져 "$x는 입력이고 $"가 하나의 구간으로 잡힙니다
+    source = "where $x$ is the input and $$y=f(x)$$ is the output"
+    translated = "여기서 $x는 입력이고 $$y=f(x)$$는 출력입니다"
+    assert restore_source_math(translated, source) is None
+    # 번역문을 지우는 대신 구간 재요청으로 넘어갑니다
+    assert repair_latex(translated, source) is None
+
+
+def test_truncated_environment_does_not_duplicate_prefix():
+    source = "\\begin{align}x\\begin{cases}y\\end{cases}\\end{align}"
+    translated = "\\begin{align}x\\begin{cases}y\\end{cases}"
+    assert restore_source_math(translated, source) is None
+    assert repair_latex(translated, source) is None
+
+
+def test_span_count_mismatch_falls_back_to_closing_delimiters():
+    repaired = repair_latex("값은 $a + b 입니다", "The value is $a + b$ and $c$")
+    assert repaired is not None
+    assert scan_latex(repaired).balanced
+    assert "입니다" in repaired
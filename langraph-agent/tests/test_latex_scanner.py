@@ -0,0 +1,97 @@
+"""
+latex_scanner 테스트
+scan_latex의 균형/환경 검사와, looks_like_math·has_markdown_table이 대체한
+구 정규식과 같은 판정을 내리는지 확인합니다.
+"""
+
+import re
+
+import pytest
+
+from agents.latex_scanner import has_markdown_table, looks_like_math, scan_latex
+
+# user-019 이전 ContentClassifier의 정규식
+OLD_MATH_PATTERN = re.compile(r'\$\$?.*\$\$?|\\\[|\\\]|\\begin\{equation\}|\\begin\{align\}')
+OLD_TABLE_PATTERN = re.compile(r'\|.*\|.*\n\|[-:| ]+\|')
+
+SAMPLES = [
+    "Plain prose without any math at all.",
+    "The cost is $5 and the tax is $2 per item.",
+    "Price: $5\nTax: $2",
+    "Inline $x$ on one line",
+    "$$E = mc^2$$",
+    "A display \\[ x^2 \\] in prose",
+    "Only an opening \\[ marker",
+    "Only a closing \\] marker",
+    "\\begin{equation}\na + b\n\\end{equation}",
+    "\\begin{align}\na &= b\n\\end{align}",
+    "Escaped \\$ dollar and $ one more",
+    "A line with \\$5 and \\$6",
+    "\\textbf{bold} and \\emph{text}",
+    "| a | b |\n|---|---|\n| 1 | 2 |",
+    "| a | b |\n|:--|--:|",
+    "a | b | c\n| --- |",
+    "| a | b |\n\n|---|---|",
+    "| only | one | row |",
+    "pipes | here\n|---|",
+    "x || y\n|-|",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_math_and_table_checks_match_the_old_regexes(text):
+    assert looks_like_math(text) == bool(OLD_MATH_PATTERN.search(text))
+    assert has_markdown_table(text) == bool(OLD_TABLE_PATTERN.search(text))
+
+
+def test_starred_environments_now_count_as_math():
+    # 구 정규식은 \begin{equation}과 \begin{align}만 보았습니다 - equation*/align*도 수식입니다
+    for name in ("equation*", "align*"):
+        text = f"\\begin{{{name}}}\nx = 1\n\\end{{{name}}}"
+        assert OLD_MATH_PATTERN.search(text) is None
+        assert looks_like_math(text)
+        assert scan_latex(text).looks_like_math
+    assert not looks_like_math("\\begin{itemize}\n\\item one\n\\end{itemize}")
+
+
+def test_balanced_delimiters():
+    assert scan_latex("$a$ and $$b$$ and \\[c\\] and \\(d\\) and {e}").balanced
+    assert not scan_latex("$a").balanced
+    assert not scan_latex("$$a$").balanced
+    assert not scan_latex("\\[ x").balanced
+    assert not scan_latex("\\( x \\) \\)").balanced
+
+
+def test_escaped_characters_are_not_delimiters():
+    scan = scan_latex("costs \\$5, set \\{a\\} and $x$")
+    assert scan.balanced
+    assert scan.dollars == [len("costs \\$5, set \\{a\\} and ")] + [len("costs \\$5, set \\{a\\} and $x")]
+    # \$는 균형 계산에서는 빠지지만 한 줄의 $ 개수에는 들어갑니다 (구 정규식과 같음)
+    assert scan_latex("\\$5 and \\$6").max_line_dollars == 2
+
+
+def test_unmatched_brace_positions():
+    scan = scan_latex("} a { b")
+    assert scan.unmatched_braces == [0, 4]
+    assert not scan.balanced
+
+
+def test_nested_environments_validate():
+    text = "\\begin{equation}\n\\begin{aligned}\na &= b\n\\end{aligned}\n\\end{equation}"
+    scan = scan_latex(text)
+    assert scan.balanced
+    assert scan.unmatched_environments == []
+
+
+def test_mismatched_environments_are_reported_with_positions():
+    crossed = "\\begin{a}\\begin{b}\\end{a}\\end{b}"
+    scan = scan_latex(crossed)
+    assert not scan.balanced
+    assert ("end", "a", crossed.index("\\end{a}")) in scan.unmatched_environments
+
+    unclosed = scan_latex("x \\begin{align}\na = b")
+    assert unclosed.unmatched_environments == [("begin", "align", 2)]
+
+    stray = scan_latex("a = b \\end{cases}")
+    assert stray.unmatched_environments == [("end", "cases", 6)]
@@ -0,0 +1,49 @@
+"""
+LayoutCache / LRUCache 크기 제한 테스트
+"""
+
+from cache import LRUCache
+from processors.layout_cache import LayoutCache
+
+
+def test_lru_cache_evicts_by_total_bytes():
+    cache = LRUCache(maxsize=100, max_bytes=10, sizeof=len)
+    cache.set("a", "xxxx")
+    cache.set("b", "yyyy")
+    cache.set("c", "zzzz")
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "zzzz"
+    assert cache.stats()["bytes"] == 8
+
+
+def test_lru_cache_skips_values_larger_than_the_bound():
+    cache = LRUCache(maxsize=100, max_bytes=10, sizeof=len)
+    cache.set("small", "xx")
+    cache.set("small", "x" * 11)
+
+    # 큰 값으로 덮어쓰면 이전 값도 남기지 않습니다
+    assert cache.get("small") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_large_line_lists_are_not_kept_in_memory():
+    cache = LayoutCache(max_bytes=1000)
+    lines = [{"line_id": f"p1-l{index}", "text": "word " * 20} for index in range(50)]
+    cache.put_lines("doc", lines)
+    cache.put_page("doc", "model", 1, {"parsed": {"blocks": []}})
+
+    assert cache.get_lines("doc") is None
+    assert cache.get_page("doc", "model", 1) == {"parsed": {"blocks": []}}
+
+
+def test_page_key_depends_on_heuristic_threshold():
+    payload = {"parsed": {"blocks": []}, "source": "heuristic"}
+    strict = LayoutCache(heuristic_threshold=0.95)
+    strict.put_page("doc", "model", 1, payload)
+
+    relaxed = LayoutCache(heuristic_threshold=0.5)
+    relaxed.memory = strict.memory
+
+    assert strict.get_page("doc", "model", 1) == payload
+    assert relaxed.get_page("doc", "model", 1) is None
@@ -0,0 +1,33 @@
+"""
+compact 레이아웃 응답의 라인 참조 확장 테스트
+"""
+
+from types import SimpleNamespace
+
+from prompts.layout_prompt import expand_line_refs
+
+
+def make_lines(count: int):
+    return [SimpleNamespace(line_id=f"p1-l{index}") for index in range(count)]
+
+
+def test_ranges_are_clamped_to_the_page_lines():
+    parsed = {"blocks": [{"type": "BODY", "lines": ["0-999999999"]}, {"type": "HEADER", "lines": ["3-999999999999"]}]}
+
+    expanded = expand_line_refs(parsed, make_lines(5))
+
+    assert expanded["blocks"][0]["line_ids"] == [f"p1-l{index}" for index in range(5)]
+    assert expanded["blocks"][1]["line_ids"] == ["p1-l3", "p1-l4"]
+
+
+def test_out_of_range_and_malformed_refs_are_dropped():
+    parsed = {"blocks": [{"type": "BODY", "lines": [-1, 1, "7", "9-12", "x-2", "2"]}]}
+
+    expanded = expand_line_refs(parsed, make_lines(3))
+
+    assert expanded["blocks"][0]["line_ids"] == ["p1-l1", "p1-l2"]
+
+
+def test_blocks_with_line_ids_pass_through():
+    block = {"type": "CAPTION", "line_ids": ["p1-l0"]}
+    assert expand_line_refs({"blocks": [block]}, make_lines(1)) == {"blocks": [block]}
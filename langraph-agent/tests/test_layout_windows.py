@@ -0,0 +1,78 @@
+"""
+페이지 윈도우 분할/이어 붙이기 테스트
+"""
+
+from types import SimpleNamespace
+
+from processors.layout_windows import LayoutWindow, plan_windows, stitch_windows
+
+
+def make_lines(count: int, text: str = "a line of body text in a dense two column paper"):
+    return [
+        SimpleNamespace(line_id=f"p1-l{index}", text=text, column_hint=0.0, font_size=10.0)
+        for index in range(count)
+    ]
+
+
+def ids(*indices: int):
+    return [f"p1-l{index}" for index in indices]
+
+
+def test_page_within_budget_is_one_window():
+    lines = make_lines(5)
+    assert plan_windows(lines, token_budget=100_000, overlap=3) == [LayoutWindow(0, 5, 0, 5)]
+
+
+def test_windows_cover_every_line_once_with_overlap():
+    lines = make_lines(200)
+    windows = plan_windows(lines, token_budget=1500, overlap=3)
+
+    assert len(windows) > 1
+    # 핵심 구간은 빈틈없이 이어지고, 겹침은 핵심 구간 양쪽에만 붙습니다
+    assert windows[0].core_start == 0 and windows[-1].core_end == len(lines)
+    for previous, current in zip(windows, windows[1:]):
+        assert previous.core_end == current.core_start
+        assert current.start == current.core_start - 3
+        assert previous.end == previous.core_end + 3
+
+
+def test_block_crossing_the_cut_is_joined():
+    lines = make_lines(10)
+    windows = [LayoutWindow(0, 7, 0, 5), LayoutWindow(2, 10, 5, 10)]
+    parsed = [
+        {"blocks": [{"type": "HEADER", "line_ids": ids(0)}, {"type": "BODY", "line_ids": ids(1, 2, 3, 4, 5, 6)}]},
+        {"blocks": [{"type": "BODY", "line_ids": ids(3, 4, 5, 6, 7)}, {"type": "BODY", "line_ids": ids(8, 9)}]},
+    ]
+
+    stitched = stitch_windows(lines, windows, parsed)
+
+    assert stitched == {"blocks": [
+        {"type": "HEADER", "line_ids": ids(0)},
+        {"type": "BODY", "line_ids": ids(1, 2, 3, 4, 5, 6, 7)},
+        {"type": "BODY", "line_ids": ids(8, 9)},
+    ]}
+
+
+def test_blocks_ending_at_the_cut_stay_separate():
+    lines = make_lines(10)
+    windows = [LayoutWindow(0, 7, 0, 5), LayoutWindow(2, 10, 5, 10)]
+    parsed = [
+        {"blocks": [{"type": "BODY", "line_ids": ids(0, 1, 2, 3, 4)}, {"type": "BODY", "line_ids": ids(5, 6)}]},
+        {"blocks": [{"type": "BODY", "line_ids": ids(2, 3, 4)}, {"type": "HEADER", "line_ids": ids(5)}, {"type": "BODY", "line_ids": ids(6, 7, 8, 9)}]},
+    ]
+
+    stitched = stitch_windows(lines, windows, parsed)
+
+    assert [block["line_ids"] for block in stitched["blocks"]] == [ids(0, 1, 2, 3, 4), ids(5), ids(6, 7, 8, 9)]
+    assert stitched["blocks"][1]["type"] == "HEADER"
+
+
+def test_failed_window_drops_only_its_core_lines():
+    lines = make_lines(10)
+    windows = [LayoutWindow(0, 7, 0, 5), LayoutWindow(2, 10, 5, 10)]
+    # 두 번째 윈도우는 시간 초과 등으로 빈 결과 - 겹침 구간 라인을 첫 윈도우가 가져가지 않습니다
+    parsed = [{"blocks": [{"type": "BODY", "line_ids": ids(0, 1, 2, 3, 4, 5, 6)}]}, {}]
+
+    stitched = stitch_windows(lines, windows, parsed)
+
+    assert stitched == {"blocks": [{"type": "BODY", "line_ids": ids(0, 1, 2, 3, 4)}]}
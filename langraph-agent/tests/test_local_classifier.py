@@ -0,0 +1,101 @@
+"""
+로컬 분류기 테스트
+학습 → 예측 → 저장/로드, 확신이 낮을 때 LLM으로 넘기는 경로, decision log 기록을 확인합니다.
+"""
+
+import json
+from typing import List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from agents.content_classifier import ContentClassifier
+from agents.local_classifier import DecisionLog, LocalClassifier, load_samples
+from llm import LLMScheduler
+
+SAMPLES = [
+    ("The model is trained on a large corpus of text", "TEXT"),
+    ("We describe the experimental setup in detail", "TEXT"),
+    ("Our results improve on the previous baseline", "TEXT"),
+    ("The authors thank the reviewers for their comments", "TEXT"),
+    ("Schematic of the proposed pipeline architecture", "IMAGE"),
+    ("Overview diagram of the proposed system pipeline", "IMAGE"),
+    ("Photograph of the experimental apparatus setup", "IMAGE"),
+    ("Visualization of the learned attention maps", "IMAGE"),
+]
+
+
+class LabelingLLM(BaseChatModel):
+    """항상 IMAGE로 분류하고 호출 수를 세는 fake chat model"""
+
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-labeling"
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self.calls += 1
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="Classification: IMAGE"))])
+
+
+def make_classifier(local: LocalClassifier, threshold: float, log: DecisionLog | None = None) -> ContentClassifier:
+    classifier = ContentClassifier(
+        llm=LabelingLLM(), local=local, decision_log=log, scheduler=LLMScheduler(rpm=0, tpm=0)
+    )
+    classifier.local_threshold = threshold
+    return classifier
+
+
+def test_train_predict_and_save_load_round_trip(tmp_path):
+    model = LocalClassifier.train(SAMPLES, epochs=20)
+
+    for text, label in SAMPLES:
+        assert model.predict(text)[0] == label
+
+    path = str(tmp_path / "models" / "classifier.json")
+    model.save(path)
+    loaded = LocalClassifier.load(path)
+
+    assert loaded.ngram_range == model.ngram_range and loaded.dim == model.dim
+    for text, _ in SAMPLES + [("An unrelated sentence about the weather", "TEXT")]:
+        label, probability = model.predict(text)
+        loaded_label, loaded_probability = loaded.predict(text)
+        assert loaded_label == label
+        # 가중치는 소수점 6자리로 저장됩니다
+        assert abs(loaded_probability - probability) < 1e-4
+
+
+def test_confident_local_prediction_skips_the_llm():
+    classifier = make_classifier(LocalClassifier.train(SAMPLES, epochs=20), threshold=0.0)
+
+    assert classifier.classify("We describe the experimental setup in detail") == "TEXT"
+    assert classifier.llm.calls == 0
+
+
+def test_low_confidence_defers_to_the_llm_and_logs_the_decision(tmp_path):
+    log = DecisionLog(str(tmp_path / "logs" / "decisions.jsonl"))
+    # 확률은 1을 넘지 않으므로 로컬 결과는 항상 확신 부족입니다
+    classifier = make_classifier(LocalClassifier.train(SAMPLES, epochs=20), threshold=1.01, log=log)
+    text = "We describe the experimental setup in detail"
+
+    assert classifier._classify_offline(text) is None
+    assert classifier.classify(text) == "IMAGE"
+    assert classifier.llm.calls == 1
+
+    with open(log.path, encoding="utf-8") as handle:
+        records = [json.loads(line) for line in handle]
+    assert records == [{"text": text, "label": "IMAGE"}]
+
+
+def test_decision_log_appends_and_last_label_wins(tmp_path):
+    log = DecisionLog(str(tmp_path / "decisions.jsonl"))
+
+    log.record("수식 $x$", "MATH")
+    log.record("plain text", "TEXT")
+    log.record("수식 $x$", "TEXT")
+
+    with open(log.path, encoding="utf-8") as handle:
+        assert len(handle.readlines()) == 3
+    assert sorted(load_samples([log.path])) == [("plain text", "TEXT"), ("수식 $x$", "TEXT")]
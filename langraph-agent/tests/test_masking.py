@@ -0,0 +1,47 @@
+"""
+자리표시자 마스킹 테스트
+"""
+
+from agents.masking import is_inline_math_prose, mask_protected, unmask
+
+
+def test_masks_urls_math_citations_and_numbers():
+    text = "Our model with $\\alpha = 0.5$ reaches 92.3% accuracy [3, 4] (code: https://github.com/org/repo)."
+
+    masked, spans = mask_protected(text)
+
+    assert spans == ["$\\alpha = 0.5$", "92.3%", "[3, 4]", "https://github.com/org/repo"]
+    assert masked == "Our model with ⟦0⟧ reaches ⟦1⟧ accuracy ⟦2⟧ (code: ⟦3⟧)."
+
+
+def test_roundtrip_allows_reordered_placeholders():
+    text = "See [12] and \\(x_i\\) for details."
+    masked, spans = mask_protected(text)
+
+    # 한국어 어순으로 자리표시자 순서가 바뀌어도 복원됩니다
+    assert unmask("자세한 내용은 ⟦1⟧와 ⟦0⟧를 참조하십시오.", spans) == "자세한 내용은 \\(x_i\\)와 [12]를 참조하십시오."
+    assert masked == "See ⟦0⟧ and ⟦1⟧ for details."
+
+
+def test_unmask_rejects_missing_or_duplicated_placeholders():
+    _, spans = mask_protected("Values 1.5 and 2.5 differ.")
+
+    assert unmask("값 ⟦0⟧이 다릅니다.", spans) is None
+    assert unmask("값 ⟦0⟧, ⟦0⟧, ⟦1⟧", spans) is None
+    assert unmask("값 ⟦0⟧과 ⟦1⟧은 다릅니다.", spans) == "값 1.5과 2.5은 다릅니다."
+
+
+def test_leaves_display_math_integers_and_existing_placeholders():
+    assert mask_protected("We train for 100 epochs on 8 GPUs.") == ("We train for 100 epochs on 8 GPUs.", [])
+    assert mask_protected("Equation $$E = mc^2$$ holds.")[1] == []
+    assert mask_protected("Already masked ⟦0⟧ text with 0.5") == ("Already masked ⟦0⟧ text with 0.5", [])
+
+
+def test_unmask_without_spans_returns_translation():
+    assert unmask("번역문", []) == "번역문"
+
+
+def test_inline_math_prose_detection():
+    assert is_inline_math_prose("Let $x$ denote the input sequence and $y$ the predicted output labels.")
+    assert not is_inline_math_prose("$$\\sum_i x_i$$ where $x$ is the input")
+    assert not is_inline_math_prose("$a + b = c$ and $d$")
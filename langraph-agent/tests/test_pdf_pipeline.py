@@ -0,0 +1,154 @@
+"""
+pdf_pipeline 레이아웃 호출 테스트
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from llm import LLMScheduler
+from processors import pdf_pipeline
+from processors.layout_cache import LayoutCache
+from processors.pdf_pipeline import RawLine, _request_segmentation, asegment_layout_with_llm
+
+
+class NeverCalledLLM:
+    async def ainvoke(self, messages):
+        raise AssertionError("the call should still be queued")
+
+
+class SlowPageLLM:
+    """slow_page의 라인이 들어간 프롬프트에는 답하지 않고, 나머지는 모든 라인을 BODY 하나로 묶습니다"""
+
+    def __init__(self, lines, slow_page: int):
+        self.lines = lines
+        self.slow_page = slow_page
+
+    async def ainvoke(self, messages):
+        prompt = messages[0].content
+        line_ids = [line.line_id for line in self.lines if f'"{line.line_id}"' in prompt]
+        if any(line_id.startswith(f"p{self.slow_page}-") for line_id in line_ids):
+            await asyncio.sleep(30)
+        return SimpleNamespace(content=json.dumps({"blocks": [{"type": "BODY", "line_ids": line_ids}]}))
+
+
+def table_lines(page: int):
+    # 숫자 위주의 짧은 줄 - 휴리스틱 신뢰도가 낮아 LLM으로 갑니다
+    return [
+        RawLine(f"p{page}-l{index}", page, "0.91 0.87 12.5", (50, 100 + 12 * index, 300, 110 + 12 * index), 10.0, None, 175.0)
+        for index in range(4)
+    ]
+
+
+def test_page_deadline_covers_time_queued_in_the_scheduler(monkeypatch):
+    # 429 뒤의 전역 대기가 페이지 제한 시간보다 길어도 페이지는 제한 시간에 끝납니다
+    scheduler = LLMScheduler(rpm=0, tpm=0)
+    scheduler.paused_until = time.monotonic() + 30
+    monkeypatch.setattr(pdf_pipeline, "get_scheduler", lambda: scheduler)
+    lines = [RawLine("p1-l1", 1, "Introduction", (0, 0, 100, 12), 12.0, None, 0.0)]
+
+    started = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(_request_segmentation(NeverCalledLLM(), 1, lines, timeout=0.2))
+    assert time.monotonic() - started < 2
+    # 취소된 호출은 대기 수를 남기지 않습니다
+    assert scheduler.stats()["waiting_background"] == 0
+
+
+def test_timed_out_page_is_reported_without_blocking_the_others(monkeypatch):
+    monkeypatch.setattr(pdf_pipeline, "get_scheduler", lambda: LLMScheduler(rpm=0, tpm=0))
+    cache = LayoutCache()
+    monkeypatch.setattr(pdf_pipeline, "get_layout_cache", lambda: cache)
+    lines = table_lines(1) + table_lines(2) + table_lines(3)
+
+    started = time.monotonic()
+    results = asyncio.run(asegment_layout_with_llm(
+        lines, llm=SlowPageLLM(lines, slow_page=2), page_timeout=0.3, doc_hash="doc",
+    ))
+
+    assert time.monotonic() - started < 5
+    assert list(results) == [1, 2, 3]
+    assert "timed out" in results[2]["error"]
+    assert results[2]["parsed"] == {}
+    for page in (1, 3):
+        assert "error" not in results[page] and results[page]["source"] == "llm"
+        assert results[page]["parsed"]["blocks"][0]["line_ids"] == [f"p{page}-l{index}" for index in range(4)]
+    # 시간 초과된 페이지는 캐시하지 않아 다음 요청에서 다시 시도합니다
+    assert cache.get_page("doc", "gpt-5-mini", 2) is None
+    assert cache.get_page("doc", "gpt-5-mini", 1) is not None
+
+
+class RefusingLLM:
+    """레이아웃 요청마다 JSON이 아닌 거절 문장으로 답합니다"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return SimpleNamespace(content="Sorry, I can't do that.")
+
+
+def test_unparseable_page_is_reported_and_retried_on_the_next_upload(monkeypatch):
+    monkeypatch.setattr(pdf_pipeline, "get_scheduler", lambda: LLMScheduler(rpm=0, tpm=0))
+    cache = LayoutCache()
+    monkeypatch.setattr(pdf_pipeline, "get_layout_cache", lambda: cache)
+    lines = table_lines(1)
+    llm = RefusingLLM()
+
+    first = asyncio.run(asegment_layout_with_llm(lines, llm=llm, doc_hash="doc"))
+    calls = llm.calls
+    asyncio.run(asegment_layout_with_llm(lines, llm=llm, doc_hash="doc"))
+
+    # 복구 재요청까지 실패한 페이지는 error로 알리고 캐시하지 않습니다
+    assert calls == 2
+    assert first[1]["error"] == "Layout reply could not be parsed"
+    assert cache.get_page("doc", "gpt-5-mini", 1) is None
+    assert llm.calls == 2 * calls
+
+
+def test_partially_covered_page_is_marked_incomplete_and_not_cached(monkeypatch):
+    monkeypatch.setattr(pdf_pipeline, "get_scheduler", lambda: LLMScheduler(rpm=0, tpm=0))
+    cache = LayoutCache()
+    monkeypatch.setattr(pdf_pipeline, "get_layout_cache", lambda: cache)
+    lines = table_lines(1)
+
+    class FirstLineOnlyLLM:
+        async def ainvoke(self, messages):
+            return SimpleNamespace(content=json.dumps({"blocks": [{"type": "BODY", "line_ids": ["p1-l0"]}]}))
+
+    results = asyncio.run(asegment_layout_with_llm(lines, llm=FirstLineOnlyLLM(), doc_hash="doc"))
+
+    assert results[1]["incomplete"] == 3
+    assert "error" not in results[1]
+    assert cache.get_page("doc", "gpt-5-mini", 1) is None
+
+
+class TruncatedThenSlowLLM:
+    """첫 요청에는 잘린 JSON으로 늦게 답하고, 복구 재요청에는 답하지 않습니다"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        if self.calls > 1:
+            await asyncio.sleep(30)
+        await asyncio.sleep(0.6)
+        return SimpleNamespace(content='{"blocks": [{"type": "BODY", "line_ids": ["p1-l0"]}, {"type": "BO')
+
+
+def test_recovery_request_only_gets_the_time_left_on_the_page_deadline(monkeypatch):
+    monkeypatch.setattr(pdf_pipeline, "get_scheduler", lambda: LLMScheduler(rpm=0, tpm=0))
+    llm = TruncatedThenSlowLLM()
+
+    started = time.monotonic()
+    _, parsed = asyncio.run(_request_segmentation(llm, 1, table_lines(1), timeout=1.0))
+
+    # 첫 응답 0.6초 + 재요청에 남은 0.4초 - 재요청에 제한 시간을 새로 주면 1.6초가 걸립니다
+    assert time.monotonic() - started < 1.3
+    assert llm.calls == 2
+    assert parsed["blocks"] == [{"type": "BODY", "line_ids": ["p1-l0"]}]
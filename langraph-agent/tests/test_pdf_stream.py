@@ -0,0 +1,141 @@
+"""
+PDF 스트리밍 테스트
+레이아웃 분석을 stub으로 바꿔 aiter_process_pdf의 완료 순서/우선 페이지 스케줄링과
+/process-pdf/stream 엔드포인트의 NDJSON 프레이밍을 확인합니다.
+"""
+
+import asyncio
+import importlib
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from processors import pdf_pipeline
+from processors.layout_cache import LayoutCache
+from processors.pdf_pipeline import RawLine, aiter_process_pdf
+
+PAGES = (1, 2, 3, 4)
+
+
+def page_lines(page: int):
+    return [
+        RawLine(f"p{page}-l{index}", page, f"Line {index} of page {page}", (50, 100 + 12 * index, 300, 110 + 12 * index), 10.0, None, 50.0)
+        for index in range(2)
+    ]
+
+
+class StubSegmenter:
+    """페이지마다 정해진 시간 뒤에 모든 라인을 BODY 하나로 돌려주는 _segment_page 대역"""
+
+    def __init__(self, delays=None, failing_page: int | None = None):
+        self.delays = delays or {}
+        self.failing_page = failing_page
+        self.started = []
+        self.finished = {}
+
+    async def __call__(self, llm, page, lines, page_timeout):
+        self.started.append(page)
+        await asyncio.sleep(self.delays.get(page, 0.01))
+        if page == self.failing_page:
+            raise RuntimeError("segmenter exploded")
+        self.finished[page] = time.monotonic()
+        return {
+            "raw": "",
+            "parsed": {"blocks": [{"type": "BODY", "line_ids": [line.line_id for line in lines]}]},
+            "source": "llm",
+            "confidence": 0.0,
+        }
+
+
+@pytest.fixture
+def segmenter(monkeypatch):
+    stub = StubSegmenter()
+    monkeypatch.setattr(pdf_pipeline, "extract_raw_lines", lambda pdf_bytes: [line for page in PAGES for line in page_lines(page)])
+    monkeypatch.setattr(pdf_pipeline, "get_layout_cache", lambda: LayoutCache())
+    monkeypatch.setattr(pdf_pipeline, "get_chat_model", lambda *args: object())
+    monkeypatch.setattr(pdf_pipeline, "_segment_page", stub)
+    return stub
+
+
+def collect(pdf_bytes: bytes = b"%PDF-stub", **kwargs):
+    async def run():
+        emitted = []
+        async for payload in aiter_process_pdf(pdf_bytes, **kwargs):
+            emitted.append((payload["page"], time.monotonic(), payload))
+        return emitted
+
+    return asyncio.run(run())
+
+
+def test_pages_are_emitted_as_they_finish(segmenter, monkeypatch):
+    monkeypatch.setattr(pdf_pipeline, "LAYOUT_CONCURRENCY", 4)
+    segmenter.delays = {1: 0.4, 2: 0.05, 3: 0.2, 4: 0.1}
+
+    emitted = collect()
+
+    assert [page for page, _, _ in emitted] == [2, 4, 3, 1]
+    # 빠른 페이지는 느린 페이지가 끝나기 전에 나옵니다
+    assert emitted[0][1] < segmenter.finished[1]
+    payload = emitted[0][2]
+    assert [line["line_id"] for line in payload["raw_lines"]] == ["p2-l0", "p2-l1"]
+    assert payload["content_blocks"][0]["line_ids"] == ["p2-l0", "p2-l1"]
+    assert payload["segmentation"]["source"] == "llm"
+
+
+def test_priority_pages_are_scheduled_first(segmenter, monkeypatch):
+    monkeypatch.setattr(pdf_pipeline, "LAYOUT_CONCURRENCY", 1)
+
+    emitted = collect(priority_pages=[3, 99, 3, 2])
+
+    # 없는 페이지와 중복은 무시하고, 요청 순서대로 앞에 세웁니다
+    assert segmenter.started == [3, 2, 1, 4]
+    assert [page for page, _, _ in emitted] == [3, 2, 1, 4]
+
+
+@pytest.fixture
+def client(monkeypatch, segmenter):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    main = importlib.import_module("main")
+    return TestClient(main.app)
+
+
+def post_stream(client: TestClient, pages: str = ""):
+    return client.post(
+        "/process-pdf/stream",
+        params={"pages": pages} if pages else None,
+        files={"file": ("paper.pdf", b"%PDF-stub", "application/pdf")},
+    )
+
+
+def test_stream_endpoint_frames_pages_then_done(client, segmenter, monkeypatch):
+    monkeypatch.setattr(pdf_pipeline, "LAYOUT_CONCURRENCY", 1)
+
+    response = post_stream(client, pages="4")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["page"] * 4 + ["done"]
+    assert [event["page"] for event in events[:4]] == [4, 1, 2, 3]
+    assert events[-1] == {"event": "done", "pages": 4}
+    assert all({"raw_lines", "segmentation", "content_blocks"} <= set(event) for event in events[:4])
+
+
+def test_stream_endpoint_reports_failures_as_an_error_event(client, segmenter, monkeypatch):
+    monkeypatch.setattr(pdf_pipeline, "LAYOUT_CONCURRENCY", 1)
+    segmenter.failing_page = 2
+
+    response = post_stream(client)
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["page", "error"]
+    assert "segmenter exploded" in events[-1]["detail"]
+
+
+def test_stream_endpoint_rejects_malformed_pages(client, segmenter):
+    response = post_stream(client, pages="2,x")
+
+    assert response.status_code == 400
+    assert segmenter.started == []
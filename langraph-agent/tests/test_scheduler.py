@@ -0,0 +1,165 @@
+"""
+LLMScheduler 테스트
+버킷/레인 판단은 가짜 시계로, 재시도와 429 대기는 benchmarks.bench_scheduler의
+한도를 강제하는 fake LLM으로 확인합니다.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.bench_scheduler import FakeResponse, RateLimitedFakeLLM
+from llm import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, LLMScheduler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class RetryAfterError(Exception):
+    """retry-after 헤더가 달린 429 응답"""
+
+    status_code = 429
+
+    def __init__(self, seconds: float):
+        super().__init__("rate limit exceeded")
+        self.response = SimpleNamespace(status_code=429, headers={"retry-after": str(seconds)})
+
+
+def test_token_bucket_refills_at_the_per_minute_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(600, burst_seconds=1, clock=clock)
+
+    assert bucket.capacity == 10
+    assert bucket.wait_time(8) == 0
+    bucket.take(8)
+    # 잔량 2, 초당 10씩 채워지므로 8을 꺼내려면 0.6초
+    assert abs(bucket.wait_time(8) - 0.6) < 1e-9
+    clock.advance(0.6)
+    assert bucket.wait_time(8) < 1e-9
+
+
+def test_oversized_request_passes_on_a_full_bucket_and_leaves_debt():
+    clock = FakeClock()
+    scheduler = LLMScheduler(rpm=0, tpm=600, burst_seconds=1, clock=clock)
+
+    assert scheduler._try_acquire(PRIORITY_INTERACTIVE, 25) == 0
+    assert scheduler.tokens.level == -15
+    # 빚 15 + 다음 요청 5 = 2초 뒤에야 통과
+    assert abs(scheduler._try_acquire(PRIORITY_INTERACTIVE, 5) - 2.0) < 1e-9
+    clock.advance(2.0)
+    assert scheduler._try_acquire(PRIORITY_INTERACTIVE, 5) == 0
+
+
+def test_settle_returns_unused_reserved_tokens():
+    clock = FakeClock()
+    scheduler = LLMScheduler(rpm=0, tpm=600, burst_seconds=1, clock=clock)
+
+    scheduler._try_acquire(PRIORITY_INTERACTIVE, 8)
+    scheduler._settle(8, FakeResponse("ok", {"input_tokens": 2, "output_tokens": 1, "total_tokens": 3}))
+    assert scheduler.tokens.level == 7
+
+
+def test_rate_limit_pauses_every_lane_until_retry_after():
+    clock = FakeClock()
+    scheduler = LLMScheduler(rpm=0, tpm=0, backoff_base=0.01, clock=clock)
+
+    delay = scheduler._handle_failure(RetryAfterError(3), tokens=10, attempt=0)
+
+    assert delay >= 3
+    assert scheduler.paused_until == clock.now + delay
+    for priority in (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND):
+        assert scheduler._try_acquire(priority, 10) == delay
+    clock.advance(delay)
+    assert scheduler._try_acquire(PRIORITY_BACKGROUND, 10) == 0
+    assert scheduler.stats()["rate_limited"] == 1
+
+
+def test_arun_waits_out_retry_after_before_retrying():
+    scheduler = LLMScheduler(rpm=0, tpm=0, backoff_base=0.01)
+    attempts = []
+
+    async def call():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise RetryAfterError(0.2)
+        return FakeResponse("ok", {})
+
+    result = asyncio.run(scheduler.arun(call, 10))
+
+    assert result.content == "ok"
+    assert attempts[1] - attempts[0] >= 0.2
+    assert scheduler.stats()["retries"] == 1
+
+
+def test_background_lane_yields_while_interactive_calls_wait():
+    clock = FakeClock()
+    scheduler = LLMScheduler(rpm=60, tpm=0, burst_seconds=1, clock=clock)
+    scheduler._try_acquire(PRIORITY_BACKGROUND, 1)
+    clock.advance(1.0)
+
+    scheduler._enter(PRIORITY_INTERACTIVE)
+    assert scheduler._try_acquire(PRIORITY_BACKGROUND, 1) > 0
+    assert scheduler._try_acquire(PRIORITY_INTERACTIVE, 1) == 0
+    scheduler._leave(PRIORITY_INTERACTIVE)
+
+
+def test_interactive_call_overtakes_queued_background_calls():
+    # 초당 10회, 버킷 용량 1 - 첫 호출 뒤로는 0.1초마다 하나씩 통과합니다
+    scheduler = LLMScheduler(rpm=600, tpm=0, burst_seconds=0.1)
+    order = []
+
+    async def one(name: str, priority: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await scheduler.arun(lambda: asyncio.sleep(0, FakeResponse("ok", {})), 1, priority)
+        order.append(name)
+
+    async def main():
+        await asyncio.gather(
+            *(one(f"background-{index}", PRIORITY_BACKGROUND, 0) for index in range(3)),
+            one("interactive", PRIORITY_INTERACTIVE, 0.02),
+        )
+
+    asyncio.run(main())
+    assert order[:2] == ["background-0", "interactive"]
+
+
+def test_retries_rate_limited_calls_across_event_loops():
+    # fake provider는 초당 10회, 스케줄러는 한도를 모르므로 429를 받고 재시도합니다
+    llm = RateLimitedFakeLLM(rpm=600, tpm=1_000_000, burst=0.1, latency=0.01)
+    scheduler = LLMScheduler(rpm=0, tpm=0, max_retries=6, backoff_base=0.05, backoff_max=0.5)
+
+    async def burst():
+        return await asyncio.gather(*(scheduler.arun(lambda: llm.ainvoke(10), 10) for _ in range(4)))
+
+    # asyncio.run은 매번 새 이벤트 루프를 만듭니다 (동기 엔드포인트에서 배치 번역을 부를 때처럼)
+    for _ in range(2):
+        results = asyncio.run(burst())
+        assert [result.content for result in results] == ["ok"] * 4
+
+    assert llm.rejected > 0
+    assert scheduler.stats()["retries"] == llm.rejected
+    assert scheduler.stats().get("failures", 0) == 0
+
+
+def test_non_retryable_errors_are_raised_immediately():
+    scheduler = LLMScheduler(rpm=0, tpm=0)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(scheduler.arun(call, 10))
+    assert len(calls) == 1
+    assert scheduler.stats()["failures"] == 1
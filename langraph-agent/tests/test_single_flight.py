@@ -0,0 +1,122 @@
+"""
+SingleFlight 테스트
+같은 키의 동시 요청이 계산 한 번을 공유하는지, 오류와 취소가 어떻게 전달되는지 확인합니다.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cache import SingleFlight
+
+
+def test_concurrent_sync_callers_share_one_execution():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(flight.do, "key", work)
+        started.wait(5)
+        followers = [pool.submit(flight.do, "key", work) for _ in range(4)]
+        # 뒤따른 호출이 모두 합류한 뒤에 계산을 끝냅니다
+        while flight.stats()["coalesced"] < 4:
+            time.sleep(0.01)
+        release.set()
+        results = [leader.result(5)] + [future.result(5) for future in followers]
+
+    assert results == ["result"] * 5
+    assert len(runs) == 1
+    assert flight.stats() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_sync_error_reaches_every_follower():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def work():
+        started.set()
+        release.wait(5)
+        raise ValueError("model refused")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(flight.do, "key", work)
+        started.wait(5)
+        followers = [pool.submit(flight.do, "key", work) for _ in range(2)]
+        while flight.stats()["coalesced"] < 2:
+            time.sleep(0.01)
+        release.set()
+        for future in [leader] + followers:
+            with pytest.raises(ValueError, match="model refused"):
+                future.result(5)
+
+    # 실패한 계산은 남지 않아 다음 호출이 다시 실행합니다
+    assert flight.do("key", lambda: "retried") == "retried"
+    assert flight.stats()["executions"] == 2
+
+
+def test_concurrent_async_callers_share_one_execution():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flight.ado("key", work) for _ in range(5)), flight.ado("other", work))
+
+    results = asyncio.run(main())
+
+    assert results == ["result"] * 6
+    assert len(runs) == 2
+    assert flight.stats() == {"executions": 2, "coalesced": 4, "in_flight": 0}
+
+
+def test_async_error_reaches_every_follower():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        raise ValueError("model refused")
+
+    async def main():
+        return await asyncio.gather(*(flight.ado("key", work) for _ in range(3)), return_exceptions=True)
+
+    outcomes = asyncio.run(main())
+
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert flight.stats() == {"executions": 1, "coalesced": 2, "in_flight": 0}
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_work():
+    flight = SingleFlight()
+    finished = []
+
+    async def work():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+        return "result"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.ado("key", work))
+        follower = asyncio.ensure_future(flight.ado("key", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "result"
+    assert finished == [1]
+    assert flight.stats() == {"executions": 1, "coalesced": 1, "in_flight": 0}
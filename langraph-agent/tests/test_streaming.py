@@ -0,0 +1,106 @@
+"""
+StreamCleaner 테스트
+조각 경계가 닫는 태그나 자리표시자 한가운데에 걸려도, 조각을 이어 붙인 결과가
+TextTranslator가 전체 응답으로 만드는 최종 번역(done 이벤트의 translatedText)과 같은지 확인합니다.
+"""
+
+import asyncio
+from typing import Iterator, List
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from agents.masking import unmask
+from agents.streaming import StreamCleaner
+from agents.text_translator import TextTranslator
+from llm import LLMScheduler
+
+SPANS = [f"$x_{{{index}}}$" for index in range(13)]
+# 자리표시자마다 정확히 한 번씩 나와야 최종 번역이 복원됩니다
+TERMS = " ".join(f"⟦{index}⟧" for index in range(12))
+
+TAGGED = f"Thought: keep the symbols\n<translation>\n변수 ⟦12⟧는 큽니다.\n항: {TERMS}\n</translation>\nNote: done"
+PLAIN = f"Thought: keep the symbols\n\nTranslation: 변수 ⟦12⟧는 큽니다.\nAnalysis: skipped\n항: {TERMS}\n"
+
+
+class ChunkedFakeLLM(BaseChatModel):
+    """정해진 조각 목록을 그대로 스트리밍하는 fake chat model"""
+
+    chunks: List[str]
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chunked"
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(self.chunks)))])
+
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        for chunk in self.chunks:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=chunk))
+
+
+def translator(llm=None) -> TextTranslator:
+    return TextTranslator(llm=llm or ChunkedFakeLLM(chunks=[]), scheduler=LLMScheduler(rpm=0, tpm=0))
+
+
+def final_text(content: str, spans: List[str]) -> str:
+    agent = translator()
+    return unmask(agent._clean_translation(agent._extract_answer(content)), spans)
+
+
+def stream(chunks: List[str], spans: List[str]) -> List[str]:
+    cleaner = StreamCleaner(spans)
+    deltas = [cleaner.feed(chunk) for chunk in chunks]
+    return deltas + [cleaner.finish()]
+
+
+def test_split_at_every_offset_matches_the_final_translation():
+    for content in (TAGGED, PLAIN):
+        expected = final_text(content, SPANS)
+        assert expected and "⟦" not in expected
+        for offset in range(len(content) + 1):
+            deltas = stream([content[:offset], content[offset:]], SPANS)
+            assert "".join(deltas) == expected, (content, offset)
+
+
+def test_character_by_character_stream_matches_the_final_translation():
+    for content in (TAGGED, PLAIN):
+        assert "".join(stream(list(content), SPANS)) == final_text(content, SPANS)
+
+
+def test_partial_closing_tag_and_placeholder_are_held_back():
+    cleaner = StreamCleaner(SPANS)
+
+    assert cleaner.feed("<translation>값 ⟦1") == "값 "
+    assert cleaner.feed("2⟧ 끝</trans") == "$x_{12}$ 끝"
+    assert cleaner.feed("lation> trailing") == ""
+    assert cleaner.finish() == ""
+
+
+def test_untagged_reply_is_emitted_line_by_line():
+    cleaner = StreamCleaner()
+
+    # 태그가 없다는 것이 확인될 때까지 사고 과정 줄도 붙잡아 두고, 라벨 뒤 내용은 최종 정제처럼 남깁니다
+    assert cleaner.feed("Thought: plan\nOutput: 첫 줄") == ""
+    assert cleaner.feed("\nReasoning: hidden\n둘째") == "plan\n첫 줄"
+    assert cleaner.feed("\n\n") == "\n둘째"
+    # 끝의 빈 줄은 내보내지 않습니다
+    assert cleaner.finish() == ""
+
+
+def test_astream_deltas_add_up_to_the_returned_translation():
+    text = "The value $x$ exceeds $y$."
+    # 조각 경계가 자리표시자와 닫는 태그 안쪽에 걸립니다
+    chunks = ["<translation>값 ⟦", "0⟧는 ⟦1⟧보다 큽니다.</tra", "nslation>"]
+    agent = translator(ChunkedFakeLLM(chunks=chunks))
+    deltas: List[str] = []
+
+    async def on_delta(delta: str) -> None:
+        deltas.append(delta)
+
+    translated = asyncio.run(agent.astream(text, "", on_delta))
+
+    assert translated == "값 $x$는 $y$보다 큽니다."
+    assert "".join(deltas) == translated